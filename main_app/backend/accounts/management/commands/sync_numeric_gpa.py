@@ -0,0 +1,69 @@
+"""
+Management command to backfill the numeric GPA shadow columns on StudentProfile.
+Needed after bulk writes that bypass StudentProfile.save() (queryset.update,
+raw imports) so SQL-side GPA filters and aggregates see the current values.
+"""
+from django.core.management.base import BaseCommand
+from accounts.models import StudentProfile, parse_gpa_value
+
+
+class Command(BaseCommand):
+    help = 'Recompute gpa_numeric and semesterN_cgpa_numeric from their CharField sources'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Number of profiles to read and update per batch (default: 2000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show how many profiles are out of sync without making changes',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+
+        field_map = StudentProfile.NUMERIC_GPA_FIELDS
+        columns = ['id', *field_map.keys(), *field_map.values()]
+
+        scanned = 0
+        stale = 0
+        batch = []
+
+        for profile in StudentProfile.objects.only(*columns).iterator(chunk_size=batch_size):
+            scanned += 1
+            changed = False
+            for source, target in field_map.items():
+                value = parse_gpa_value(getattr(profile, source))
+                if getattr(profile, target) != value:
+                    setattr(profile, target, value)
+                    changed = True
+
+            if not changed:
+                continue
+
+            stale += 1
+            batch.append(profile)
+            if len(batch) >= batch_size:
+                self._flush(batch, dry_run)
+                batch = []
+
+        if batch:
+            self._flush(batch, dry_run)
+
+        self.stdout.write(f'Scanned {scanned} profiles')
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f'Would update: {stale} profiles'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Updated: {stale} profiles'))
+
+    def _flush(self, batch, dry_run):
+        if not dry_run:
+            StudentProfile.objects.bulk_update(batch, list(StudentProfile.NUMERIC_GPA_FIELDS.values()))
@@ -4,6 +4,8 @@ Management command to sync resumes with existing job applications
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from accounts.models import Resume, StudentProfile
+from accounts.signals import resume_documents
+from jobs import snapshots
 from jobs.models import JobApplication
 
 
@@ -66,7 +68,7 @@ class Command(BaseCommand):
             # Get all applications for this student
             applications = JobApplication.objects.filter(
                 applicant=student.user
-            )
+            ).select_related('profile_snapshot', 'documents_snapshot')
             
             if not applications.exists():
                 continue
@@ -77,32 +79,26 @@ class Command(BaseCommand):
                 )
             )
             
-            # Update each application
+            # Applications whose snapshot does not name a resume yet
+            missing = []
             for app in applications:
-                snapshot = app.applied_data_snapshot or {}
-                
                 # Check if resume is already in snapshot
-                existing_resume = snapshot.get('documents', {}).get('resume_url')
+                existing_resume = app.snapshot.get('documents', {}).get('resume_url')
                 
                 if existing_resume:
                     skipped_apps += 1
                     continue
                 
-                # Add resume to snapshot
-                if 'documents' not in snapshot:
-                    snapshot['documents'] = {}
-                
-                snapshot['documents']['resume_url'] = resume.file.url if resume.file else None
-                snapshot['documents']['resume_id'] = resume.id
-                snapshot['documents']['resume_name'] = resume.name
-                snapshot['documents']['resume_uploaded_at'] = resume.uploaded_at.isoformat() if resume.uploaded_at else None
-                
-                if not dry_run:
-                    app.applied_data_snapshot = snapshot
-                    app.save(update_fields=['applied_data_snapshot'])
-                
-                updated_apps += 1
+                missing.append(app.id)
                 self.stdout.write(f'    Updated application {app.id}')
+            
+            # Documents sections are shared, so this is one UPDATE per
+            # distinct section rather than a save per application
+            if missing and not dry_run:
+                snapshots.update_documents(
+                    JobApplication.objects.filter(pk__in=missing), resume_documents(resume)
+                )
+            updated_apps += len(missing)
         
         # Summary
         self.stdout.write('')
@@ -0,0 +1,97 @@
+# Generated by Django 3.2.25 on 2026-10-16 23:43
+
+from django.db import migrations, models
+import math
+
+
+SOURCE_FIELDS = ['gpa'] + [f'semester{i}_cgpa' for i in range(1, 9)]
+
+
+def parse_gpa_value(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value in ('', '0.0'):
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def backfill_numeric_gpa(apps, schema_editor):
+    StudentProfile = apps.get_model('accounts', 'StudentProfile')
+    target_fields = [f'{field}_numeric' for field in SOURCE_FIELDS]
+
+    batch = []
+    for profile in StudentProfile.objects.only('id', *SOURCE_FIELDS).iterator(chunk_size=2000):
+        for source, target in zip(SOURCE_FIELDS, target_fields):
+            setattr(profile, target, parse_gpa_value(getattr(profile, source)))
+        batch.append(profile)
+        if len(batch) >= 2000:
+            StudentProfile.objects.bulk_update(batch, target_fields)
+            batch = []
+
+    if batch:
+        StudentProfile.objects.bulk_update(batch, target_fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0022_auto_20251003_2335'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='gpa_numeric',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='semester1_cgpa_numeric',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='semester2_cgpa_numeric',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='semester3_cgpa_numeric',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='semester4_cgpa_numeric',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='semester5_cgpa_numeric',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='semester6_cgpa_numeric',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='semester7_cgpa_numeric',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='semester8_cgpa_numeric',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['passout_year', 'gpa_numeric'], name='studentprofile_year_gpa_num'),
+        ),
+        migrations.RunPython(backfill_numeric_gpa, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,7 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 from college.models import College
 from django.core.exceptions import ValidationError
+import math
 import os
 import uuid
 from django.utils.text import slugify
@@ -97,6 +98,26 @@ def student_semester8_marksheet_upload_path(instance, filename):
     return student_marksheet_upload_path(instance, filename, "8")
 
 
+def parse_gpa_value(value):
+    """
+    Numeric value of a stored GPA/CGPA string. Blank values, the '0.0'
+    placeholder and anything that is not a finite number map to None.
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    if value in ('', '0.0'):
+        return None
+
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+
+    return number if math.isfinite(number) else None
+
+
 def validate_certificate_file(value):
     """Validate certificate file type and size"""
     if value:
@@ -224,6 +245,18 @@ class StudentProfile(models.Model):
     semester7_cgpa = models.CharField(max_length=10, blank=True, null=True)
     semester8_cgpa = models.CharField(max_length=10, blank=True, null=True)
     
+    # Numeric shadows of gpa and the semester CGPAs, kept in sync on save so
+    # filters, orderings and aggregates can run in SQL instead of on strings
+    gpa_numeric = models.FloatField(null=True, blank=True, db_index=True, editable=False)
+    semester1_cgpa_numeric = models.FloatField(null=True, blank=True, editable=False)
+    semester2_cgpa_numeric = models.FloatField(null=True, blank=True, editable=False)
+    semester3_cgpa_numeric = models.FloatField(null=True, blank=True, editable=False)
+    semester4_cgpa_numeric = models.FloatField(null=True, blank=True, editable=False)
+    semester5_cgpa_numeric = models.FloatField(null=True, blank=True, editable=False)
+    semester6_cgpa_numeric = models.FloatField(null=True, blank=True, editable=False)
+    semester7_cgpa_numeric = models.FloatField(null=True, blank=True, editable=False)
+    semester8_cgpa_numeric = models.FloatField(null=True, blank=True, editable=False)
+    
     semester1_marksheet = models.FileField(upload_to=student_semester1_marksheet_upload_path, validators=[validate_certificate_file], blank=True, null=True)
     semester2_marksheet = models.FileField(upload_to=student_semester2_marksheet_upload_path, validators=[validate_certificate_file], blank=True, null=True)
     semester3_marksheet = models.FileField(upload_to=student_semester3_marksheet_upload_path, validators=[validate_certificate_file], blank=True, null=True)
@@ -347,8 +380,39 @@ class StudentProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Source CharField -> numeric shadow field
+    NUMERIC_GPA_FIELDS = {
+        'gpa': 'gpa_numeric',
+        **{f'semester{i}_cgpa': f'semester{i}_cgpa_numeric' for i in range(1, 9)},
+    }
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['passout_year', 'gpa_numeric'], name='studentprofile_year_gpa_num'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
+
+    def sync_numeric_gpa_fields(self):
+        """Refresh the numeric shadow fields from their CharField sources"""
+        for source, target in self.NUMERIC_GPA_FIELDS.items():
+            setattr(self, target, parse_gpa_value(getattr(self, source)))
+
+    def save(self, *args, **kwargs):
+        self.sync_numeric_gpa_fields()
+
+        # Partial saves of a GPA field must also write its shadow
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            shadows = [
+                target for source, target in self.NUMERIC_GPA_FIELDS.items()
+                if source in update_fields and target not in update_fields
+            ]
+            if shadows:
+                kwargs['update_fields'] = list(update_fields) + shadows
+
+        super().save(*args, **kwargs)
     
     @property
     def get_profile_image_url(self):
@@ -438,8 +502,25 @@ class StudentProfile(models.Model):
 
         return True
 
-    def get_freeze_restriction_reasons(self, job_posting):
-        """Get specific reasons why a student cannot apply to a job due to freeze restrictions"""
+    def get_allowed_company_names(self):
+        """Names of the allowed companies that exist, in allowed_companies order"""
+        from companies.models import Company
+        allowed_companies = self.allowed_companies if isinstance(self.allowed_companies, list) else []
+        company_ids = []
+        for company_id in allowed_companies:
+            try:
+                company_ids.append(int(company_id))
+            except (TypeError, ValueError):
+                pass
+        names = dict(Company.objects.filter(id__in=company_ids).values_list('id', 'name')) if company_ids else {}
+        return [names[company_id] for company_id in company_ids if company_id in names]
+
+    def get_freeze_restriction_reasons(self, job_posting, allowed_company_names=None):
+        """
+        Get specific reasons why a student cannot apply to a job due to freeze restrictions.
+        allowed_company_names (from get_allowed_company_names()) saves looking them up
+        when checking many jobs.
+        """
         if not self.is_partially_frozen():
             return []
 
@@ -472,14 +553,8 @@ class StudentProfile(models.Model):
             allowed_companies = self.allowed_companies if isinstance(self.allowed_companies, list) else []
             if allowed_companies and job_posting.company.id not in allowed_companies:
                 # Get company names for better error message
-                from companies.models import Company
-                allowed_company_names = []
-                for company_id in allowed_companies:
-                    try:
-                        company = Company.objects.get(id=company_id)
-                        allowed_company_names.append(company.name)
-                    except Company.DoesNotExist:
-                        pass
+                if allowed_company_names is None:
+                    allowed_company_names = self.get_allowed_company_names()
                 if allowed_company_names:
                     reasons.append(f"You can only apply to jobs from: {', '.join(allowed_company_names)}")
                 else:
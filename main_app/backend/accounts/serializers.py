@@ -43,7 +43,8 @@ class StudentProfileSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = StudentProfile
-        fields = '__all__'  # joining_year and passout_year will be included automatically
+        # All fields except the numeric GPA shadows, which mirror gpa/semesterN_cgpa
+        exclude = tuple(StudentProfile.NUMERIC_GPA_FIELDS.values())
 
     def get_profile_image_url(self, obj):
         if obj.profile_image:
@@ -190,7 +191,8 @@ class StudentProfileListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = StudentProfile
-        fields = '__all__'  # joining_year and passout_year will be included automatically
+        # All fields except the numeric GPA shadows, which mirror gpa/semesterN_cgpa
+        exclude = tuple(StudentProfile.NUMERIC_GPA_FIELDS.values())
 
     def get_semester_marksheets(self, obj):
         semesters_data = obj.get_all_semesters_data()
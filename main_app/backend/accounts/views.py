@@ -851,6 +851,26 @@ class StudentProfileViewSet(viewsets.ModelViewSet):
         })
 
 
+class StudentOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that sorts ?ordering=gpa by the numeric GPA shadow column,
+    so GPA ordering is numeric and can use its index
+    """
+    field_aliases = {'gpa': 'gpa_numeric'}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+
+        aliased = []
+        for term in ordering:
+            prefix = '-' if term.startswith('-') else ''
+            field = term.lstrip('-')
+            aliased.append(prefix + self.field_aliases.get(field, field))
+        return aliased
+
+
 class OptimizedStudentListView(generics.ListAPIView):
     """
     Optimized student list view with server-side pagination and filtering
@@ -859,7 +879,7 @@ class OptimizedStudentListView(generics.ListAPIView):
     serializer_class = StudentProfileListSerializer
     permission_classes = [permissions.IsAdminUser]
     pagination_class = StandardResultsSetPagination
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [filters.SearchFilter, StudentOrderingFilter]
     search_fields = ['first_name', 'last_name', 'student_id', 'contact_email', 'user__email']
     ordering_fields = ['first_name', 'last_name', 'student_id', 'gpa', 'passout_year', 'joining_year']
     ordering = ['student_id']
@@ -922,14 +942,14 @@ class OptimizedStudentListView(generics.ListAPIView):
         if cgpa_min:
             try:
                 cgpa_min = float(cgpa_min)
-                queryset = queryset.filter(gpa__gte=cgpa_min)
+                queryset = queryset.filter(gpa_numeric__gte=cgpa_min)
             except ValueError:
                 pass
 
         if cgpa_max:
             try:
                 cgpa_max = float(cgpa_max)
-                queryset = queryset.filter(gpa__lte=cgpa_max)
+                queryset = queryset.filter(gpa_numeric__lte=cgpa_max)
             except ValueError:
                 pass
 
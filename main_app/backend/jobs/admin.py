@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import JobPosting, JobApplication, CompanyForm
+from .models import JobPosting, JobApplication, ArchivedApplication, CompanyForm, ExportJob
 from .ats_models import (
     PipelineStage,
     RecruitmentPipeline,
@@ -23,11 +23,36 @@ class JobApplicationAdmin(admin.ModelAdmin):
     list_filter = ('status', 'applied_at')
     search_fields = ('job__title', 'applicant__email')
     date_hierarchy = 'applied_at'
+    # Shared snapshot sections, changed through jobs.snapshots only
+    readonly_fields = ('profile_snapshot', 'documents_snapshot')
+
+
+class ArchivedApplicationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job', 'applicant', 'status', 'passout_year', 'reason', 'applied_at', 'archived_at')
+    list_filter = ('reason', 'passout_year', 'status')
+    search_fields = ('job__title', 'applicant__email')
+    date_hierarchy = 'archived_at'
+
+    # Moved in and out by jobs.archive only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'format', 'status', 'processed_rows', 'total_rows', 'requested_by', 'created_at', 'completed_at')
+    list_filter = ('status', 'format')
+    readonly_fields = ('fingerprint', 'data_version')
+    date_hierarchy = 'created_at'
 
 
 admin.site.register(JobPosting, JobPostingAdmin)
 admin.site.register(JobApplication, JobApplicationAdmin)
+admin.site.register(ArchivedApplication, ArchivedApplicationAdmin)
 admin.site.register(CompanyForm)
+admin.site.register(ExportJob, ExportJobAdmin)
 
 # ATS Models
 admin.site.register(PipelineStage)
@@ -0,0 +1,301 @@
+"""
+Job application submission.
+
+The apply view does as little as possible inside the request, so it
+holds up fewer request threads when many students apply on deadline day:
+  - the application row is inserted right away with a provisional
+    snapshot (custom responses and submission metadata). A second
+    submission by the same student is caught by the (job, applicant)
+    unique constraint (insert_application() raises AlreadyApplied)
+    rather than by a check-then-insert that two concurrent requests can
+    both pass
+  - once the insert commits, finalize_application() writes the uploaded
+    resume and custom field files to storage and builds the full
+    snapshot from the profile and resumes (stored through jobs.snapshots).
+    This runs on finalize_workers, a bounded thread pool; when the pool
+    is backed up, or APPLICATION_FINALIZE_WORKERS is 0, it runs in the
+    request thread.
+
+Until then the snapshot has metadata.snapshot_pending set. Applications
+left pending by a process that died are picked up by
+finalize_applications, which rebuilds their snapshot (files that were
+only held in memory are lost).
+"""
+
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from accounts.models import StudentProfile
+from . import snapshots
+from .models import JobApplication
+
+logger = logging.getLogger(__name__)
+
+APPLICATION_FINALIZE_WORKERS = getattr(settings, 'APPLICATION_FINALIZE_WORKERS', 4)
+# Finalizations queued beyond this run in the request thread instead
+APPLICATION_FINALIZE_MAX_PENDING = getattr(settings, 'APPLICATION_FINALIZE_MAX_PENDING', 200)
+
+# An uploaded file, read into memory so it outlives the request
+PendingFile = namedtuple('PendingFile', 'field name content')
+
+
+class AlreadyApplied(Exception):
+    """The student already has an application for this job"""
+
+
+def create_enhanced_application_snapshot(student_profile, custom_responses=None, request=None):
+    """Create enhanced application snapshot with organized structure"""
+    # Get primary resume from Resume model (preferred) or fallback to profile resume
+    resume_url = None
+    resume_data = {}
+    
+    try:
+        # Try to get primary resume from Resume model
+        from accounts.models import Resume
+        primary_resume = Resume.objects.filter(
+            student=student_profile, 
+            is_primary=True
+        ).first()
+        
+        if primary_resume and primary_resume.file:
+            resume_url = primary_resume.file.url
+            resume_data = {
+                "resume_url": resume_url,
+                "resume_id": primary_resume.id,
+                "resume_name": primary_resume.name,
+                "resume_uploaded_at": primary_resume.uploaded_at.isoformat() if primary_resume.uploaded_at else None,
+            }
+        # Fallback to latest resume if no primary resume
+        elif not primary_resume:
+            latest_resume = Resume.objects.filter(student=student_profile).first()
+            if latest_resume and latest_resume.file:
+                resume_url = latest_resume.file.url
+                resume_data = {
+                    "resume_url": resume_url,
+                    "resume_id": latest_resume.id,
+                    "resume_name": latest_resume.name,
+                    "resume_uploaded_at": latest_resume.uploaded_at.isoformat() if latest_resume.uploaded_at else None,
+                }
+    except Exception as e:
+        print(f"Error getting resume from Resume model: {e}")
+    
+    # Final fallback to StudentProfile.resume field
+    if not resume_url and student_profile.resume:
+        resume_url = student_profile.resume.url
+        resume_data = {"resume_url": resume_url}
+    
+    snapshot = {
+        "basic_info": {
+            "name": f"{student_profile.first_name} {student_profile.last_name}",
+            "email": student_profile.contact_email or student_profile.user.email,
+            "student_id": student_profile.student_id,
+            "branch": student_profile.branch,
+            "current_cgpa": student_profile.gpa,
+            "university": student_profile.college_name or student_profile.college.name if student_profile.college else None,
+        },
+        "academic_info": {
+            "tenth_percentage": student_profile.tenth_percentage,
+            "twelfth_percentage": student_profile.twelfth_percentage,
+            "graduation_year": student_profile.passout_year,
+            "joining_year": student_profile.joining_year,
+            "semester_wise_cgpa": {
+                f"semester{i}": getattr(student_profile, f'semester{i}_cgpa') 
+                for i in range(1, 9) 
+                if getattr(student_profile, f'semester{i}_cgpa')
+            }
+        },
+        "contact_info": {
+            "phone": student_profile.phone,
+            "address": student_profile.address,
+            "city": student_profile.city,
+            "state": student_profile.state,
+            "pincode": student_profile.pincode,
+            "country": student_profile.country,
+        },
+        "documents": {
+            **resume_data,  # Include resume data from Resume model
+            "tenth_certificate_url": student_profile.tenth_certificate.url if student_profile.tenth_certificate else None,
+            "twelfth_certificate_url": student_profile.twelfth_certificate.url if student_profile.twelfth_certificate else None,
+        },
+        "custom_responses": custom_responses or {},
+        "metadata": {
+            "form_version": "1.0",
+            "submission_ip": request.META.get('REMOTE_ADDR') if request else None,
+            "user_agent": request.META.get('HTTP_USER_AGENT') if request else None,
+            "submission_timestamp": timezone.now().isoformat(),
+        }
+    }
+    
+    # Clean up None values to keep the JSON clean
+    def clean_dict(d):
+        if isinstance(d, dict):
+            return {k: clean_dict(v) for k, v in d.items() if v is not None and v != ""}
+        return d
+    
+    return clean_dict(snapshot)
+
+
+def submission_metadata(request):
+    """Request details recorded in the snapshot metadata"""
+    return {
+        'submission_ip': request.META.get('REMOTE_ADDR'),
+        'user_agent': request.META.get('HTTP_USER_AGENT'),
+        'submission_timestamp': timezone.now().isoformat(),
+    }
+
+
+def pending_snapshot(custom_responses, submission):
+    """Provisional snapshot stored with the application until it is finalized"""
+    return {
+        'custom_responses': custom_responses,
+        'metadata': {
+            'form_version': '1.0',
+            **{key: value for key, value in submission.items() if value},
+            'snapshot_pending': True,
+        },
+    }
+
+
+def read_upload(field, upload):
+    return PendingFile(field, upload.name, upload.read())
+
+
+def insert_application(serializer, **fields):
+    """
+    serializer.save(**fields) in its own savepoint. Raises AlreadyApplied
+    if the (job, applicant) unique constraint rejects the row.
+    """
+    try:
+        with transaction.atomic():
+            return serializer.save(**fields)
+    except IntegrityError:
+        if JobApplication.objects.filter(job=fields['job'], applicant=fields['applicant']).exists():
+            raise AlreadyApplied()
+        raise
+
+
+def _file_path(student_id, name, submitted_at):
+    return f"application_files/{student_id}/{submitted_at.strftime('%Y%m%d_%H%M%S')}_{slugify(name[:50])}"
+
+
+def finalize_application(application_id, resume_file=None, custom_files=(), submission=None):
+    """
+    Store the uploaded files of an application and replace its provisional
+    snapshot with the full one.
+    """
+    application = JobApplication.objects.select_related('applicant').only(
+        'id', 'applicant', 'applied_data_snapshot', 'resume', 'applied_at'
+    ).get(pk=application_id)
+    profile = StudentProfile.objects.select_related('user', 'college').get(user_id=application.applicant_id)
+
+    provisional = application.applied_data_snapshot or {}
+    custom_responses = dict(provisional.get('custom_responses') or {})
+    submission = submission or {
+        key: value for key, value in (provisional.get('metadata') or {}).items()
+        if key in ('submission_ip', 'user_agent', 'submission_timestamp')
+    }
+
+    file_urls = {}
+    for pending in custom_files:
+        path = default_storage.save(
+            _file_path(profile.student_id, pending.name, application.applied_at), ContentFile(pending.content)
+        )
+        file_urls[pending.field] = f"/media/{path}"
+    custom_responses.update(file_urls)
+
+    snapshot = create_enhanced_application_snapshot(student_profile=profile, custom_responses=custom_responses)
+    snapshot.setdefault('metadata', {}).update({key: value for key, value in submission.items() if value})
+    if file_urls:
+        snapshot.setdefault('documents', {}).update(file_urls)
+
+    updates = {**snapshots.stored_fields(snapshot), 'updated_at': timezone.now()}
+    if resume_file is not None:
+        application.resume.save(resume_file.name, ContentFile(resume_file.content), save=False)
+        updates['resume'] = application.resume.name
+    JobApplication.objects.filter(pk=application_id).update(**updates)
+
+
+def _finalize(application_id, *args, **kwargs):
+    # The application is committed by now; a failure leaves its snapshot
+    # pending for finalize_applications rather than failing the request
+    try:
+        finalize_application(application_id, *args, **kwargs)
+    except Exception as e:
+        logger.error(f"Finalizing application {application_id} failed: {str(e)}", exc_info=True)
+
+
+class FinalizeWorkerPool:
+    """
+    Bounded pool running finalize_application(). submit() runs the work in
+    the calling thread when no workers are configured or too many
+    finalizations are already queued.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def submit(self, *args, **kwargs):
+        with self._idle:
+            inline = not self.max_workers or self._pending >= self.max_pending
+            if not inline:
+                self._pending += 1
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='apply'
+                    )
+
+        if inline:
+            _finalize(*args, **kwargs)
+            return False
+        self._executor.submit(self._run, *args, **kwargs)
+        return True
+
+    def pending_count(self):
+        with self._idle:
+            return self._pending
+
+    def wait(self, timeout=None):
+        """Block until every queued finalization has run"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def _run(self, *args, **kwargs):
+        close_old_connections()
+        try:
+            _finalize(*args, **kwargs)
+        finally:
+            connection.close()
+            with self._idle:
+                self._pending -= 1
+                self._idle.notify_all()
+
+
+finalize_workers = FinalizeWorkerPool(APPLICATION_FINALIZE_WORKERS, APPLICATION_FINALIZE_MAX_PENDING)
+
+
+def finalize_after_commit(application_id, resume_file=None, custom_files=(), submission=None):
+    transaction.on_commit(
+        lambda: finalize_workers.submit(application_id, resume_file, list(custom_files), submission)
+    )
+
+
+def pending_applications(older_than_minutes=0):
+    """Applications whose snapshot was never finalized"""
+    cutoff = timezone.now() - timedelta(minutes=older_than_minutes)
+    return JobApplication.objects.filter(
+        applied_data_snapshot__metadata__snapshot_pending=True, applied_at__lte=cutoff
+    )
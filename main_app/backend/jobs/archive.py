@@ -0,0 +1,188 @@
+"""
+Archive of applications from past placement seasons.
+
+The hot JobApplication table (and the candidate cards, stage movements
+and status events hanging off it) should only hold the active cycle.
+archive() moves applications into ArchivedApplication:
+  - those of students whose passout year is inactive (YearManagement)
+  - soft-deleted ones (is_deleted), whatever the year
+Each archived row keeps the application's id and fields, plus its
+candidate card, stage movements and comments serialized into pipeline.
+The hot rows are then deleted through the ORM, so the counters, rollups,
+placements and caches follow as for any delete. Status events are not
+kept: status_history holds them and they are replayed on restore.
+
+Reading archived data:
+  - ArchivedApplication has the fields and the snapshot property of
+    JobApplication, so exports (config 'archived') and reports read it
+    with the same code
+  - placements keep counting archived hires (jobs.placements)
+  - metrics of an archived year are frozen first (metrics.frozen)
+
+restore() moves archived applications back, e.g. when a year is made
+active again. Run both through archive_applications.
+"""
+
+from datetime import datetime
+
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.base import DeserializationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from accounts.models import StudentProfile, YearManagement
+from .ats_models import CandidateCard, CandidateComment, StageMovementHistory
+from .models import ArchivedApplication, JobApplication
+from .signals import applications_status_changed
+
+ARCHIVE_BATCH_SIZE = getattr(settings, 'ARCHIVE_BATCH_SIZE', 500)
+
+# Fields copied between JobApplication and ArchivedApplication
+APPLICATION_FIELDS = [field.attname for field in JobApplication._meta.concrete_fields]
+
+
+def inactive_years():
+    return list(YearManagement.objects.filter(is_active=False).values_list('year', flat=True))
+
+
+def archivable_applications(years=None, deleted=True):
+    """
+    Hot applications of students in the given passout years (default: the
+    inactive years) and, if deleted, soft-deleted applications
+    """
+    years = inactive_years() if years is None else list(years)
+    condition = Q(applicant__student_profile__passout_year__in=years)
+    if deleted:
+        condition |= Q(is_deleted=True)
+    return JobApplication.objects.filter(condition)
+
+
+def _serialize(objects):
+    """
+    Objects in the python serialization format, datetimes as ISO strings
+    (DjangoJSONEncoder would cut them to milliseconds)
+    """
+    entries = serializers.serialize('python', objects)
+    for entry in entries:
+        entry['fields'] = {
+            name: value.isoformat() if isinstance(value, datetime) else value
+            for name, value in entry['fields'].items()
+        }
+    return entries
+
+
+def pipeline_data(cards, movements, comments):
+    """{application id: serialized card, stage movements and comments} of some candidate cards"""
+    data = {
+        card.application_id: {'card': entry, 'stage_movements': [], 'comments': []}
+        for card, entry in zip(cards, _serialize(cards))
+    }
+    application_ids = {card.pk: card.application_id for card in cards}
+    for key, objects in (('stage_movements', movements), ('comments', comments)):
+        for obj, entry in zip(objects, _serialize(objects)):
+            data[application_ids[obj.candidate_card_id]][key].append(entry)
+    return data
+
+
+def _archive_batch(applications):
+    ids = [application.pk for application in applications]
+    passout_years = dict(
+        StudentProfile.objects.filter(
+            user_id__in={application.applicant_id for application in applications}
+        ).values_list('user_id', 'passout_year')
+    )
+    cards = list(CandidateCard.objects.filter(application_id__in=ids).prefetch_related('interviewers'))
+    pipelines = pipeline_data(
+        cards,
+        list(StageMovementHistory.objects.filter(candidate_card__in=cards).order_by('moved_at')),
+        list(CandidateComment.objects.filter(candidate_card__in=cards).order_by('created_at')),
+    )
+
+    ArchivedApplication.objects.bulk_create([
+        ArchivedApplication(
+            passout_year=passout_years.get(application.applicant_id),
+            reason=(
+                ArchivedApplication.REASON_DELETED if application.is_deleted
+                else ArchivedApplication.REASON_INACTIVE_YEAR
+            ),
+            pipeline=pipelines.get(application.pk, {}),
+            **{field: getattr(application, field) for field in APPLICATION_FIELDS},
+        )
+        for application in applications
+    ])
+    # One at a time: the counter handlers check a student's other hires,
+    # which a single DELETE of the batch would still show them
+    for application in applications:
+        application.delete()
+
+
+def archive(applications=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move applications (default: archivable_applications()) to the archive,
+    one transaction per batch. Returns the number of applications moved.
+    """
+    applications = archivable_applications() if applications is None else applications
+    ids = list(applications.order_by('pk').values_list('pk', flat=True))
+
+    for start in range(0, len(ids), batch_size):
+        with transaction.atomic():
+            batch = list(JobApplication.objects.filter(pk__in=ids[start:start + batch_size]).select_for_update())
+            _archive_batch(batch)
+    return len(ids)
+
+
+def _restore_pipeline(pipeline):
+    """Recreate a candidate card; False if its pipeline or stages are gone"""
+    if not pipeline:
+        return True
+    objects = [pipeline['card']] + pipeline['stage_movements'] + pipeline['comments']
+    try:
+        with transaction.atomic():
+            for obj in serializers.deserialize('python', objects):
+                obj.save()
+    except (IntegrityError, DeserializationError):
+        return False
+    return True
+
+
+def _restore_batch(archived):
+    restored = []
+    skipped = lost_cards = 0
+    for row in archived:
+        application = JobApplication(**{field: getattr(row, field) for field in APPLICATION_FIELDS})
+        try:
+            with transaction.atomic():
+                # Raw, like loaddata: keeps applied_at and updated_at, and the
+                # signal handlers leave the bookkeeping to the bulk signal below
+                application.save_base(raw=True, force_insert=True)
+        except IntegrityError:
+            # The student applied to the job again since this was archived
+            skipped += 1
+            continue
+        restored.append(application)
+        if not _restore_pipeline(row.pipeline):
+            lost_cards += 1
+
+    ArchivedApplication.objects.filter(pk__in=[application.pk for application in restored]).delete()
+    applications_status_changed.send(
+        sender=JobApplication,
+        transitions=[(application, None, application.status) for application in restored],
+    )
+    return len(restored), skipped, lost_cards
+
+
+def restore(archived, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move archived applications back to the hot table, with their candidate
+    cards where the pipeline and stages still exist. Applications whose
+    student has applied to the same job since stay archived. Returns
+    (applications restored, applications skipped, cards not restored).
+    """
+    ids = list(archived.order_by('pk').values_list('pk', flat=True))
+    totals = [0, 0, 0]
+    for start in range(0, len(ids), batch_size):
+        with transaction.atomic():
+            counts = _restore_batch(list(ArchivedApplication.objects.filter(pk__in=ids[start:start + batch_size])))
+        totals = [total + count for total, count in zip(totals, counts)]
+    return tuple(totals)
@@ -156,7 +156,7 @@ class CandidateCardSerializer(serializers.ModelSerializer):
             
             # Priority 2: Check applied_data_snapshot documents section
             if not resume_url:
-                snapshot = obj.application.applied_data_snapshot or {}
+                snapshot = obj.application.snapshot
                 documents = snapshot.get('documents', {})
                 if documents.get('resume_url'):
                     resume_url = documents['resume_url']
@@ -206,7 +206,7 @@ class CandidateCardSerializer(serializers.ModelSerializer):
     def get_application(self, obj):
         try:
             app = obj.application
-            snapshot = app.applied_data_snapshot or {}
+            snapshot = app.snapshot
             
             # Get resume URL using the same priority logic as get_resume_url
             resume_url = None
@@ -359,6 +359,8 @@ class KanbanBoardSerializer(serializers.Serializer):
                 'application__job',
                 'application__job__company',
                 'application__applicant__student_profile',
+                'application__profile_snapshot',
+                'application__documents_snapshot',
                 'current_stage',
                 'recruiter'
             ).prefetch_related('interviewers').order_by('position_in_stage', '-created_at')
@@ -127,6 +127,8 @@ class CandidateCardViewSet(viewsets.ModelViewSet):
             'application__job',
             'application__job__company',
             'application__applicant__student_profile',
+            'application__profile_snapshot',
+            'application__documents_snapshot',
             'current_stage',
             'pipeline',
             'recruiter'
@@ -658,7 +660,7 @@ class SharedAccessView(APIView):
         applications = JobApplication.objects.filter(
             is_deleted=False
         ).select_related(
-            'job', 'job__company', 'applicant__student_profile'
+            'job', 'job__company', 'applicant__student_profile', 'profile_snapshot', 'documents_snapshot'
         ).order_by('-applied_at')[:100]  # Limit to 100 recent applications
         
         serializer = DetailedJobApplicationSerializer(applications, many=True)
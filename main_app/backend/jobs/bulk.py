@@ -0,0 +1,60 @@
+"""
+Set-based changes to many job applications at once.
+
+change_status() moves applications to a new status with one locking
+SELECT and a bulk_update of status, status_history, last_modified_by and
+updated_at, instead of a save() per application. No per-row model signals
+fire; applications_status_changed is sent once for the whole batch, and
+metrics.signals turns it into a single counter/rollup update and one
+cache invalidation.
+"""
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import JobApplication
+from .signals import applications_status_changed
+
+STATUS_CHOICES = [value for value, _ in JobApplication._meta.get_field('status').choices]
+
+BULK_FIELDS = ['status', 'status_history', 'last_modified_by', 'updated_at']
+
+
+def status_change_preview(queryset, new_status):
+    """{current status: count} of the applications change_status() would move"""
+    return dict(
+        queryset.exclude(status=new_status).order_by()
+        .values('status').annotate(total=Count('id')).values_list('status', 'total')
+    )
+
+
+@transaction.atomic
+def change_status(queryset, new_status, changed_by=None, notes=None):
+    """
+    Move every application in queryset to new_status, recording the change
+    in its status history. Applications already in new_status are left
+    alone. Returns the number of applications changed.
+    """
+    if new_status not in STATUS_CHOICES:
+        raise ValueError(f"Unknown application status: {new_status}")
+
+    applications = list(
+        queryset.exclude(status=new_status).order_by().select_for_update().only(
+            'id', 'status', 'status_history', 'applicant_id', 'job_id', 'applied_at'
+        )
+    )
+    if not applications:
+        return 0
+
+    now = timezone.now()
+    transitions = []
+    for application in applications:
+        old_status = application.status
+        application.add_status_change(new_status, changed_by=changed_by, notes=notes)
+        application.updated_at = now
+        transitions.append((application, old_status, new_status))
+
+    JobApplication.objects.bulk_update(applications, BULK_FIELDS)
+    applications_status_changed.send(sender=JobApplication, transitions=transitions)
+    return len(applications)
@@ -0,0 +1,340 @@
+"""
+Calendar of application deadlines and interview rounds.
+
+Each job contributes an APPLICATION_DEADLINE event on its
+application_deadline and an INTERVIEW event per interview round with a
+date and a time. CalendarEvent stores one row per event and cohort
+(passout_year, branch) the job is open to, 0 / '' standing for jobs
+without a year / department restriction, so the events of a date range
+for a cohort are one query on the (date, passout_year, branch) index.
+
+The rows are kept up to date by jobs.signals:
+  JobPosting saved        sync_job() when the deadline, interview rounds
+                          or allowed years/departments changed
+  JobPosting deleted      rows cascade
+rebuild_calendar_events recomputes everything after bulk writes.
+
+Any change that can alter a feed (job or company saved or deleted, active
+years changed) moves the calendar to a new version(); ICS feeds are cached
+per version, day and cohort.
+"""
+
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import YearManagement
+from .models import CalendarEvent, JobPosting, normalize_passout_years, normalize_departments
+
+ANY_YEAR = 0
+ANY_BRANCH = ''
+
+# JobPosting fields the stored rows are derived from
+SOURCE_FIELDS = {'application_deadline', 'interview_rounds', 'allowed_passout_years', 'allowed_departments'}
+
+EVENT_FIELDS = (
+    'event_type', 'event_key', 'date', 'time', 'round_name', 'job_id',
+    'job__title', 'job__location', 'job__updated_at', 'job__company_id', 'job__company__name',
+)
+
+EVENT_COLORS = {
+    CalendarEvent.APPLICATION_DEADLINE: '#ef4444',
+    CalendarEvent.INTERVIEW: '#f59e0b',
+}
+
+ICS_PAST_DAYS = getattr(settings, 'CALENDAR_ICS_PAST_DAYS', 90)
+ICS_FUTURE_DAYS = getattr(settings, 'CALENDAR_ICS_FUTURE_DAYS', 365)
+ICS_CACHE_SECONDS = getattr(settings, 'CALENDAR_ICS_CACHE_SECONDS', 60 * 60)
+
+VERSION_KEY = 'jobs:calendar:version'
+FEED_SALT = 'jobs.calendar.feed'
+
+
+def interview_key(job_id, round_date, round_time, round_name):
+    """
+    Event id (and ICS UID) of an interview round. Rounds often share a
+    name ("Technical Round" on two days), so the date and time are part
+    of it.
+    """
+    return f'interview_{job_id}_{round_date.isoformat()}_{round_time}_{round_name or "round"}'[:255]
+
+
+def job_events(job_id, application_deadline, interview_rounds):
+    """(event_type, event_key, date, time, round_name) of each event of a job"""
+    events = []
+    if application_deadline:
+        events.append((
+            CalendarEvent.APPLICATION_DEADLINE, f'job_deadline_{job_id}', application_deadline, '23:59', ''
+        ))
+
+    for round_info in interview_rounds if isinstance(interview_rounds, list) else []:
+        if not isinstance(round_info, dict) or 'date' not in round_info or 'time' not in round_info:
+            continue
+        try:
+            round_date = datetime.strptime(round_info['date'], '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            continue
+        name = round_info.get('name')
+        round_time = str(round_info['time'])[:20]
+        round_name = str(name)[:255] if name is not None else ''
+        events.append((
+            CalendarEvent.INTERVIEW,
+            interview_key(job_id, round_date, round_time, round_name),
+            round_date,
+            round_time,
+            round_name,
+        ))
+    return events
+
+
+def job_cohorts(allowed_years, allowed_departments):
+    """(passout_year, branch) pairs a job's events are stored under"""
+    years = normalize_passout_years(allowed_years) or {ANY_YEAR}
+    branches = {branch[:100] for branch in normalize_departments(allowed_departments)} or {ANY_BRANCH}
+    return [(year, branch) for year in years for branch in branches]
+
+
+def event_rows(model, job_id, application_deadline, interview_rounds, allowed_years, allowed_departments):
+    """Unsaved CalendarEvent rows (of model, so migrations can pass theirs) for one job"""
+    cohorts = job_cohorts(allowed_years, allowed_departments)
+    return [
+        model(
+            job_id=job_id, event_type=event_type, event_key=event_key, date=date,
+            time=event_time, round_name=round_name, passout_year=year, branch=branch,
+        )
+        for event_type, event_key, date, event_time, round_name in job_events(
+            job_id, application_deadline, interview_rounds
+        )
+        for year, branch in cohorts
+    ]
+
+
+def _job_sources(jobs):
+    return jobs.values_list(
+        'id', 'application_deadline', 'interview_rounds', 'allowed_passout_years', 'allowed_departments'
+    ).iterator()
+
+
+def expected_rows(jobs=None):
+    """Set of the row tuples the stored events should hold, for drift checks"""
+    jobs = JobPosting.objects.all() if jobs is None else jobs
+    return {
+        (row.job_id, row.event_type, row.event_key, row.date, row.time, row.round_name,
+         row.passout_year, row.branch)
+        for source in _job_sources(jobs)
+        for row in event_rows(CalendarEvent, *source)
+    }
+
+
+def stored_rows():
+    return set(CalendarEvent.objects.values_list(
+        'job_id', 'event_type', 'event_key', 'date', 'time', 'round_name', 'passout_year', 'branch'
+    ))
+
+
+@transaction.atomic
+def sync_job(job):
+    """Rewrite the events of one job. Returns the number of rows stored."""
+    CalendarEvent.objects.filter(job_id=job.pk).delete()
+    rows = CalendarEvent.objects.bulk_create(event_rows(
+        CalendarEvent, job.pk, job.application_deadline, job.interview_rounds,
+        job.allowed_passout_years, job.allowed_departments,
+    ))
+    bump_version()
+    return len(rows)
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute the events of every job. Returns the number of rows stored."""
+    CalendarEvent.objects.all().delete()
+    stored = 0
+    batch = []
+    for source in _job_sources(JobPosting.objects.all()):
+        batch.extend(event_rows(CalendarEvent, *source))
+        if len(batch) >= 1000:
+            stored += len(CalendarEvent.objects.bulk_create(batch))
+            batch = []
+    stored += len(CalendarEvent.objects.bulk_create(batch))
+    bump_version()
+    return stored
+
+
+def version():
+    return cache.get(VERSION_KEY, 0)
+
+
+def bump_version():
+    """Invalidate cached feeds once the current transaction commits"""
+    transaction.on_commit(_new_version)
+
+
+def _new_version():
+    # A fresh value rather than incr(), which the database backend runs as
+    # a read then a write: two racing bumps could land on the same version
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def events_between(start_date, end_date, passout_year=None, branch=None, active_years=None):
+    """
+    Events of active jobs between two dates (inclusive), as dicts of
+    EVENT_FIELDS ordered by date and time. passout_year / branch restrict
+    them to a cohort; without a passout year, active_years (if given)
+    drops jobs that are only open to inactive years.
+    """
+    events = CalendarEvent.objects.filter(date__range=(start_date, end_date), job__is_active=True)
+    if passout_year is not None:
+        events = events.filter(passout_year__in=[passout_year, ANY_YEAR])
+    elif active_years is not None:
+        events = events.filter(passout_year__in=[*active_years, ANY_YEAR])
+    if branch:
+        events = events.filter(branch__in=[branch, ANY_BRANCH])
+    # A job open to several cohorts has a row per cohort
+    return events.order_by('date', 'time', 'event_key').values(*EVENT_FIELDS).distinct()
+
+
+def event_payload(event, today):
+    """Calendar API representation of an events_between() row"""
+    company = event['job__company__name'] or 'Unknown Company'
+    title = event['job__title']
+    payload = {
+        'id': event['event_key'],
+        'type': event['event_type'],
+        'date': event['date'].isoformat(),
+        'time': event['time'],
+        'company': company,
+        'priority': 'high',
+        'color': EVENT_COLORS[event['event_type']],
+        'location': event['job__location'] or 'TBD',
+        'job_id': event['job_id'],
+        'company_id': event['job__company_id'],
+    }
+    if event['event_type'] == CalendarEvent.APPLICATION_DEADLINE:
+        payload.update({
+            'title': f'Application Deadline: {title}',
+            'description': f'Application deadline for {title} at {company}',
+            'status': 'upcoming' if event['date'] > today else 'past',
+        })
+    else:
+        payload.update({
+            'title': f'Interview: {event["round_name"] or "Round"} - {title}',
+            'description': f'Interview round for {title} at {company}',
+            'status': 'upcoming' if event['date'] > today else ('ongoing' if event['date'] == today else 'past'),
+            'round_name': event['round_name'] or 'Interview Round',
+        })
+    return payload
+
+
+def feed_token(passout_year=None, branch=None):
+    """Signed token naming a cohort, used in the ICS feed URL"""
+    return signing.dumps([passout_year, branch or None], salt=FEED_SALT, compress=True)
+
+
+def read_feed_token(token):
+    """(passout_year, branch) of a feed token; raises signing.BadSignature"""
+    passout_year, branch = signing.loads(token, salt=FEED_SALT)
+    return passout_year, branch
+
+
+def _ics_text(value):
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _ics_fold(line):
+    """Fold a content line at 75 octets (RFC 5545 3.1)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Do not split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74
+    return '\r\n '.join(parts)
+
+
+def _ics_utc(value):
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _ics_start(date, event_time):
+    """DTSTART line: local time of day if the time parses, else an all-day event"""
+    for time_format in ('%H:%M', '%H:%M:%S'):
+        try:
+            start_time = datetime.strptime(event_time.strip(), time_format).time()
+        except ValueError:
+            continue
+        start = timezone.make_aware(datetime.combine(date, start_time))
+        return f'DTSTART:{_ics_utc(start)}'
+    return f'DTSTART;VALUE=DATE:{date.strftime("%Y%m%d")}'
+
+
+def _cohort_name(passout_year, branch):
+    parts = [str(passout_year) if passout_year else None, branch or None]
+    return ' '.join(part for part in parts if part) or 'All students'
+
+
+def render_ics(events, passout_year=None, branch=None):
+    """ICS calendar text for events_between() rows"""
+    today = timezone.localdate()
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Placements//Job calendar//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_ics_text("Placements - " + _cohort_name(passout_year, branch))}',
+    ]
+    for event in events:
+        payload = event_payload(event, today)
+        lines.extend([
+            'BEGIN:VEVENT',
+            f'UID:{_ics_text(payload["id"])}@placements',
+            f'DTSTAMP:{_ics_utc(event["job__updated_at"])}',
+            _ics_start(event['date'], event['time']),
+            f'SUMMARY:{_ics_text(payload["title"])}',
+            f'DESCRIPTION:{_ics_text(payload["description"])}',
+            f'LOCATION:{_ics_text(payload["location"])}',
+            f'CATEGORIES:{event["event_type"]}',
+            'END:VEVENT',
+        ])
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_ics_fold(line) for line in lines) + '\r\n'
+
+
+def ics_feed(passout_year=None, branch=None):
+    """
+    (body, etag) of the ICS feed of a cohort: events from ICS_PAST_DAYS
+    ago to ICS_FUTURE_DAYS ahead, cached per calendar version and day.
+    """
+    today = timezone.localdate()
+    cohort = hashlib.md5(f'{passout_year}|{branch}'.encode()).hexdigest()
+    cache_key = f'jobs:calendar:ics:{version()}:{today.isoformat()}:{cohort}'
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    active_years = None if passout_year or branch else set(YearManagement.get_active_years())
+    events = events_between(
+        today - timedelta(days=ICS_PAST_DAYS), today + timedelta(days=ICS_FUTURE_DAYS),
+        passout_year=passout_year, branch=branch, active_years=active_years,
+    )
+    body = render_ics(events, passout_year, branch)
+    result = (body, f'"{hashlib.md5(body.encode()).hexdigest()}"')
+    cache.set(cache_key, result, ICS_CACHE_SECONDS)
+    return result
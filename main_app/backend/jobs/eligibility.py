@@ -0,0 +1,232 @@
+"""
+Materialized job eligibility per student cohort.
+
+Whether a student may see and apply for a job only depends on the job's
+allowed passout years, allowed departments and arrears requirement, the
+active years in YearManagement, and the student's passout year, branch
+and whether they have active arrears. Students are grouped into cohorts
+by the latter three, and CohortEligibleJob stores which jobs each cohort
+is eligible for, so the job feed and eligibility checks are a join
+instead of a per-request evaluation. Both student job feeds
+(JobPostingListView, EnhancedJobListCreateView) read it.
+
+The mapping is kept up to date by jobs.signals:
+  JobPosting saved           refresh_job()      one job, every cohort
+  YearManagement changed     rebuild()          every job, every cohort
+  StudentProfile saved       ensure_cohort()    creates and fills the
+                                                student's cohort if new
+rebuild_job_eligibility recomputes everything after bulk writes.
+
+evaluate_jobs() answers "can this student apply?" for many jobs at once,
+combining the cohort mapping with the student's freeze restrictions and
+existing applications.
+"""
+
+from django.conf import settings
+from django.db import transaction
+
+from accounts.models import StudentProfile, YearManagement
+from .models import (
+    JobPosting,
+    JobApplication,
+    EligibilityCohort,
+    CohortEligibleJob,
+    normalize_passout_years,
+    normalize_departments,
+)
+
+# Most jobs evaluate_jobs() is asked about in one request
+ELIGIBILITY_BATCH_MAX_JOBS = getattr(settings, 'ELIGIBILITY_BATCH_MAX_JOBS', 100)
+
+NOT_ELIGIBLE_REASON = (
+    "You are not eligible for this job based on its passout year, department or arrears requirements."
+)
+
+
+def cohort_key(student_profile):
+    """(passout_year, branch, has_arrears) of a student"""
+    return (
+        student_profile.passout_year or 0,
+        student_profile.branch or '',
+        bool(student_profile.active_arrears),
+    )
+
+
+def is_eligible(allowed_years, allowed_departments, arrears_requirement, key, active_years):
+    """
+    Eligibility of a cohort for a job, given the job's (already
+    normalized) allowed years and departments
+    """
+    passout_year, branch, has_arrears = key
+    if allowed_years:
+        # Jobs restricted to passout years are only open while one of
+        # those years is active
+        if not allowed_years & active_years or passout_year not in allowed_years:
+            return False
+    if allowed_departments and branch not in allowed_departments:
+        return False
+    if arrears_requirement == 'NO_ARREARS_ALLOWED' and has_arrears:
+        return False
+    return True
+
+
+def _job_rules(jobs):
+    for job_id, allowed_years, allowed_departments, arrears_requirement in jobs.values_list(
+        'id', 'allowed_passout_years', 'allowed_departments', 'arrears_requirement'
+    ).iterator():
+        yield (
+            job_id,
+            normalize_passout_years(allowed_years),
+            normalize_departments(allowed_departments),
+            arrears_requirement,
+        )
+
+
+def _cohort_keys(cohorts):
+    return {
+        cohort_id: (passout_year, branch, has_arrears)
+        for cohort_id, passout_year, branch, has_arrears in cohorts.values_list(
+            'id', 'passout_year', 'branch', 'has_arrears'
+        )
+    }
+
+
+def compute_pairs(jobs=None, cohorts=None, active_years=None):
+    """Set of eligible (cohort_id, job_id) pairs for the given jobs and cohorts"""
+    jobs = JobPosting.objects.all() if jobs is None else jobs
+    cohorts = _cohort_keys(EligibilityCohort.objects.all() if cohorts is None else cohorts)
+    if active_years is None:
+        active_years = set(YearManagement.get_active_years())
+
+    pairs = set()
+    for job_id, allowed_years, allowed_departments, arrears_requirement in _job_rules(jobs):
+        for cohort_id, key in cohorts.items():
+            if is_eligible(allowed_years, allowed_departments, arrears_requirement, key, active_years):
+                pairs.add((cohort_id, job_id))
+    return pairs
+
+
+def _apply(pairs, stored):
+    """Write the difference between the wanted and the stored pairs"""
+    stale = stored - pairs
+    missing = pairs - stored
+
+    stale_by_job = {}
+    for cohort_id, job_id in stale:
+        stale_by_job.setdefault(job_id, []).append(cohort_id)
+    for job_id, cohort_ids in stale_by_job.items():
+        CohortEligibleJob.objects.filter(job_id=job_id, cohort_id__in=cohort_ids).delete()
+    CohortEligibleJob.objects.bulk_create(
+        [CohortEligibleJob(cohort_id=cohort_id, job_id=job_id) for cohort_id, job_id in missing],
+        batch_size=1000, ignore_conflicts=True
+    )
+    return len(stale) + len(missing)
+
+
+@transaction.atomic
+def refresh_job(job):
+    """Recompute the cohorts a job is open to. Returns the number of rows changed."""
+    pairs = compute_pairs(jobs=JobPosting.objects.filter(pk=job.pk))
+    stored = set(CohortEligibleJob.objects.filter(job=job).values_list('cohort_id', 'job_id'))
+    return _apply(pairs, stored)
+
+
+@transaction.atomic
+def rebuild():
+    """
+    Create a cohort for every student and recompute the whole mapping.
+    Returns the number of rows changed.
+    """
+    existing = set(_cohort_keys(EligibilityCohort.objects.all()).values())
+    student_keys = {
+        (passout_year or 0, branch or '', bool(active_arrears))
+        for passout_year, branch, active_arrears in StudentProfile.objects.values_list(
+            'passout_year', 'branch', 'active_arrears'
+        ).distinct()
+    }
+    EligibilityCohort.objects.bulk_create([
+        EligibilityCohort(passout_year=passout_year, branch=branch, has_arrears=has_arrears)
+        for passout_year, branch, has_arrears in student_keys - existing
+    ], ignore_conflicts=True)
+
+    stored = set(CohortEligibleJob.objects.values_list('cohort_id', 'job_id'))
+    return _apply(compute_pairs(), stored)
+
+
+def ensure_cohort(student_profile):
+    """Create and fill the student's EligibilityCohort if it does not exist yet"""
+    passout_year, branch, has_arrears = cohort_key(student_profile)
+    with transaction.atomic():
+        cohort, created = EligibilityCohort.objects.get_or_create(
+            passout_year=passout_year, branch=branch, has_arrears=has_arrears
+        )
+        if created:
+            _apply(compute_pairs(cohorts=EligibilityCohort.objects.filter(pk=cohort.pk)), set())
+    return cohort
+
+
+def _cohort_lookup(student_profile, prefix):
+    passout_year, branch, has_arrears = cohort_key(student_profile)
+    return {
+        f'{prefix}passout_year': passout_year,
+        f'{prefix}branch': branch,
+        f'{prefix}has_arrears': has_arrears,
+    }
+
+
+def eligible_jobs(student_profile, queryset=None):
+    """Restrict queryset (default: every job) to the jobs the student is eligible for"""
+    queryset = JobPosting.objects.all() if queryset is None else queryset
+    return queryset.filter(**_cohort_lookup(student_profile, 'eligible_cohorts__cohort__'))
+
+
+def evaluate_jobs(student_profile, job_ids):
+    """
+    {job_id: result} for the existing jobs among job_ids, where result is
+    what JobApplicationEligibilityView returns for the job plus
+    'eligible' and 'already_applied' flags. Takes at most four queries
+    however many jobs are asked about: the jobs, the cohort's eligible
+    jobs among them, the student's applications to them and, for a
+    partially frozen student, the names of their allowed companies.
+    """
+    jobs = JobPosting.objects.select_related('company').in_bulk(list(job_ids))
+    if not jobs:
+        return {}
+    eligible = set(CohortEligibleJob.objects.filter(
+        job_id__in=list(jobs), **_cohort_lookup(student_profile, 'cohort__')
+    ).values_list('job_id', flat=True))
+    applied = set(JobApplication.objects.filter(
+        applicant_id=student_profile.user_id, job_id__in=list(jobs)
+    ).values_list('job_id', flat=True))
+    company_names = None
+
+    results = {}
+    for job_id, job in jobs.items():
+        if student_profile.freeze_status == 'complete':
+            result = {
+                "can_apply": False,
+                "freeze_status": "complete",
+                "reason": "Your account is completely frozen. You cannot apply to any jobs.",
+                "freeze_reason": student_profile.freeze_reason
+            }
+        elif student_profile.freeze_status == 'partial' and not student_profile.can_apply_to_job(job):
+            if company_names is None:
+                company_names = student_profile.get_allowed_company_names()
+            result = {
+                "can_apply": False,
+                "freeze_status": "partial",
+                "reason": f"Your account has partial restrictions. {student_profile.freeze_reason}",
+                "freeze_reason": student_profile.freeze_reason,
+                "restrictions": student_profile.get_freeze_restriction_reasons(job, company_names)
+            }
+        elif job_id not in eligible:
+            result = {"can_apply": False, "reason": NOT_ELIGIBLE_REASON}
+        elif job_id in applied:
+            result = {"can_apply": False, "reason": "You have already applied to this job."}
+        else:
+            result = {"can_apply": True, "freeze_status": student_profile.freeze_status}
+
+        result['eligible'] = job_id in eligible
+        result['already_applied'] = job_id in applied
+        results[job_id] = result
+    return results
@@ -0,0 +1,277 @@
+"""
+Background application exports.
+
+request_export() turns an export config into an ExportJob. The job's
+fingerprint hashes the format, columns and filters together with the data
+version of the matching applications (row count and latest updated_at of
+the applications, their jobs, companies and student profiles), so:
+  - a completed job with the same fingerprint whose file still exists is
+    returned as is, without regenerating anything
+  - a pending or running job with the same fingerprint is shared
+  - otherwise a new job is created and queued on export_workers
+Changes that touch none of those timestamps (e.g. a user's login email)
+do not produce a new version.
+
+export_workers runs jobs on a bounded thread pool in the web process. Jobs
+are claimed with a conditional update, so the run_export_jobs command can
+safely pick up jobs that were never started (full queue, restarted
+process) or were left RUNNING by a process that died, and purges files
+older than EXPORT_RETENTION_HOURS. A running job bumps heartbeat_at with
+every progress report; it is only considered abandoned once that stops,
+so long exports are not taken over while they are still being written.
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from .models import ExportJob
+from .utils import ApplicationExportService
+
+logger = logging.getLogger(__name__)
+
+EXPORT_WORKERS = getattr(settings, 'EXPORT_WORKERS', 2)
+EXPORT_RETENTION_HOURS = getattr(settings, 'EXPORT_RETENTION_HOURS', 24)
+# Pending jobs older than this, and running jobs without a heartbeat for
+# this long, are considered abandoned
+EXPORT_STALE_MINUTES = getattr(settings, 'EXPORT_STALE_MINUTES', 30)
+
+
+def normalize_config(config):
+    """JSON-safe export config with a canonical form, for storing and hashing"""
+    return {
+        'columns': list(config['columns']),
+        'job_id': config.get('job_id'),
+        'status': sorted(config.get('status') or []),
+        'date_from': str(config['date_from']) if config.get('date_from') else None,
+        'date_to': str(config['date_to']) if config.get('date_to') else None,
+        'archived': bool(config.get('archived')),
+    }
+
+
+def _hash(value):
+    return hashlib.sha256(
+        json.dumps(value, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    ).hexdigest()
+
+
+def data_version(queryset):
+    """Hash of the row count and latest modification times behind an export"""
+    return _hash(queryset.order_by().aggregate(
+        rows=Count('id'),
+        applications=Max('updated_at'),
+        jobs=Max('job__updated_at'),
+        companies=Max('job__company__updated_at'),
+        students=Max('applicant__student_profile__updated_at'),
+    ))
+
+
+def export_fingerprint(export_format, config, version):
+    return _hash({'format': export_format, 'config': config, 'data_version': version})
+
+
+def _stale_before():
+    return timezone.now() - timedelta(minutes=EXPORT_STALE_MINUTES)
+
+
+def _is_stale(job):
+    if job.status == 'RUNNING':
+        last_seen = job.heartbeat_at or job.started_at
+    else:
+        last_seen = job.created_at
+    return last_seen < _stale_before()
+
+
+def _has_file(job):
+    return bool(job.file) and job.file.storage.exists(job.file.name)
+
+
+def request_export(export_format, config, user=None):
+    """
+    Return (job, created): a reusable job for this export, or a newly
+    queued one.
+    """
+    config = normalize_config(config)
+    version = data_version(ApplicationExportService().get_queryset(config))
+    fingerprint = export_fingerprint(export_format, config, version)
+
+    candidates = ExportJob.objects.filter(
+        fingerprint=fingerprint, status__in=['PENDING', 'RUNNING', 'COMPLETED']
+    ).order_by('-created_at')
+    for job in candidates:
+        if job.status == 'COMPLETED':
+            if _has_file(job):
+                return job, False
+        elif not _is_stale(job):
+            return job, False
+
+    job = ExportJob.objects.create(
+        requested_by=user,
+        format=export_format,
+        config=config,
+        data_version=version,
+        fingerprint=fingerprint,
+    )
+    transaction.on_commit(lambda: export_workers.submit(job.pk))
+    return job, True
+
+
+def claim(job_id):
+    """Move a pending job to RUNNING; False if someone else got it first"""
+    now = timezone.now()
+    return ExportJob.objects.filter(pk=job_id, status='PENDING').update(
+        status='RUNNING', started_at=now, heartbeat_at=now, processed_rows=0, error=''
+    ) == 1
+
+
+def _as_file(content):
+    """Django File for a generate_export() result"""
+    if isinstance(content, bytes):
+        return ContentFile(content)
+    if hasattr(content, 'read'):
+        return File(content)
+
+    # Streamed content is spooled to disk rather than joined in memory
+    output = tempfile.TemporaryFile()
+    for chunk in content:
+        output.write(chunk)
+    output.seek(0)
+    return File(output)
+
+
+def run_export(job_id):
+    """Generate the file of a pending job. Returns False if the job could not be claimed."""
+    if not claim(job_id):
+        return False
+
+    job = ExportJob.objects.get(pk=job_id)
+    service = ApplicationExportService()
+    queryset = service.get_queryset(job.config)
+    file = None
+
+    def progress(count):
+        ExportJob.objects.filter(pk=job.pk).update(processed_rows=count, heartbeat_at=timezone.now())
+
+    try:
+        total = queryset.count()
+        ExportJob.objects.filter(pk=job.pk).update(total_rows=total, heartbeat_at=timezone.now())
+
+        file_data = service.generate_export(
+            queryset=queryset,
+            format=job.format,
+            columns=job.config['columns'],
+            job_id=job.config.get('job_id'),
+            progress=progress,
+        )
+        file = _as_file(file_data['content'])
+        job.file.save(f"{job.pk}_{file_data['filename']}", file, save=False)
+
+        job.status = 'COMPLETED'
+        job.total_rows = total
+        job.processed_rows = total
+        job.filename = file_data['filename']
+        job.content_type = file_data['content_type']
+        job.file_size = job.file.size
+        job.completed_at = timezone.now()
+        job.save(update_fields=[
+            'file', 'status', 'total_rows', 'processed_rows', 'filename',
+            'content_type', 'file_size', 'completed_at',
+        ])
+        logger.info(f"Export {job.pk} completed: {total} rows, {job.file_size} bytes")
+    except Exception as e:
+        logger.error(f"Export {job.pk} failed: {str(e)}", exc_info=True)
+        ExportJob.objects.filter(pk=job.pk).update(
+            status='FAILED', error=str(e), completed_at=timezone.now()
+        )
+    finally:
+        if file is not None:
+            file.close()
+    return True
+
+
+def requeue_stale():
+    """Put jobs left RUNNING by a dead worker (no recent heartbeat) back in the queue"""
+    stale_before = _stale_before()
+    return ExportJob.objects.filter(status='RUNNING').filter(
+        Q(heartbeat_at__lt=stale_before) | Q(heartbeat_at__isnull=True, started_at__lt=stale_before)
+    ).update(status='PENDING', started_at=None, heartbeat_at=None)
+
+
+def purge_expired(retention_hours=EXPORT_RETENTION_HOURS):
+    """Delete finished jobs older than the retention period, with their files"""
+    cutoff = timezone.now() - timedelta(hours=retention_hours)
+    expired = ExportJob.objects.filter(
+        Q(status__in=['COMPLETED', 'FAILED'], completed_at__lt=cutoff)
+        | Q(status='PENDING', created_at__lt=cutoff)
+    )
+    purged = 0
+    for job in expired.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        purged += 1
+    return purged
+
+
+class ExportWorkerPool:
+    """
+    Bounded pool of export workers. submit() never blocks: a job that is
+    already queued here, or a full queue, is skipped and the job stays
+    PENDING for run_export_jobs.
+    """
+
+    def __init__(self, max_workers, max_pending=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * 8
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, job_id):
+        with self._lock:
+            if job_id in self._pending or len(self._pending) >= self.max_pending:
+                return False
+            self._pending.add(job_id)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='export'
+                )
+
+        self._executor.submit(self._run, job_id)
+        return True
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _run(self, job_id):
+        close_old_connections()
+        try:
+            run_export(job_id)
+        except Exception as e:
+            logger.error(f"Export worker failed on {job_id}: {str(e)}", exc_info=True)
+        finally:
+            with self._lock:
+                self._pending.discard(job_id)
+            connection.close()
+
+
+export_workers = ExportWorkerPool(EXPORT_WORKERS)
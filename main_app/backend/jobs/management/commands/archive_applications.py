@@ -0,0 +1,112 @@
+"""
+Management command to archive applications of past placement seasons
+(jobs.archive): applications of students in inactive passout years and
+soft-deleted applications are moved to ArchivedApplication, after the
+metrics of each archived year are frozen (metrics.frozen).
+
+    python manage.py archive_applications --dry-run
+    python manage.py archive_applications
+    python manage.py archive_applications --restore --year 2023
+
+--restore moves a year's archived applications back and serves its
+metrics live again; make the year active first, or the next run archives
+it again.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from accounts.models import YearManagement
+from jobs import archive
+from jobs.models import ArchivedApplication
+from metrics.frozen import freeze_year, unfreeze_year
+
+
+class Command(BaseCommand):
+    help = 'Move applications of inactive passout years and soft-deleted ones to the archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year',
+            type=int,
+            action='append',
+            dest='years',
+            help='Passout year to archive or restore (repeatable; default: every inactive year)',
+        )
+        parser.add_argument(
+            '--keep-deleted',
+            action='store_true',
+            help='Leave soft-deleted applications of other years in place',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be archived',
+        )
+        parser.add_argument(
+            '--restore',
+            action='store_true',
+            help='Move the archived applications of --year back instead',
+        )
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            self.restore(options['years'], options['dry_run'])
+            return
+
+        years = options['years'] or archive.inactive_years()
+        active = set(years) & set(YearManagement.get_active_years())
+        if active:
+            raise CommandError(f"❌ Active years cannot be archived: {', '.join(map(str, sorted(active)))}")
+
+        applications = archive.archivable_applications(years, deleted=not options['keep_deleted'])
+        by_year = dict(
+            applications.filter(is_deleted=False).values_list('applicant__student_profile__passout_year')
+            .annotate(total=Count('id')).order_by()
+        )
+        deleted = applications.filter(is_deleted=True).count()
+
+        for year in sorted(years):
+            self.stdout.write(f'  {year}: {by_year.get(year, 0)} applications')
+        self.stdout.write(f'  soft-deleted: {deleted} applications')
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('⚠️  Dry run, nothing archived'))
+            return
+
+        for year in sorted(years):
+            _, created = freeze_year(year)
+            if created:
+                self.stdout.write(f'  froze the metrics of {year}')
+
+        moved = archive.archive(applications)
+        self.stdout.write(self.style.SUCCESS(f'✅ Archived {moved} applications'))
+
+    def restore(self, years, dry_run):
+        if not years:
+            raise CommandError('❌ --restore needs at least one --year')
+
+        archived = ArchivedApplication.objects.filter(
+            passout_year__in=years, reason=ArchivedApplication.REASON_INACTIVE_YEAR
+        )
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f'⚠️  Dry run, {archived.count()} applications would be restored'))
+            return
+
+        restored, skipped, lost_cards = archive.restore(archived)
+        still_archived = set(archived.values_list('passout_year', flat=True).distinct())
+        for year in set(years) - still_archived:
+            unfreeze_year(year)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Restored {restored} applications'))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {skipped} applications stay archived: their students applied to the same job again'
+            ))
+        if lost_cards:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {lost_cards} candidate cards could not be restored: their pipeline or stage is gone'
+            ))
+        inactive = set(years) - set(YearManagement.get_active_years())
+        if inactive:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️  Still inactive, archived again on the next run: {', '.join(map(str, sorted(inactive)))}"
+            ))
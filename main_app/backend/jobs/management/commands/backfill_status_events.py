@@ -0,0 +1,39 @@
+"""
+Management command to create status events (jobs.status_events) from
+status_history for applications that have none, e.g. ones written by
+bulk imports that bypass the model signals, and the initial event of
+applications that only have later ones. The migration adding the event
+table backfills existing applications already.
+"""
+from django.core.management.base import BaseCommand
+from jobs import status_events
+
+
+class Command(BaseCommand):
+    help = 'Create missing application status events from status_history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report applications without status events or without their initial event',
+        )
+
+    def handle(self, *args, **options):
+        missing = status_events.applications_without_initial_event().count()
+        if options['check']:
+            if not missing:
+                self.stdout.write(self.style.SUCCESS('✅ Every application has its status events'))
+                return
+
+            without_events = status_events.applications_without_events().count()
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {missing} applications without their initial status event '
+                f'({without_events} without any status events)'
+            ))
+            return
+
+        created = status_events.backfill()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Created {created} status events for {missing} applications'
+        ))
@@ -0,0 +1,176 @@
+"""
+Micro-benchmark of export row building: ApplicationExportService.get_column_value
+per cell against the accessors from compile_columns().
+
+Applications, students and jobs are built in memory (nothing touches the
+database), with snapshots mixing every column kind an export can contain:
+application fields, snapshot sections, custom responses, additional
+fields found by key or by label, and legacy top-level keys. Both paths
+must produce identical rows; the command fails otherwise.
+
+    python manage.py benchmark_export_columns --applications 10000 --columns 40
+"""
+
+import random
+import statistics
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.models import User, StudentProfile
+from companies.models import Company
+from jobs.models import JobPosting, JobApplication
+from jobs.utils import ApplicationExportService, APPLICATION_COLUMNS, snapshot_sections
+
+STATUSES = ['APPLIED', 'UNDER_REVIEW', 'SHORTLISTED', 'REJECTED', 'HIRED']
+SECTIONS = ['basic_info', 'academic_info', 'contact_info', 'custom_responses']
+
+
+def build_columns(count):
+    """count columns: every application column, then the snapshot kinds in turn"""
+    columns = list(APPLICATION_COLUMNS[:count])
+    index = 0
+    while len(columns) < count:
+        kind = index % 6
+        if kind < 4:
+            columns.append(f'{SECTIONS[kind]}_{index}')
+        elif kind == 4:
+            columns.append(f'field_{index}')
+        else:
+            columns.append(f'legacy_{index}')
+        index += 1
+    return columns
+
+
+def build_applications(count, columns, job_count, seed):
+    rng = random.Random(seed)
+    field_columns = [column for column in columns if column.startswith('field_')]
+
+    jobs = []
+    for job_id in range(1, job_count + 1):
+        company = Company(id=job_id, name=f'Company {job_id}')
+        # Each job knows a random half of the additional fields, half of
+        # them by label only
+        additional_fields = [
+            {'id': column[len('field_'):], 'label': f'Question {column}', 'type': 'text'}
+            for column in field_columns if rng.random() < 0.5
+        ]
+        jobs.append(JobPosting(id=job_id, title=f'Job {job_id}', company=company,
+                               additional_fields=additional_fields))
+
+    applications = []
+    for application_id in range(1, count + 1):
+        user = User(id=application_id, email=f'student{application_id}@example.com')
+        user.student_profile = StudentProfile(
+            user=user, first_name=f'First{application_id}', last_name='Last',
+            student_id=f'S{application_id:06d}', branch=rng.choice(['CSE', 'ECE', 'MECH']),
+        )
+        job = rng.choice(jobs)
+
+        snapshot = {section: {} for section in SECTIONS}
+        for column in columns:
+            if column in APPLICATION_COLUMNS or rng.random() < 0.2:
+                continue
+            section = next((name for name in SECTIONS if column.startswith(name)), None)
+            if section == 'custom_responses':
+                snapshot[section][column] = [rng.randint(1, 9), 'x'] if rng.random() < 0.3 else 'answer'
+            elif section:
+                snapshot[section][column] = rng.randint(1, 100)
+            elif column.startswith('field_'):
+                # Stored under the column, the bare id or the question label
+                key = rng.choice([column, column[len('field_'):], f'Question {column}'])
+                snapshot['custom_responses'][key] = 'response'
+            else:
+                snapshot[column] = 'legacy'
+
+        applications.append(JobApplication(
+            id=application_id, job=job, applicant=user, status=rng.choice(STATUSES),
+            applied_at=timezone.make_aware(datetime(2024, 1, 1 + application_id % 28)),
+            applied_data_snapshot=snapshot,
+        ))
+    return applications
+
+
+def per_cell_rows(service, applications, columns):
+    return [[service.get_column_value(application, column) for column in columns] for application in applications]
+
+
+def compiled_rows(service, applications, columns):
+    accessors = service.compile_columns(columns)
+    rows = []
+    for application in applications:
+        sections = snapshot_sections(application)
+        rows.append([accessor(application, sections) for accessor in accessors])
+    return rows
+
+
+def timed(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-cell against compiled column accessors for application exports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--applications',
+            type=int,
+            default=10000,
+            help='Number of applications (default: 10000)',
+        )
+        parser.add_argument(
+            '--columns',
+            type=int,
+            default=40,
+            help='Number of exported columns (default: 40)',
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=50,
+            help='Number of jobs the applications are spread over (default: 50)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Timed runs per path; the median is reported (default: 3)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the generated applications (default: 42)',
+        )
+
+    def handle(self, *args, **options):
+        service = ApplicationExportService()
+        columns = build_columns(options['columns'])
+        applications = build_applications(options['applications'], columns, options['jobs'], options['seed'])
+        cells = len(applications) * len(columns)
+
+        self.stdout.write(
+            f"⏱️  {len(applications)} applications × {len(columns)} columns "
+            f"({cells} cells), median of {options['repeat']} runs"
+        )
+
+        per_cell_ms, expected = timed(lambda: per_cell_rows(service, applications, columns), options['repeat'])
+        compiled_ms, actual = timed(lambda: compiled_rows(service, applications, columns), options['repeat'])
+
+        if actual != expected:
+            mismatches = sum(1 for left, right in zip(actual, expected) if left != right)
+            raise CommandError(f'❌ Compiled accessors differ from get_column_value on {mismatches} rows')
+
+        self.stdout.write(f'  get_column_value per cell   {per_cell_ms:9.1f} ms  ({per_cell_ms * 1e6 / cells:6.0f} ns/cell)')
+        self.stdout.write(f'  compiled accessors          {compiled_ms:9.1f} ms  ({compiled_ms * 1e6 / cells:6.0f} ns/cell)')
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Identical output, {per_cell_ms / compiled_ms:.1f}x faster compiled'
+        ))
@@ -0,0 +1,42 @@
+"""
+Management command to compact application snapshots (jobs.snapshots):
+moves profile and documents sections still held in applied_data_snapshot
+(e.g. written by imports that bypass jobs.snapshots) into the shared
+store, then deletes sections no application references any more, such as
+the old documents after a resume change. Run it off-peak: a section
+deleted while an application is being pointed at it fails that write.
+"""
+from django.core.management.base import BaseCommand
+from jobs import snapshots
+
+
+class Command(BaseCommand):
+    help = 'Move inline snapshot sections into the shared store and delete unused ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report applications with inline sections and unused sections',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            inline = sum(
+                1 for application in snapshots.inline_applications().only('id', 'applied_data_snapshot').iterator()
+                if snapshots.needs_compaction(application)
+            )
+            unused = snapshots.unreferenced_sections().count()
+            if not inline and not unused:
+                self.stdout.write(self.style.SUCCESS('✅ All snapshots are compact'))
+                return
+
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {inline} applications with inline sections, {unused} unused sections'
+            ))
+            return
+
+        moved, deleted = snapshots.compact()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Moved {moved} applications to shared sections, deleted {deleted} unused sections'
+        ))
@@ -10,6 +10,7 @@ from accounts.models import StudentProfile
 from companies.models import Company
 from college.models import College
 from jobs.views import create_enhanced_application_snapshot
+from jobs import snapshots
 
 User = get_user_model()
 
@@ -186,7 +187,7 @@ class Command(BaseCommand):
                     applicant=student,
                     cover_letter=cover_letter,
                     status=status,
-                    applied_data_snapshot=snapshot,
+                    **snapshots.stored_fields(snapshot),
                     applied_at=applied_at
                 )
                 
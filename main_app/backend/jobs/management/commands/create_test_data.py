@@ -5,6 +5,7 @@ from datetime import timedelta, date
 import random
 
 from jobs.models import JobPosting, JobApplication
+from jobs import snapshots
 from accounts.models import StudentProfile
 # EmployerProfile removed - using Company model directly
 from college.models import College
@@ -332,7 +333,7 @@ class Command(BaseCommand):
                 applicant=student,
                 cover_letter=f"Dear Hiring Manager,\n\nI am excited to apply for the {job.title} position at {job.company.name}. With my strong background in software development and passion for technology, I believe I would be a great fit for your team.\n\nBest regards,\n{student.student_profile.first_name}",
                 status=random.choices(application_statuses, weights=application_weights)[0],
-                applied_data_snapshot={
+                **snapshots.stored_fields({
                     "basic_info": {
                         "name": f"{student.student_profile.first_name} {student.student_profile.last_name}",
                         "email": student.student_profile.contact_email or student.email,
@@ -360,7 +361,7 @@ class Command(BaseCommand):
                         "form_version": "1.0",
                         "submission_timestamp": timezone.now().isoformat(),
                     }
-                }
+                })
             )
             applications.append(application)
             
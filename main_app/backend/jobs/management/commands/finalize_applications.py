@@ -0,0 +1,42 @@
+"""
+Management command to finalize applications whose snapshot is still
+provisional (jobs.applications), e.g. because the process that accepted
+them stopped before finalizing. Uploaded files that were only held in
+memory by that process cannot be recovered; the snapshot is rebuilt from
+the student's profile and the custom responses stored with the
+application.
+"""
+from django.core.management.base import BaseCommand
+from jobs import applications
+
+
+class Command(BaseCommand):
+    help = 'Build the full snapshot of applications left with a provisional one'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=10,
+            help='Only applications submitted at least this many minutes ago (default: 10)',
+        )
+
+    def handle(self, *args, **options):
+        pending = list(
+            applications.pending_applications(options['older_than']).values_list('id', flat=True)
+        )
+        if not pending:
+            self.stdout.write(self.style.SUCCESS('✅ No pending applications'))
+            return
+
+        failed = 0
+        for application_id in pending:
+            try:
+                applications.finalize_application(application_id)
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'❌ Application #{application_id}: {str(e)}'))
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Finalized {len(pending) - failed} applications'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'⚠️  {failed} applications could not be finalized'))
@@ -0,0 +1,283 @@
+"""
+Deadline-day load test of the apply endpoint: --applicants students apply
+to one job at the same moment, each uploading a resume and a custom field
+file, and --duplicate-rate of them submit twice at once (double clicks,
+client retries).
+
+Requests go through the Django test client in this process, one thread
+per concurrent request, each with its own database connection; with
+--base-url they are sent over HTTP to a running server using the same
+database instead. The command reports status codes and latency
+percentiles, then checks that every applicant ended up with exactly one
+application, that only duplicates were rejected and that every snapshot
+was finalized.
+
+It creates its own company, job and students (loadtest-<run>-<n>@example.com)
+and deletes them, with their uploaded files, unless --keep is given. Do
+not run it against a production database.
+
+    python manage.py loadtest_applications --applicants 500
+"""
+
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import StudentProfile, YearManagement
+from college.models import College
+from companies.models import Company
+from jobs import applications
+from jobs.models import JobPosting, JobApplication
+
+User = get_user_model()
+
+RESUME_BYTES = b'%PDF-1.4\n% load test resume\n' + b'0' * 20 * 1024
+PORTFOLIO_BYTES = b'load test portfolio\n' * 256
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def application_data(index):
+    return {
+        'cover_letter': f'Load test application {index}',
+        'why_this_role': 'Deadline day',
+        'resume': SimpleUploadedFile('resume.pdf', RESUME_BYTES, content_type='application/pdf'),
+        'portfolio': SimpleUploadedFile('portfolio.txt', PORTFOLIO_BYTES, content_type='text/plain'),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Simulate many students applying to one job at once and report latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--applicants',
+            type=int,
+            default=500,
+            help='Number of students applying (default: 500)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Requests in flight at once (default: all of them)',
+        )
+        parser.add_argument(
+            '--duplicate-rate',
+            type=float,
+            default=0.1,
+            help='Share of students submitting twice concurrently (default: 0.1)',
+        )
+        parser.add_argument(
+            '--base-url',
+            help='Send requests over HTTP to this server (e.g. http://localhost:8000) instead of in-process',
+        )
+        parser.add_argument(
+            '--finalize-timeout',
+            type=float,
+            default=120,
+            help='Seconds to wait for snapshots to be finalized (default: 120)',
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the generated company, job, students and applications',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for picking duplicate submitters (default: 42)',
+        )
+
+    def handle(self, *args, **options):
+        run = timezone.now().strftime('%Y%m%d%H%M%S')
+        job, students = self.create_fixture(run, options['applicants'])
+
+        try:
+            rng = random.Random(options['seed'])
+            duplicates = set(rng.sample(range(len(students)), int(len(students) * options['duplicate_rate'])))
+            requests = [index for index in range(len(students))] + sorted(duplicates)
+            rng.shuffle(requests)
+            concurrency = options['concurrency'] or len(requests)
+
+            mode = f"HTTP to {options['base_url']}" if options['base_url'] else 'in-process'
+            self.stdout.write(
+                f'⏱️  {len(students)} applicants ({len(duplicates)} submitting twice), '
+                f'{concurrency} concurrent requests, {mode}'
+            )
+
+            results, elapsed = self.fire(job, students, requests, concurrency, options['base_url'])
+            self.report(results, elapsed)
+
+            finalized = self.wait_for_finalize(job, options['finalize_timeout'], options['base_url'])
+            self.verify(job, students, duplicates, results, finalized)
+        finally:
+            if options['keep']:
+                self.stdout.write(f'Kept job #{job.pk} and students loadtest-{run}-*')
+            else:
+                self.cleanup(job, run)
+
+    def create_fixture(self, run, count):
+        college = College.objects.order_by('id').first() or College.objects.create(name='Load Test College', slug=f'loadtest-{run}')
+        passout_year = (YearManagement.get_active_years() or [timezone.now().year])[0]
+
+        company = Company.objects.create(
+            name=f'Load Test {run}', description='Load test company', industry='Testing', size='1-10',
+            founded='2000', location='Nowhere', website='https://example.com'
+        )
+        job = JobPosting.objects.create(
+            company=company, title=f'Load Test Role {run}', description='Load test job', location='Remote',
+            required_skills='', application_deadline=timezone.now().date(), is_active=True, is_published=True
+        )
+
+        students = []
+        for index in range(count):
+            user = User.objects.create_user(email=f'loadtest-{run}-{index}@example.com', college=college)
+            StudentProfile.objects.create(
+                user=user, college=college, first_name='Load', last_name=f'Tester {index}',
+                student_id=f'LT{run}{index:05d}', branch='CSE', passout_year=passout_year,
+                contact_email=user.email,
+            )
+            students.append((user, str(AccessToken.for_user(user))))
+        return job, students
+
+    def fire(self, job, students, requests, concurrency, base_url):
+        path = reverse('enhanced-job-application-create', args=[job.pk])
+        start_gate = threading.Event()
+        local = threading.local()
+
+        def send(index):
+            user, token = students[index]
+            start_gate.wait()
+            started = time.perf_counter()
+            try:
+                if base_url:
+                    status = self.post_http(base_url.rstrip('/') + path, token, application_data(index))
+                else:
+                    if not hasattr(local, 'client'):
+                        # Count server errors as 500s, like over HTTP
+                        local.client = Client(raise_request_exception=False)
+                    status = local.client.post(
+                        path, application_data(index), HTTP_AUTHORIZATION=f'Bearer {token}'
+                    ).status_code
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'❌ Request for applicant {index} failed: {str(e)}'))
+                status = 0
+            finally:
+                if not base_url:
+                    connection.close()
+            return index, status, (time.perf_counter() - started) * 1000
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='loadtest') as executor:
+            futures = [executor.submit(send, index) for index in requests]
+            started = time.perf_counter()
+            start_gate.set()
+            results = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+        return results, elapsed
+
+    def post_http(self, url, token, data):
+        request = urllib.request.Request(
+            url,
+            data=encode_multipart(BOUNDARY, data),
+            headers={'Content-Type': MULTIPART_CONTENT, 'Authorization': f'Bearer {token}'},
+            method='POST',
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=300) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def report(self, results, elapsed):
+        latencies = [latency for _, _, latency in results]
+        statuses = Counter(status for _, status, _ in results)
+        self.stdout.write(f'  requests     {len(results)} in {elapsed:.1f} s ({len(results) / elapsed:.1f} req/s)')
+        self.stdout.write('  status       ' + '  '.join(f'{status}: {count}' for status, count in sorted(statuses.items())))
+        self.stdout.write(
+            f'  latency ms   p50 {percentile(latencies, 50):.1f}  p95 {percentile(latencies, 95):.1f}  '
+            f'p99 {percentile(latencies, 99):.1f}  max {max(latencies):.1f}'
+        )
+
+    def wait_for_finalize(self, job, timeout, base_url):
+        """Seconds until no snapshot of the job was pending, or None on timeout"""
+        started = time.perf_counter()
+        if not base_url:
+            applications.finalize_workers.wait(timeout)
+        pending = applications.pending_applications().filter(job=job)
+        while pending.exists():
+            if time.perf_counter() - started > timeout:
+                return None
+            time.sleep(0.5)
+        return time.perf_counter() - started
+
+    def verify(self, job, students, duplicates, results, finalized):
+        problems = []
+        created = Counter(index for index, status, _ in results if status == 201)
+        rejected = Counter(index for index, status, _ in results if status == 400)
+        failed = [(index, status) for index, status, _ in results if status not in (201, 400)]
+
+        if failed:
+            problems.append(f'{len(failed)} requests failed (status {sorted({status for _, status in failed})})')
+        missing = [index for index in range(len(students)) if created[index] != 1]
+        if missing:
+            problems.append(f'{len(missing)} applicants did not get exactly one 201')
+        unexpected = [index for index in rejected if index not in duplicates or rejected[index] > 1]
+        if unexpected:
+            problems.append(f'{len(unexpected)} applicants were rejected without a duplicate submission')
+
+        stored = JobApplication.objects.filter(job=job)
+        doubled = stored.values('applicant').annotate(total=Count('id')).filter(total__gt=1).count()
+        if doubled:
+            problems.append(f'{doubled} applicants have more than one application')
+        if stored.count() != len(students):
+            problems.append(f'{stored.count()} applications stored for {len(students)} applicants')
+        if finalized is None:
+            pending = applications.pending_applications().filter(job=job).count()
+            problems.append(f'{pending} snapshots still pending')
+        elif stored.filter(resume='').exists() or stored.filter(resume__isnull=True).exists():
+            problems.append('applications without a stored resume')
+
+        if problems:
+            raise CommandError('❌ ' + '; '.join(problems))
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {stored.count()} applications, one per applicant; {len(duplicates)} duplicates rejected; '
+            f'snapshots finalized {finalized:.1f} s after the last response'
+        ))
+
+    def cleanup(self, job, run):
+        for application in JobApplication.objects.filter(job=job).iterator():
+            if application.resume:
+                application.resume.delete(save=False)
+            custom_responses = (application.applied_data_snapshot or {}).get('custom_responses') or {}
+            for value in custom_responses.values():
+                if isinstance(value, str) and value.startswith('/media/'):
+                    default_storage.delete(value[len('/media/'):])
+        company = job.company
+        job.delete()
+        company.delete()
+        User.objects.filter(email__startswith=f'loadtest-{run}-').delete()
+        self.stdout.write('Removed the load test data')
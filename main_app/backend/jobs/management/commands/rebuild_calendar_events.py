@@ -0,0 +1,36 @@
+"""
+Management command to rebuild the calendar events derived from job
+deadlines and interview rounds (jobs.calendar_events). Run it after writes
+that bypass JobPosting.save() (bulk_create, queryset.update, raw imports)
+or to check that the rows have not drifted.
+"""
+from django.core.management.base import BaseCommand
+from jobs import calendar_events
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the calendar events of job postings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report calendar rows that differ from the job postings',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drifted = calendar_events.expected_rows() ^ calendar_events.stored_rows()
+            if not drifted:
+                self.stdout.write(self.style.SUCCESS('✅ All calendar events match their jobs'))
+                return
+
+            jobs = sorted({row[0] for row in drifted})
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {len(drifted)} calendar rows out of sync across {len(jobs)} jobs: '
+                + ', '.join(f'#{job_id}' for job_id in jobs[:20])
+            ))
+            return
+
+        stored = calendar_events.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✅ Stored {stored} calendar event rows'))
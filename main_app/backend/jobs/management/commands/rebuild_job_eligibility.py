@@ -0,0 +1,38 @@
+"""
+Management command to rebuild the materialized cohort -> eligible job
+mapping (jobs.eligibility) from each job's allowed lists. Run it after
+writes that bypass JobPosting/StudentProfile.save() (bulk_create,
+queryset.update, raw imports) or to check that the rows have not drifted.
+"""
+from django.core.management.base import BaseCommand
+from jobs import eligibility
+from jobs.models import CohortEligibleJob
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cohort job eligibility rows from allowed_passout_years/allowed_departments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report cohort eligibility rows that differ from the jobs and cohorts',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            expected_pairs = eligibility.compute_pairs()
+            stored_pairs = set(CohortEligibleJob.objects.values_list('cohort_id', 'job_id'))
+            drifted_pairs = expected_pairs ^ stored_pairs
+
+            if not drifted_pairs:
+                self.stdout.write(self.style.SUCCESS('✅ All job eligibility rows match'))
+                return
+
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {len(drifted_pairs)} cohort eligibility rows out of sync'
+            ))
+            return
+
+        changed = eligibility.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✅ Updated {changed} cohort eligibility rows'))
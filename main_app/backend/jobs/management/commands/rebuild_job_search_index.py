@@ -0,0 +1,21 @@
+"""
+Management command to rebuild the full-text search index of job postings
+(jobs.search). Run it after writes that bypass model signals (bulk_create,
+queryset.update, raw imports).
+"""
+from django.core.management.base import BaseCommand
+from jobs import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of job postings'
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stdout.write(self.style.WARNING(
+                '⚠️  No search index on this database; job search uses icontains matching'
+            ))
+            return
+
+        indexed = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'✅ Indexed {indexed} job postings'))
@@ -0,0 +1,40 @@
+"""
+Management command to rebuild the placed students read model
+(jobs.placements) from hired applications and profiles marked placed.
+Run it after writes that bypass model signals (bulk_create,
+queryset.update, raw imports) or to check that the rows have not drifted.
+"""
+from django.core.management.base import BaseCommand
+from jobs import placements
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the placed students read model'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report students whose placement row is missing, stale or wrong',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            wanted = placements.compute_rows()
+            stored = placements.stored_rows()
+            drifted = sorted(
+                profile_id for profile_id in set(wanted) | set(stored)
+                if wanted.get(profile_id) != stored.get(profile_id)
+            )
+            if not drifted:
+                self.stdout.write(self.style.SUCCESS(f'✅ All {len(stored)} placements match'))
+                return
+
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  {len(drifted)} placements out of sync (student profiles '
+                + ', '.join(f'#{profile_id}' for profile_id in drifted[:20]) + ')'
+            ))
+            return
+
+        changed = placements.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✅ Updated {changed} placement rows'))
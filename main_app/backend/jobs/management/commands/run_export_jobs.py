@@ -0,0 +1,74 @@
+"""
+Long-running worker for background application exports (jobs.exports).
+
+Every --interval seconds it requeues jobs abandoned by a dead worker, runs
+the pending ones on a bounded thread pool and deletes finished exports
+older than the retention period.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from jobs.exports import ExportWorkerPool, purge_expired, requeue_stale, EXPORT_RETENTION_HOURS
+from jobs.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = 'Run queued application exports and purge expired export files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Number of exports generated in parallel (default: 2)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=10,
+            help='Seconds between scans for pending exports (default: 10)',
+        )
+        parser.add_argument(
+            '--retention-hours',
+            type=float,
+            default=EXPORT_RETENTION_HOURS,
+            help=f'Delete finished exports older than this (default: {EXPORT_RETENTION_HOURS})',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run a single scan, wait for its exports and exit',
+        )
+
+    def handle(self, *args, **options):
+        workers = ExportWorkerPool(options['workers'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"📦 Export worker started with {options['workers']} workers")
+        )
+
+        try:
+            while True:
+                requeued = requeue_stale()
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'Requeued {requeued} abandoned exports'))
+
+                pending = ExportJob.objects.filter(status='PENDING').order_by('created_at')
+                submitted = sum(1 for job_id in pending.values_list('pk', flat=True) if workers.submit(job_id))
+                if submitted:
+                    self.stdout.write(f'Scheduled {submitted} pending exports')
+
+                purged = purge_expired(options['retention_hours'])
+                if purged:
+                    self.stdout.write(f'Purged {purged} expired exports')
+
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Stopping export worker...'))
+        finally:
+            workers.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS('Export worker stopped'))
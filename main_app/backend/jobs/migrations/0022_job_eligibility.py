@@ -0,0 +1,71 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from jobs.models import normalize_passout_years, normalize_departments
+
+
+def populate_job_eligibility(apps, schema_editor):
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    JobEligibleYear = apps.get_model('jobs', 'JobEligibleYear')
+    JobEligibleDepartment = apps.get_model('jobs', 'JobEligibleDepartment')
+
+    years, departments = [], []
+    for job_id, allowed_years, allowed_departments in JobPosting.objects.values_list(
+        'id', 'allowed_passout_years', 'allowed_departments'
+    ).iterator():
+        years.extend(
+            JobEligibleYear(job_id=job_id, passout_year=year)
+            for year in normalize_passout_years(allowed_years)
+        )
+        departments.extend(
+            JobEligibleDepartment(job_id=job_id, department=department)
+            for department in normalize_departments(allowed_departments)
+        )
+
+    JobEligibleYear.objects.bulk_create(years, batch_size=1000)
+    JobEligibleDepartment.objects.bulk_create(departments, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0021_candidatecard_candidatecomment_pipelinestage_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobEligibleYear',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('passout_year', models.PositiveIntegerField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligible_years', to='jobs.jobposting')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobEligibleDepartment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department', models.CharField(max_length=100)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligible_departments', to='jobs.jobposting')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobeligibleyear',
+            index=models.Index(fields=['passout_year', 'job'], name='jobs_jobeli_passout_400fed_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobeligibleyear',
+            unique_together={('job', 'passout_year')},
+        ),
+        migrations.AddIndex(
+            model_name='jobeligibledepartment',
+            index=models.Index(fields=['department', 'job'], name='jobs_jobeli_departm_80058f_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobeligibledepartment',
+            unique_together={('job', 'department')},
+        ),
+        migrations.RunPython(populate_job_eligibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from jobs.models import normalize_passout_years, normalize_departments
+from jobs.eligibility import is_eligible
+
+
+def populate_cohort_eligibility(apps, schema_editor):
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    EligibilityCohort = apps.get_model('jobs', 'EligibilityCohort')
+    CohortEligibleJob = apps.get_model('jobs', 'CohortEligibleJob')
+    StudentProfile = apps.get_model('accounts', 'StudentProfile')
+    YearManagement = apps.get_model('accounts', 'YearManagement')
+
+    keys = {
+        (passout_year or 0, branch or '', bool(active_arrears))
+        for passout_year, branch, active_arrears in StudentProfile.objects.values_list(
+            'passout_year', 'branch', 'active_arrears'
+        ).distinct()
+    }
+    EligibilityCohort.objects.bulk_create([
+        EligibilityCohort(passout_year=passout_year, branch=branch, has_arrears=has_arrears)
+        for passout_year, branch, has_arrears in keys
+    ])
+    cohorts = {
+        (cohort.passout_year, cohort.branch, cohort.has_arrears): cohort.id
+        for cohort in EligibilityCohort.objects.all()
+    }
+
+    active_years = set(YearManagement.objects.filter(is_active=True).values_list('year', flat=True))
+    rows = []
+    for job_id, allowed_years, allowed_departments, arrears_requirement in JobPosting.objects.values_list(
+        'id', 'allowed_passout_years', 'allowed_departments', 'arrears_requirement'
+    ).iterator():
+        allowed_years = normalize_passout_years(allowed_years)
+        allowed_departments = normalize_departments(allowed_departments)
+        rows.extend(
+            CohortEligibleJob(cohort_id=cohort_id, job_id=job_id)
+            for key, cohort_id in cohorts.items()
+            if is_eligible(allowed_years, allowed_departments, arrears_requirement, key, active_years)
+        )
+    CohortEligibleJob.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0023_studentprofile_numeric_gpa'),
+        ('jobs', '0022_job_eligibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EligibilityCohort',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('passout_year', models.PositiveIntegerField(default=0)),
+                ('branch', models.CharField(blank=True, default='', max_length=100)),
+                ('has_arrears', models.BooleanField(default=False)),
+            ],
+            options={
+                'unique_together': {('passout_year', 'branch', 'has_arrears')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CohortEligibleJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cohort', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligible_jobs', to='jobs.eligibilitycohort')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligible_cohorts', to='jobs.jobposting')),
+            ],
+            options={
+                'unique_together': {('cohort', 'job')},
+            },
+        ),
+        migrations.RunPython(populate_cohort_eligibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+# The DDL and backfill are spelled out here rather than taken from
+# jobs.search, so later changes to that module do not change what this
+# migration does.
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_jobposting_fts "
+    "USING fts5(title, company_name, description, tokenize='unicode61 remove_diacritics 2')"
+)
+SQLITE_POPULATE = (
+    "INSERT INTO jobs_jobposting_fts (rowid, title, company_name, description) "
+    "SELECT j.id, j.title, c.name, j.description "
+    "FROM jobs_jobposting j LEFT JOIN companies_company c ON c.id = j.company_id"
+)
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS jobs_jobposting_fts ("
+    "rowid bigint PRIMARY KEY, title text, company_name text, description text, document tsvector)",
+    "CREATE INDEX IF NOT EXISTS jobs_jobposting_fts_document ON jobs_jobposting_fts USING GIN (document)",
+]
+POSTGRES_POPULATE = (
+    "INSERT INTO jobs_jobposting_fts (rowid, title, company_name, description, document) "
+    "SELECT j.id, j.title, c.name, j.description, "
+    "setweight(to_tsvector('english', coalesce(j.title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(c.name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(j.description, '')), 'C') "
+    "FROM jobs_jobposting j LEFT JOIN companies_company c ON c.id = j.company_id"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE)
+        schema_editor.execute(SQLITE_POPULATE)
+    elif vendor == 'postgresql':
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+        schema_editor.execute(POSTGRES_POPULATE)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP TABLE IF EXISTS jobs_jobposting_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_merge_20250702_0501'),
+        ('jobs', '0023_cohort_eligibility'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
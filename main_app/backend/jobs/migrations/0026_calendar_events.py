@@ -0,0 +1,47 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from jobs.calendar_events import event_rows
+
+
+def populate_calendar_events(apps, schema_editor):
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    CalendarEvent = apps.get_model('jobs', 'CalendarEvent')
+
+    rows = []
+    for source in JobPosting.objects.values_list(
+        'id', 'application_deadline', 'interview_rounds', 'allowed_passout_years', 'allowed_departments'
+    ).iterator():
+        rows.extend(event_rows(CalendarEvent, *source))
+    CalendarEvent.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0025_export_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('APPLICATION_DEADLINE', 'Application Deadline'), ('INTERVIEW', 'Interview')], max_length=30)),
+                ('event_key', models.CharField(help_text='Event id shown to clients', max_length=255)),
+                ('date', models.DateField()),
+                ('time', models.CharField(max_length=20)),
+                ('round_name', models.CharField(blank=True, max_length=255)),
+                ('passout_year', models.PositiveIntegerField(default=0)),
+                ('branch', models.CharField(blank=True, default='', max_length=100)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_events', to='jobs.jobposting')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['date', 'passout_year', 'branch'], name='jobs_calend_date_d70bc4_idx'),
+        ),
+        migrations.RunPython(populate_calendar_events, migrations.RunPython.noop),
+    ]
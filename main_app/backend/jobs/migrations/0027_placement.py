@@ -0,0 +1,63 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from jobs.placements import compute_rows
+
+
+def populate_placements(apps, schema_editor):
+    Placement = apps.get_model('jobs', 'Placement')
+    models = (
+        apps.get_model('accounts', 'StudentProfile'),
+        apps.get_model('jobs', 'JobApplication'),
+        apps.get_model('jobs', 'JobPosting'),
+    )
+    Placement.objects.bulk_create(
+        [Placement(student_id=profile_id, **row) for profile_id, row in compute_rows(models=models).items()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_merge_20250702_0501'),
+        ('accounts', '0023_studentprofile_numeric_gpa'),
+        ('jobs', '0026_calendar_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Placement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('application', 'Hired application'), ('manual', 'Marked placed on profile')], max_length=20)),
+                ('job_reference', models.CharField(blank=True, help_text='placed_job_id of manual placements', max_length=100)),
+                ('passout_year', models.PositiveIntegerField(blank=True, null=True)),
+                ('branch', models.CharField(blank=True, default='', max_length=100)),
+                ('placed_at', models.DateTimeField(blank=True, null=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='placements', to='jobs.jobapplication')),
+                ('company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='placements', to='companies.company')),
+                ('job', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='jobs.jobposting')),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='placement', to='accounts.studentprofile')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='placement',
+            index=models.Index(fields=['passout_year', 'placed_at'], name='jobs_placem_passout_705718_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='placement',
+            index=models.Index(fields=['branch', 'placed_at'], name='jobs_placem_branch_e2995e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='placement',
+            index=models.Index(fields=['company', 'placed_at'], name='jobs_placem_company_0f686d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='placement',
+            index=models.Index(fields=['placed_at'], name='jobs_placem_placed__f3cf81_idx'),
+        ),
+        migrations.RunPython(populate_placements, migrations.RunPython.noop),
+    ]
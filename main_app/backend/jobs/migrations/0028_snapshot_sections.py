@@ -0,0 +1,90 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from jobs.snapshots import DOCUMENTS, digest, split
+
+
+def store_sections(apps, schema_editor):
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    SnapshotSection = apps.get_model('jobs', 'SnapshotSection')
+    section_ids = {}
+
+    def section_id(data):
+        if data is None:
+            return None
+        key = digest(data)
+        if key not in section_ids:
+            section_ids[key] = SnapshotSection.objects.create(digest=key, data=data).pk
+        return section_ids[key]
+
+    batch = []
+    for application in JobApplication.objects.exclude(applied_data_snapshot=None).only(
+        'id', 'applied_data_snapshot'
+    ).iterator():
+        profile, documents, rest = split(application.applied_data_snapshot)
+        if profile is None and documents is None:
+            continue
+        application.profile_snapshot_id = section_id(profile)
+        application.documents_snapshot_id = section_id(documents)
+        application.applied_data_snapshot = rest
+        batch.append(application)
+        if len(batch) >= 500:
+            JobApplication.objects.bulk_update(
+                batch, ['profile_snapshot', 'documents_snapshot', 'applied_data_snapshot']
+            )
+            batch = []
+    JobApplication.objects.bulk_update(batch, ['profile_snapshot', 'documents_snapshot', 'applied_data_snapshot'])
+
+
+def inline_sections(apps, schema_editor):
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    batch = []
+    for application in JobApplication.objects.exclude(
+        profile_snapshot=None, documents_snapshot=None
+    ).select_related('profile_snapshot', 'documents_snapshot').iterator():
+        rest = dict(application.applied_data_snapshot or {})
+        snapshot = dict(application.profile_snapshot.data) if application.profile_snapshot else {}
+        if application.documents_snapshot or DOCUMENTS in rest:
+            snapshot[DOCUMENTS] = {
+                **(application.documents_snapshot.data if application.documents_snapshot else {}),
+                **(rest.pop(DOCUMENTS, None) or {}),
+            }
+        snapshot.update(rest)
+        application.applied_data_snapshot = snapshot
+        batch.append(application)
+        if len(batch) >= 500:
+            JobApplication.objects.bulk_update(batch, ['applied_data_snapshot'])
+            batch = []
+    JobApplication.objects.bulk_update(batch, ['applied_data_snapshot'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0027_placement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnapshotSection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(help_text='SHA-256 of the canonical JSON of data', max_length=64, unique=True)),
+                ('data', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='documents_snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='documents_applications', to='jobs.snapshotsection'),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='profile_snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='profile_applications', to='jobs.snapshotsection'),
+        ),
+        migrations.RunPython(store_sections, inline_sections),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from jobs.status_events import history_events
+
+
+def backfill_events(apps, schema_editor):
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    ApplicationStatusEvent = apps.get_model('jobs', 'ApplicationStatusEvent')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    user_ids = set(User.objects.values_list('id', flat=True))
+
+    batch = []
+    for row in JobApplication.objects.values_list(
+        'id', 'job_id', 'status', 'applied_at', 'status_history'
+    ).iterator():
+        batch.extend(history_events(ApplicationStatusEvent, *row, user_ids=user_ids))
+        if len(batch) >= 1000:
+            ApplicationStatusEvent.objects.bulk_create(batch)
+            batch = []
+    ApplicationStatusEvent.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0028_snapshot_sections'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, max_length=20)),
+                ('to_status', models.CharField(choices=[('APPLIED', 'Applied'), ('UNDER_REVIEW', 'Under Review'), ('SHORTLISTED', 'Shortlisted'), ('REJECTED', 'Rejected'), ('HIRED', 'Hired')], max_length=20)),
+                ('changed_at', models.DateTimeField()),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='jobs.jobapplication')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='jobs.jobposting')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='applicationstatusevent',
+            index=models.Index(fields=['to_status', 'changed_at'], name='jobs_applic_to_stat_b9fd94_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationstatusevent',
+            index=models.Index(fields=['application', 'changed_at'], name='jobs_applic_applica_fd738a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationstatusevent',
+            index=models.Index(fields=['job', 'to_status'], name='jobs_applic_job_id_6eb453_idx'),
+        ),
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
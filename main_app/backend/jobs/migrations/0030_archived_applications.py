@@ -0,0 +1,57 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:04
+
+from django.conf import settings
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0029_application_status_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.BigIntegerField(help_text='Id the application had in the hot table', primary_key=True, serialize=False)),
+                ('cover_letter', models.TextField(blank=True, null=True)),
+                ('resume', models.FileField(blank=True, null=True, upload_to='application_resumes/')),
+                ('applied_data_snapshot', models.JSONField(blank=True, default=dict, null=True)),
+                ('status', models.CharField(choices=[('APPLIED', 'Applied'), ('UNDER_REVIEW', 'Under Review'), ('SHORTLISTED', 'Shortlisted'), ('REJECTED', 'Rejected'), ('HIRED', 'Hired')], max_length=20)),
+                ('applied_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('admin_notes', models.TextField(blank=True, null=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('status_history', models.JSONField(blank=True, default=list)),
+                ('passout_year', models.PositiveIntegerField(blank=True, help_text="Applicant's passout year when archived", null=True)),
+                ('reason', models.CharField(choices=[('INACTIVE_YEAR', 'Passout year inactive'), ('DELETED', 'Soft deleted')], max_length=20)),
+                ('pipeline', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Serialized candidate card with its stage movements and comments')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('applicant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_job_applications', to=settings.AUTH_USER_MODEL)),
+                ('documents_snapshot', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_documents_applications', to='jobs.snapshotsection')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='jobs.jobposting')),
+                ('last_modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('profile_snapshot', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_profile_applications', to='jobs.snapshotsection')),
+            ],
+            options={
+                'ordering': ['-applied_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedapplication',
+            index=models.Index(fields=['passout_year', 'status'], name='jobs_archiv_passout_6ecb29_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedapplication',
+            index=models.Index(fields=['job', 'status'], name='jobs_archiv_job_id_543369_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedapplication',
+            index=models.Index(fields=['applicant', 'applied_at'], name='jobs_archiv_applica_01e89c_idx'),
+        ),
+    ]
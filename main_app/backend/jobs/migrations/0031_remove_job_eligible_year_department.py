@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:16
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0030_archived_applications'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='jobeligibleyear',
+            unique_together=None,
+        ),
+        migrations.RemoveField(
+            model_name='jobeligibleyear',
+            name='job',
+        ),
+        migrations.DeleteModel(
+            name='JobEligibleDepartment',
+        ),
+        migrations.DeleteModel(
+            name='JobEligibleYear',
+        ),
+    ]
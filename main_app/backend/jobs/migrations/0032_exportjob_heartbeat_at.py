@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0031_remove_job_eligible_year_department'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Last progress report of the worker running the job', null=True),
+        ),
+    ]
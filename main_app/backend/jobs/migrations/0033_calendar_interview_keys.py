@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# The key format is spelled out here rather than taken from
+# jobs.calendar_events, so later changes to that module do not change what
+# this migration does.
+
+
+def interview_key(job_id, round_date, round_time, round_name):
+    return f'interview_{job_id}_{round_date.isoformat()}_{round_time}_{round_name or "round"}'[:255]
+
+
+def rekey_interviews(apps, schema_editor):
+    CalendarEvent = apps.get_model('jobs', 'CalendarEvent')
+
+    batch = []
+    for event in CalendarEvent.objects.filter(event_type='INTERVIEW').only(
+        'job_id', 'date', 'time', 'round_name', 'event_key'
+    ).iterator():
+        event.event_key = interview_key(event.job_id, event.date, event.time, event.round_name)
+        batch.append(event)
+        if len(batch) >= 1000:
+            CalendarEvent.objects.bulk_update(batch, ['event_key'])
+            batch = []
+    CalendarEvent.objects.bulk_update(batch, ['event_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0032_exportjob_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(rekey_interviews, migrations.RunPython.noop),
+    ]
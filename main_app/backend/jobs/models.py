@@ -1,8 +1,61 @@
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 import uuid
 
+
+def normalize_passout_years(values):
+    """Integer passout years from an allowed_passout_years list"""
+    years = set()
+    for value in values or []:
+        try:
+            years.add(int(value))
+        except (TypeError, ValueError):
+            continue
+    return years
+
+
+def normalize_departments(values):
+    """Non-empty department names from an allowed_departments list"""
+    return {str(value).strip() for value in values or [] if value is not None and str(value).strip()}
+
+
+APPLICATION_STATUS_CHOICES = [
+    ('APPLIED', 'Applied'),
+    ('UNDER_REVIEW', 'Under Review'),
+    ('SHORTLISTED', 'Shortlisted'),
+    ('REJECTED', 'Rejected'),
+    ('HIRED', 'Hired'),
+]
+APPLICATION_STATUSES = [value for value, _ in APPLICATION_STATUS_CHOICES]
+
+
+def status_field_name(status):
+    """Name of the with_application_stats() annotation counting one status"""
+    return f'applicants_{status.lower()}'
+
+
+class JobPostingQuerySet(models.QuerySet):
+    """Listing annotations for job postings"""
+
+    def with_application_stats(self):
+        """
+        Annotate each job with its application counts in the same SELECT:
+        total_applicants, one applicants_<status> count per application
+        status (e.g. applicants_hired) and last_applied_at.
+        """
+        counts = {
+            status_field_name(status): models.Count('applications', filter=models.Q(applications__status=status))
+            for status in APPLICATION_STATUSES
+        }
+        return self.annotate(
+            total_applicants=models.Count('applications'),
+            last_applied_at=models.Max('applications__applied_at'),
+            **counts
+        )
+
+
 class JobPosting(models.Model):
     class JobType(models.TextChoices):
         FULL_TIME = 'FULL_TIME', 'Full Time'
@@ -34,24 +87,105 @@ class JobPosting(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     on_campus = models.BooleanField(default=True)  # True = On-campus, False = Off-campus
 
+    objects = JobPostingQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.title} at {self.company.name}"
 
+
+class EligibilityCohort(models.Model):
+    """
+    Students sharing the inputs that decide job eligibility: passout year,
+    branch and whether they have active arrears. Students without a
+    passout year or branch belong to the cohort with 0 / ''.
+    """
+    passout_year = models.PositiveIntegerField(default=0)
+    branch = models.CharField(max_length=100, blank=True, default='')
+    has_arrears = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ['passout_year', 'branch', 'has_arrears']
+
+    def __str__(self):
+        arrears = 'with arrears' if self.has_arrears else 'no arrears'
+        return f"{self.passout_year or '?'} / {self.branch or '?'} / {arrears}"
+
+
+class CohortEligibleJob(models.Model):
+    """
+    Materialized cohort -> eligible job mapping, maintained by jobs.eligibility
+    """
+    cohort = models.ForeignKey(EligibilityCohort, on_delete=models.CASCADE, related_name='eligible_jobs')
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='eligible_cohorts')
+
+    class Meta:
+        unique_together = ['cohort', 'job']
+
+    def __str__(self):
+        return f"{self.cohort_id} -> {self.job_id}"
+
+
+class CalendarEvent(models.Model):
+    """
+    Application deadline or interview round of a job, derived by
+    jobs.calendar_events. There is one row per event and cohort the job is
+    open to; passout_year 0 / branch '' stand for jobs without a year /
+    department restriction.
+    """
+    APPLICATION_DEADLINE = 'APPLICATION_DEADLINE'
+    INTERVIEW = 'INTERVIEW'
+    EVENT_TYPE_CHOICES = [
+        (APPLICATION_DEADLINE, 'Application Deadline'),
+        (INTERVIEW, 'Interview'),
+    ]
+
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='calendar_events')
+    event_type = models.CharField(max_length=30, choices=EVENT_TYPE_CHOICES)
+    event_key = models.CharField(max_length=255, help_text="Event id shown to clients")
+    date = models.DateField()
+    time = models.CharField(max_length=20)
+    round_name = models.CharField(max_length=255, blank=True)
+    passout_year = models.PositiveIntegerField(default=0)
+    branch = models.CharField(max_length=100, blank=True, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'passout_year', 'branch']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_key} on {self.date}"
+
+
+class SnapshotSection(models.Model):
+    """
+    Part of an application snapshot shared by applications with the same
+    content, stored once per digest (see jobs.snapshots). Never updated
+    in place.
+    """
+    digest = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the canonical JSON of data")
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.digest[:12]
+
+
 class JobApplication(models.Model):
     job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='applications')
     applicant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='job_applications')
     cover_letter = models.TextField(blank=True, null=True)
     resume = models.FileField(upload_to='application_resumes/', blank=True, null=True)
     applied_data_snapshot = models.JSONField(default=dict, null=True, blank=True)
+    # Profile and documents parts of the snapshot, shared across applications
+    profile_snapshot = models.ForeignKey(
+        SnapshotSection, on_delete=models.PROTECT, null=True, blank=True, related_name='profile_applications'
+    )
+    documents_snapshot = models.ForeignKey(
+        SnapshotSection, on_delete=models.PROTECT, null=True, blank=True, related_name='documents_applications'
+    )
 
-    status = models.CharField(max_length=20, choices=[
-        ('APPLIED', 'Applied'),
-        ('UNDER_REVIEW', 'Under Review'),
-        ('SHORTLISTED', 'Shortlisted'),
-        ('REJECTED', 'Rejected'),
-        ('HIRED', 'Hired'),
-    ], default='APPLIED')
+    status = models.CharField(max_length=20, choices=APPLICATION_STATUS_CHOICES, default='APPLIED')
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -78,13 +212,31 @@ class JobApplication(models.Model):
             models.Index(fields=['job', 'status']),
             models.Index(fields=['applicant', 'applied_at']),
         ]
-    
+
+    @property
+    def snapshot(self):
+        """
+        The full applied data snapshot: the shared profile and documents
+        sections merged with applied_data_snapshot. Select profile_snapshot
+        and documents_snapshot when reading it for many applications.
+        """
+        rest = dict(self.applied_data_snapshot or {})
+        snapshot = dict(self.profile_snapshot.data) if self.profile_snapshot_id else {}
+        if self.documents_snapshot_id or 'documents' in rest:
+            snapshot['documents'] = {
+                **(self.documents_snapshot.data if self.documents_snapshot_id else {}),
+                **(rest.pop('documents', None) or {}),
+            }
+        snapshot.update(rest)
+        return snapshot
+
     def add_status_change(self, new_status, changed_by=None, notes=None):
         """Add a status change to the history"""
+        now = timezone.now()
         change_record = {
             'from_status': self.status,
             'to_status': new_status,
-            'changed_at': timezone.now().isoformat(),
+            'changed_at': now.isoformat(),
             'changed_by': changed_by.id if changed_by else None,
             'notes': notes
         }
@@ -95,6 +247,139 @@ class JobApplication(models.Model):
         self.status_history.append(change_record)
         self.status = new_status
         self.last_modified_by = changed_by
+        # Picked up when the change is recorded as an ApplicationStatusEvent
+        self._status_change = (new_status, changed_by.id if changed_by else None, now)
+
+
+class ApplicationStatusEvent(models.Model):
+    """
+    One status an application entered, written by jobs.status_events
+    alongside every status change (from_status is '' for the status it
+    was created with), for funnel and time-to-hire analytics in SQL.
+    """
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='status_events')
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='status_events')
+    from_status = models.CharField(max_length=20, blank=True)
+    to_status = models.CharField(max_length=20, choices=APPLICATION_STATUS_CHOICES)
+    changed_at = models.DateTimeField()
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['to_status', 'changed_at']),
+            models.Index(fields=['application', 'changed_at']),
+            models.Index(fields=['job', 'to_status']),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status or '-'} -> {self.to_status}"
+
+
+class Placement(models.Model):
+    """
+    Read model of placed students, maintained by jobs.placements: one row
+    per student with a HIRED application (source 'application') or marked
+    placed on their profile (source 'manual').
+    """
+    SOURCE_APPLICATION = 'application'
+    SOURCE_MANUAL = 'manual'
+    SOURCE_CHOICES = [
+        (SOURCE_APPLICATION, 'Hired application'),
+        (SOURCE_MANUAL, 'Marked placed on profile'),
+    ]
+
+    student = models.OneToOneField('accounts.StudentProfile', on_delete=models.CASCADE, related_name='placement')
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    application = models.ForeignKey(
+        JobApplication, on_delete=models.CASCADE, null=True, blank=True, related_name='placements'
+    )
+    # Manual placements may name a job that does not exist (any more)
+    job = models.ForeignKey(
+        JobPosting, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, blank=True, related_name='+'
+    )
+    job_reference = models.CharField(max_length=100, blank=True, help_text="placed_job_id of manual placements")
+    company = models.ForeignKey(
+        'companies.Company', on_delete=models.SET_NULL, null=True, blank=True, related_name='placements'
+    )
+    passout_year = models.PositiveIntegerField(null=True, blank=True)
+    branch = models.CharField(max_length=100, blank=True, default='')
+    placed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['passout_year', 'placed_at']),
+            models.Index(fields=['branch', 'placed_at']),
+            models.Index(fields=['company', 'placed_at']),
+            models.Index(fields=['placed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} placed ({self.source})"
+
+
+class ArchivedApplication(models.Model):
+    """
+    A JobApplication moved out of the hot table by jobs.archive: those of
+    students in inactive passout years and soft-deleted ones. It keeps the
+    application's id and fields, so reports and exports read it the same
+    way, plus its candidate card, stage movements and comments (pipeline).
+    """
+    REASON_INACTIVE_YEAR = 'INACTIVE_YEAR'
+    REASON_DELETED = 'DELETED'
+    REASON_CHOICES = [
+        (REASON_INACTIVE_YEAR, 'Passout year inactive'),
+        (REASON_DELETED, 'Soft deleted'),
+    ]
+
+    id = models.BigIntegerField(primary_key=True, help_text="Id the application had in the hot table")
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='archived_applications')
+    applicant = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_job_applications'
+    )
+    cover_letter = models.TextField(blank=True, null=True)
+    resume = models.FileField(upload_to='application_resumes/', blank=True, null=True)
+    applied_data_snapshot = models.JSONField(default=dict, null=True, blank=True)
+    profile_snapshot = models.ForeignKey(
+        SnapshotSection, on_delete=models.PROTECT, null=True, blank=True, related_name='archived_profile_applications'
+    )
+    documents_snapshot = models.ForeignKey(
+        SnapshotSection, on_delete=models.PROTECT, null=True, blank=True, related_name='archived_documents_applications'
+    )
+    status = models.CharField(max_length=20, choices=APPLICATION_STATUS_CHOICES)
+    applied_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    admin_notes = models.TextField(blank=True, null=True)
+    last_modified_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    status_history = models.JSONField(default=list, blank=True)
+
+    passout_year = models.PositiveIntegerField(null=True, blank=True, help_text="Applicant's passout year when archived")
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    pipeline = models.JSONField(
+        default=dict, blank=True, encoder=DjangoJSONEncoder,
+        help_text="Serialized candidate card with its stage movements and comments"
+    )
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['passout_year', 'status']),
+            models.Index(fields=['job', 'status']),
+            models.Index(fields=['applicant', 'applied_at']),
+        ]
+
+    snapshot = JobApplication.snapshot
+
+    def __str__(self):
+        return f"Archived application #{self.pk} ({self.get_reason_display()})"
+
 
 class CompanyForm(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -127,3 +412,65 @@ class CompanyForm(models.Model):
             import string
             self.key = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
         super().save(*args, **kwargs)
+
+
+class ExportJob(models.Model):
+    """
+    An application export generated in the background by jobs.exports.
+    Completed jobs keep their file so an identical request over unchanged
+    data (same fingerprint) can be served without regenerating it.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='export_jobs'
+    )
+    format = models.CharField(max_length=10)
+    config = models.JSONField(default=dict, help_text="Export columns and filters")
+    data_version = models.CharField(max_length=64)
+    fingerprint = models.CharField(max_length=64, help_text="Hash of config, format and data version")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    file = models.FileField(upload_to='exports/', blank=True, null=True)
+    filename = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    file_size = models.PositiveIntegerField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last progress report of the worker running the job"
+    )
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['fingerprint', 'status']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.format} export {self.id} ({self.status})"
+
+    @property
+    def progress(self):
+        if self.status == 'COMPLETED':
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(99, int(self.processed_rows * 100 / self.total_rows))
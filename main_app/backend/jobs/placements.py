@@ -0,0 +1,277 @@
+"""
+Placed students read model.
+
+A student is placed if they have a HIRED application, or their profile
+is marked placed (placement_status='placed', optionally naming the job in
+placed_job_id). Placement holds one row per placed student with the
+passout year, branch and company copied in, so the placed students list,
+its filters, the passout year facets and the export are indexed queries
+instead of merging both sources in Python on every request.
+
+A hired application takes precedence over a manual placement; of several
+hired applications the earliest one is used. Hires of passout years
+archived by jobs.archive count too, with no application linked.
+
+Rows are kept up to date by jobs.signals:
+  JobApplication saved/deleted       sync_users() for the applicant when
+  applications_status_changed        a HIRED status is involved
+  StudentProfile saved               sync_profiles() for the student
+  JobPosting saved/deleted           company_changed() / job_deleted()
+rebuild_placements recomputes everything after bulk writes.
+"""
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Coalesce, Concat, Lower
+
+from accounts.models import StudentProfile
+from .models import ArchivedApplication, JobApplication, JobPosting, Placement
+
+HIRED = 'HIRED'
+PLACED = 'placed'
+
+ROW_FIELDS = ('source', 'application_id', 'job_id', 'job_reference', 'company_id', 'passout_year', 'branch', 'placed_at')
+
+# Job title and company name as shown for the placement (see as_dict())
+DISPLAY_JOB_TITLE = Case(
+    When(job__title__isnull=False, then='job__title'),
+    When(job_reference='', then=Value('Not Specified')),
+    default=Value('Job Not Found'),
+)
+DISPLAY_COMPANY_NAME = Case(
+    When(company__isnull=False, then='company__name'),
+    When(job_reference='', then=Value('Not Specified')),
+    default=Value('Unknown Company'),
+)
+
+SORT_FIELDS = {
+    'name': Lower('full_name'),
+    'student_id': Lower('student__student_id'),
+    'passout_year': Coalesce('passout_year', 0),
+    'company_name': Lower('display_company_name'),
+    'placed_at': 'placed_at',
+    'job_title': Lower('display_job_title'),
+}
+
+
+def _job_id(placed_job_id):
+    try:
+        return int(placed_job_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_rows(profile_ids=None, models=None):
+    """
+    {student profile id: {field: value}} of the Placement rows the given
+    profiles (default: all) should have. models is a (StudentProfile,
+    JobApplication, JobPosting) tuple, for migrations to pass theirs
+    (archived hires are then left out).
+    """
+    profile_model, application_model, job_model = models or (StudentProfile, JobApplication, JobPosting)
+    profiles = profile_model.objects.all()
+    if profile_ids is not None:
+        profiles = profiles.filter(pk__in=profile_ids)
+
+    students = {}
+    for profile_id, user_id, passout_year, branch, placement_status, placed_job_id, updated_at in profiles.values_list(
+        'id', 'user_id', 'passout_year', 'branch', 'placement_status', 'placed_job_id', 'updated_at'
+    ).iterator():
+        students[user_id] = (profile_id, passout_year, branch or '', placement_status, placed_job_id, updated_at)
+
+    hired = {}
+    # Hires archived with their passout year still place their students,
+    # without an application to link
+    sources = [(application_model.objects, True)] if models else [
+        (application_model.objects, True),
+        (ArchivedApplication.objects.filter(reason=ArchivedApplication.REASON_INACTIVE_YEAR), False),
+    ]
+    for applications, linked in sources:
+        applications = applications.filter(status=HIRED)
+        if profile_ids is not None:
+            applications = applications.filter(applicant_id__in=students)
+        for application_id, user_id, job_id, company_id, applied_at in applications.order_by(
+            '-applied_at', '-id'
+        ).values_list('id', 'applicant_id', 'job_id', 'job__company_id', 'applied_at').iterator():
+            # The earliest hire is the one kept
+            if user_id not in hired or (applied_at, application_id) <= hired[user_id][3:]:
+                hired[user_id] = (application_id if linked else None, job_id, company_id, applied_at, application_id)
+
+    manual_job_ids = {
+        _job_id(placed_job_id)
+        for _, _, _, placement_status, placed_job_id, _ in students.values()
+        if placement_status == PLACED
+    } - {None}
+    job_companies = dict(
+        job_model.objects.filter(pk__in=manual_job_ids).values_list('id', 'company_id')
+    ) if manual_job_ids else {}
+
+    rows = {}
+    for user_id, (profile_id, passout_year, branch, placement_status, placed_job_id, updated_at) in students.items():
+        cohort = {'passout_year': passout_year, 'branch': branch[:100]}
+        if user_id in hired:
+            application_id, job_id, company_id, applied_at, _ = hired[user_id]
+            rows[profile_id] = dict(
+                source=Placement.SOURCE_APPLICATION, application_id=application_id, job_id=job_id,
+                job_reference='', company_id=company_id, placed_at=applied_at, **cohort
+            )
+        elif placement_status == PLACED:
+            job_id = _job_id(placed_job_id)
+            rows[profile_id] = dict(
+                source=Placement.SOURCE_MANUAL, application_id=None, job_id=job_id,
+                job_reference=placed_job_id or '', company_id=job_companies.get(job_id),
+                placed_at=updated_at, **cohort
+            )
+    return rows
+
+
+def stored_rows(profile_ids=None):
+    placements = Placement.objects.all()
+    if profile_ids is not None:
+        placements = placements.filter(student_id__in=profile_ids)
+    return {
+        row[0]: dict(zip(ROW_FIELDS, row[1:]))
+        for row in placements.values_list('student_id', *ROW_FIELDS).iterator()
+    }
+
+
+def _apply(wanted, stored):
+    """Write the difference between the wanted and the stored rows. Returns the number of rows changed."""
+    stale = set(stored) - set(wanted)
+    if stale:
+        Placement.objects.filter(student_id__in=stale).delete()
+
+    changed = [profile_id for profile_id in set(wanted) & set(stored) if wanted[profile_id] != stored[profile_id]]
+    if changed:
+        existing = Placement.objects.filter(student_id__in=changed).only('id', 'student_id')
+        for placement in existing:
+            for field, value in wanted[placement.student_id].items():
+                setattr(placement, field, value)
+        Placement.objects.bulk_update(existing, ROW_FIELDS, batch_size=500)
+
+    missing = set(wanted) - set(stored)
+    Placement.objects.bulk_create(
+        [Placement(student_id=profile_id, **wanted[profile_id]) for profile_id in missing],
+        batch_size=1000
+    )
+    return len(stale) + len(changed) + len(missing)
+
+
+@transaction.atomic
+def sync_profiles(profile_ids):
+    """Recompute the placements of some students. Returns the number of rows changed."""
+    profile_ids = list(profile_ids)
+    if not profile_ids:
+        return 0
+    return _apply(compute_rows(profile_ids), stored_rows(profile_ids))
+
+
+def sync_users(user_ids):
+    """sync_profiles() for the student profiles of some users"""
+    return sync_profiles(
+        StudentProfile.objects.filter(user_id__in=list(user_ids)).values_list('id', flat=True)
+    )
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute every placement. Returns the number of rows changed."""
+    return _apply(compute_rows(), stored_rows())
+
+
+def company_changed(job):
+    """Follow a job moving to another company"""
+    return Placement.objects.filter(job_id=job.pk).exclude(company_id=job.company_id).update(
+        company_id=job.company_id
+    )
+
+
+def job_deleted(job_id):
+    """Manual placements naming a deleted job keep the reference but lose the company"""
+    return Placement.objects.filter(job_id=job_id).update(company_id=None)
+
+
+def placed_students(search='', passout_year=None, branch=None, company_id=None, sort_by='placed_at', sort_order='desc'):
+    """Placement queryset for the placed students list and export"""
+    placements = Placement.objects.select_related('student__user', 'job', 'company').annotate(
+        full_name=Concat('student__first_name', Value(' '), 'student__last_name'),
+        display_job_title=DISPLAY_JOB_TITLE,
+        display_company_name=DISPLAY_COMPANY_NAME,
+    )
+
+    if search:
+        placements = placements.filter(
+            Q(full_name__icontains=search) |
+            Q(student__student_id__icontains=search) |
+            Q(display_job_title__icontains=search) |
+            Q(display_company_name__icontains=search)
+        )
+    if passout_year is not None:
+        placements = placements.filter(passout_year=passout_year)
+    if branch:
+        placements = placements.filter(branch=branch)
+    if company_id is not None:
+        placements = placements.filter(company_id=company_id)
+
+    order = SORT_FIELDS.get(sort_by)
+    if order is None:
+        return placements.order_by('-placed_at', '-id')
+    if isinstance(order, str):
+        order = F(order)
+    if sort_order == 'desc':
+        return placements.order_by(order.desc(), '-id')
+    return placements.order_by(order.asc(), 'id')
+
+
+def passout_years():
+    """Distinct passout years of placed students, newest first"""
+    return list(
+        Placement.objects.exclude(passout_year=None).order_by('-passout_year')
+        .values_list('passout_year', flat=True).distinct()
+    )
+
+
+def as_dict(placement):
+    """Placed students API representation of a Placement"""
+    profile = placement.student
+    job = placement.job
+
+    if job is not None:
+        job_info = {
+            'job_title': job.title,
+            'company_name': placement.company.name if placement.company else 'Unknown Company',
+            'job_location': job.location,
+            'salary_min': job.salary_min,
+            'salary_max': job.salary_max,
+            'job_id': job.id,
+        }
+    elif placement.job_reference:
+        job_info = {
+            'job_title': 'Job Not Found',
+            'company_name': 'Unknown Company',
+            'job_location': '',
+            'salary_min': None,
+            'salary_max': None,
+            'job_id': placement.job_reference,
+        }
+    else:
+        job_info = {
+            'job_title': 'Not Specified',
+            'company_name': 'Not Specified',
+            'job_location': '',
+            'salary_min': None,
+            'salary_max': None,
+            'job_id': None,
+        }
+
+    return {
+        'student_id': profile.student_id,
+        'name': f"{profile.first_name} {profile.last_name}".strip(),
+        'email': profile.contact_email or profile.user.email,
+        'branch': profile.branch or '',
+        'passout_year': profile.passout_year,
+        'gpa': profile.gpa,
+        **job_info,
+        'placed_at': placement.placed_at,
+        'source': placement.source,
+    }
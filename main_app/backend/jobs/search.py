@@ -0,0 +1,202 @@
+"""
+Ranked full-text search over job postings.
+
+Jobs are indexed in jobs_jobposting_fts by title, company name and
+description: an FTS5 virtual table on SQLite, a table with a weighted
+tsvector column and a GIN index on PostgreSQL, created by migration
+0024. The index is kept up to date by jobs.signals on JobPosting
+save/delete and Company save; rebuild_job_search_index repopulates it
+from scratch. On other database backends, or if the index table does not
+exist, search falls back to icontains matching.
+
+search_jobs() restricts a JobPosting queryset to the matches, ordered by
+relevance, and annotates each job with search_rank (lower is better) and
+search_snippet, an excerpt with the matched terms wrapped in the
+SNIPPET_START/SNIPPET_END control characters. highlight() escapes the
+excerpt and turns the markers into <mark> tags.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+
+from companies.models import Company
+from .models import JobPosting
+
+INDEX_TABLE = 'jobs_jobposting_fts'
+
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_WORDS = 16
+
+# Relative weight of matches in title, company name and description
+SQLITE_WEIGHTS = (10.0, 5.0, 1.0)
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+_available = None
+
+
+def _vendor():
+    return connection.vendor
+
+
+def search_terms(query):
+    """Words of a user query; punctuation and operators are dropped"""
+    return _TERM_RE.findall(query or '')
+
+
+def is_available():
+    """True if the index table exists on a supported backend (checked once per process)"""
+    global _available
+    if _available is None:
+        _available = (
+            _vendor() in ('sqlite', 'postgresql')
+            and INDEX_TABLE in connection.introspection.table_names()
+        )
+    return _available
+
+
+def _postgres_document(prefix=''):
+    return (
+        f"setweight(to_tsvector('english', coalesce({prefix}title, '')), 'A') || "
+        f"setweight(to_tsvector('english', coalesce({prefix}company_name, '')), 'B') || "
+        f"setweight(to_tsvector('english', coalesce({prefix}description, '')), 'C')"
+    )
+
+
+def index_jobs(job_ids):
+    """(Re)index the given jobs, removing those that no longer exist"""
+    job_ids = list(job_ids)
+    if not job_ids or not is_available():
+        return
+
+    rows = list(
+        JobPosting.objects.filter(pk__in=job_ids).values_list('id', 'title', 'company__name', 'description')
+    )
+    placeholders = ', '.join(['%s'] * len(job_ids))
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {INDEX_TABLE} WHERE rowid IN ({placeholders})", job_ids)
+        if not rows:
+            return
+        if _vendor() == 'sqlite':
+            cursor.executemany(
+                f"INSERT INTO {INDEX_TABLE} (rowid, title, company_name, description) VALUES (%s, %s, %s, %s)",
+                rows
+            )
+        else:
+            cursor.executemany(
+                f"INSERT INTO {INDEX_TABLE} (rowid, title, company_name, description, document) "
+                f"SELECT v.rowid, v.title, v.company_name, v.description, {_postgres_document('v.')} "
+                f"FROM (SELECT %s::bigint AS rowid, %s::text AS title, %s::text AS company_name, "
+                f"%s::text AS description) AS v",
+                rows
+            )
+
+
+def index_job(job):
+    index_jobs([job.pk])
+
+
+def remove_job(job_id):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {INDEX_TABLE} WHERE rowid = %s", [job_id])
+
+
+def populate_index(cursor, vendor):
+    """Fill the (empty) index table from every job with one INSERT ... SELECT"""
+    jobs = JobPosting._meta.db_table
+    companies = Company._meta.db_table
+    source = (
+        f"SELECT j.id AS rowid, j.title, c.name AS company_name, j.description "
+        f"FROM {jobs} j LEFT JOIN {companies} c ON c.id = j.company_id"
+    )
+    if vendor == 'sqlite':
+        cursor.execute(f"INSERT INTO {INDEX_TABLE} (rowid, title, company_name, description) {source}")
+    elif vendor == 'postgresql':
+        cursor.execute(
+            f"INSERT INTO {INDEX_TABLE} (rowid, title, company_name, description, document) "
+            f"SELECT v.rowid, v.title, v.company_name, v.description, {_postgres_document('v.')} "
+            f"FROM ({source}) AS v"
+        )
+
+
+def rebuild_index():
+    """Repopulate the index from every job. Returns the number of jobs indexed."""
+    if not is_available():
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {INDEX_TABLE}")
+        populate_index(cursor, _vendor())
+        cursor.execute(f"SELECT COUNT(*) FROM {INDEX_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def search_jobs(queryset, query):
+    """
+    Restrict queryset to jobs matching query, most relevant first, with
+    search_rank and search_snippet annotations
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+
+    if not is_available():
+        condition = Q()
+        for term in terms:
+            condition &= (
+                Q(title__icontains=term) | Q(description__icontains=term) | Q(company__name__icontains=term)
+            )
+        return queryset.filter(condition)
+
+    job_table = JobPosting._meta.db_table
+    join = f"{INDEX_TABLE}.rowid = {job_table}.id"
+
+    if _vendor() == 'sqlite':
+        # Every term must match, each as a prefix, so partially typed words match
+        match = ' '.join('"{}"*'.format(term.replace('"', '')) for term in terms)
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        select = {
+            'search_rank': f"bm25({INDEX_TABLE}, {weights})",
+            'search_snippet': (
+                f"snippet({INDEX_TABLE}, -1, char(2), char(3), '…', {SNIPPET_WORDS})"
+            ),
+        }
+        queryset = queryset.extra(
+            select=select,
+            tables=[INDEX_TABLE],
+            where=[f"{INDEX_TABLE} MATCH %s", join],
+            params=[match],
+        )
+    else:
+        tsquery = ' & '.join(f"{term}:*" for term in terms)
+        query_sql = "to_tsquery('english', %s)"
+        select = {
+            'search_rank': f"-ts_rank_cd({INDEX_TABLE}.document, {query_sql})",
+            'search_snippet': (
+                f"ts_headline('english', {INDEX_TABLE}.description, {query_sql}, "
+                f"'StartSel=' || chr(2) || ', StopSel=' || chr(3) || ', MaxFragments=1, "
+                f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}')"
+            ),
+        }
+        queryset = queryset.extra(
+            select=select,
+            select_params=[tsquery, tsquery],
+            tables=[INDEX_TABLE],
+            where=[f"{INDEX_TABLE}.document @@ {query_sql}", join],
+            params=[tsquery],
+        )
+
+    return queryset.order_by('search_rank', '-created_at')
+
+
+def highlight(snippet):
+    """HTML-escape a search snippet and mark the matched terms with <mark>"""
+    if not snippet:
+        return snippet
+    return escape(snippet).replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>')
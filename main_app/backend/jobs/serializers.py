@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from .models import JobPosting, JobApplication
+from .models import JobPosting, JobApplication, APPLICATION_STATUSES, status_field_name
 from accounts.serializers import UserSerializer
 # EmployerProfile removed
-from .models import CompanyForm
+from .models import CompanyForm, ExportJob
+from . import snapshots
+from django.urls import reverse
 from django.utils import timezone
 
 
@@ -160,9 +162,43 @@ class JobApplicationSerializer(serializers.ModelSerializer):
     
 
 # jobs/serializers.py
-class JobWithApplicationStatsSerializer(serializers.ModelSerializer):
+class ApplicationStatsMixin:
+    """
+    Application counts for job serializers, read from the
+    JobPosting.objects.with_application_stats() annotations. Jobs loaded
+    without them fall back to one aggregate query per job.
+    """
+
+    def _application_stats(self, obj):
+        if not hasattr(obj, 'total_applicants'):
+            stats = JobPosting.objects.filter(pk=obj.pk).with_application_stats().values(
+                'total_applicants', 'last_applied_at',
+                *[status_field_name(status) for status in APPLICATION_STATUSES]
+            ).first() or {}
+            for name, value in stats.items():
+                setattr(obj, name, value)
+        return obj
+
+    def get_total_applicants(self, obj):
+        return self._application_stats(obj).total_applicants
+
+    def get_total_hired(self, obj):
+        return getattr(self._application_stats(obj), status_field_name('HIRED'))
+
+    def get_status_breakdown(self, obj):
+        obj = self._application_stats(obj)
+        return {status: getattr(obj, status_field_name(status)) for status in APPLICATION_STATUSES}
+
+    def get_last_applied_at(self, obj):
+        last_applied_at = self._application_stats(obj).last_applied_at
+        return serializers.DateTimeField().to_representation(last_applied_at) if last_applied_at else None
+
+
+class JobWithApplicationStatsSerializer(ApplicationStatsMixin, serializers.ModelSerializer):
     total_applicants = serializers.SerializerMethodField()
     total_hired = serializers.SerializerMethodField()
+    status_breakdown = serializers.SerializerMethodField()
+    last_applied_at = serializers.SerializerMethodField()
     company_name = serializers.SerializerMethodField()
 
     class Meta:
@@ -170,15 +206,10 @@ class JobWithApplicationStatsSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'location', 'job_type',
             'company_name', 'application_deadline',
-            'total_applicants', 'total_hired', 'is_active', 'is_published'
+            'total_applicants', 'total_hired', 'status_breakdown', 'last_applied_at',
+            'is_active', 'is_published'
         ]
 
-    def get_total_applicants(self, obj):
-        return obj.applications.count()
-
-    def get_total_hired(self, obj):
-        return obj.applications.filter(status='HIRED').count()
-
     def get_company_name(self, obj):
         return obj.company.name if obj.company else None
 
@@ -238,6 +269,7 @@ class EnhancedJobSerializer(serializers.ModelSerializer):
     )
     duration = serializers.CharField(allow_blank=True, required=False)
     company = serializers.SerializerMethodField()
+    search_snippet = serializers.SerializerMethodField()
     
     class Meta:
         model = JobPosting
@@ -247,7 +279,7 @@ class EnhancedJobSerializer(serializers.ModelSerializer):
             'application_deadline', 'requirements', 'skills', 'benefits',
             'is_active', 'is_published', 'interview_rounds', 'additional_fields',
             'required_skills', 'allowed_passout_years', 'allowed_departments', 'arrears_requirement',
-            'created_at', 'updated_at', 'company'
+            'created_at', 'updated_at', 'company', 'search_snippet'
         ]
         
     def get_company_name(self, obj):
@@ -262,6 +294,11 @@ class EnhancedJobSerializer(serializers.ModelSerializer):
             return CompanySerializer(obj.company).data
         return None
 
+    def get_search_snippet(self, obj):
+        """Highlighted excerpt when the job was found by a search, else None"""
+        from .search import highlight
+        return highlight(getattr(obj, 'search_snippet', None))
+
     def get_requirements(self, obj):
         """Convert required_skills string to list"""
         if obj.required_skills:
@@ -335,6 +372,7 @@ class DetailedJobApplicationSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     
     # JSON data with proper handling
+    applied_data_snapshot = serializers.JSONField(source='snapshot', required=False, allow_null=True)
     profile_data = serializers.SerializerMethodField()
     custom_responses = serializers.SerializerMethodField()
     
@@ -359,7 +397,7 @@ class DetailedJobApplicationSerializer(serializers.ModelSerializer):
 
     def get_profile_data(self, obj):
         """Extract profile data from JSON snapshot"""
-        snapshot = obj.applied_data_snapshot or {}
+        snapshot = obj.snapshot
         return {
             'basic_info': snapshot.get('basic_info', {}),
             'academic_info': snapshot.get('academic_info', {}),
@@ -368,9 +406,14 @@ class DetailedJobApplicationSerializer(serializers.ModelSerializer):
 
     def get_custom_responses(self, obj):
         """Extract custom form responses"""
-        snapshot = obj.applied_data_snapshot or {}
+        snapshot = obj.snapshot
         return snapshot.get('custom_responses', {})
 
+    def update(self, instance, validated_data):
+        if 'snapshot' in validated_data:
+            snapshots.assign(instance, validated_data.pop('snapshot'))
+        return super().update(instance, validated_data)
+
 
 class ExportConfigSerializer(serializers.Serializer):
     """Configuration for application export"""
@@ -386,6 +429,28 @@ class ExportConfigSerializer(serializers.Serializer):
     )
     date_from = serializers.DateField(required=False)
     date_to = serializers.DateField(required=False)
+    archived = serializers.BooleanField(
+        required=False, default=False,
+        help_text="Export archived applications (inactive years and soft-deleted) instead"
+    )
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Status and progress of a background export"""
+    progress = serializers.IntegerField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = ('id', 'format', 'config', 'status', 'progress', 'total_rows', 'processed_rows',
+                  'error', 'filename', 'file_size', 'download_url',
+                  'created_at', 'started_at', 'completed_at')
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != 'COMPLETED':
+            return None
+        return reverse('export-job-download', args=[obj.pk])
 
 
 class StudentProfileFieldsSerializer(serializers.Serializer):
@@ -0,0 +1,204 @@
+"""
+Signals for jobs app
+"""
+from django.db import transaction
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+from django.dispatch import receiver, Signal
+
+from accounts.models import StudentProfile, YearManagement
+from companies.models import Company
+from . import calendar_events, eligibility, placements, search, status_events
+from .models import JobApplication, JobPosting
+
+# Sent (sender=JobApplication) by jobs.bulk after applications changed status
+# without save(), with transitions=[(application, old_status, new_status)];
+# also by jobs.archive for restored applications, with old_status None
+applications_status_changed = Signal()
+
+
+@receiver(post_save, sender=JobPosting)
+def refresh_job_eligibility(sender, instance, raw=False, **kwargs):
+    """Recompute which cohorts a job is open to after it is saved"""
+    if raw:
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and not {
+        'allowed_passout_years', 'allowed_departments', 'arrears_requirement'
+    } & set(update_fields):
+        return
+    eligibility.refresh_job(instance)
+
+
+@receiver(post_save, sender=YearManagement)
+@receiver(post_delete, sender=YearManagement)
+def rebuild_job_eligibility(sender, raw=False, **kwargs):
+    """Active years open and close year-restricted jobs for every cohort"""
+    if raw:
+        return
+    transaction.on_commit(eligibility.rebuild)
+
+
+@receiver(post_save, sender=StudentProfile)
+def ensure_student_cohort(sender, instance, raw=False, **kwargs):
+    """Make sure the cohort of a new or changed student is materialized"""
+    if raw:
+        return
+    eligibility.ensure_cohort(instance)
+
+
+@receiver(post_save, sender=JobPosting)
+def index_job_for_search(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_job(instance)
+
+
+@receiver(post_delete, sender=JobPosting)
+def remove_job_from_search(sender, instance, **kwargs):
+    search.remove_job(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+def reindex_company_jobs(sender, instance, created, raw=False, **kwargs):
+    """Jobs are indexed with their company's name"""
+    if raw or created:
+        return
+    search.index_jobs(instance.job_postings.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=JobPosting)
+def refresh_calendar_events(sender, instance, raw=False, **kwargs):
+    """Rewrite a job's calendar events; other changes only renew the cached feeds"""
+    if raw:
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or calendar_events.SOURCE_FIELDS & set(update_fields):
+        calendar_events.sync_job(instance)
+    else:
+        calendar_events.bump_version()
+
+
+@receiver(post_delete, sender=JobPosting)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=YearManagement)
+@receiver(post_delete, sender=YearManagement)
+def renew_calendar_feeds(sender, raw=False, **kwargs):
+    """Job titles, company names and active years appear in the cached feeds"""
+    if raw:
+        return
+    calendar_events.bump_version()
+
+
+# The status an application had before a save, shared by every receiver
+# that reacts to status changes (status events, placements, the metrics
+# counters). post_init records the status it was loaded with; pre_save
+# copies it to _previous_status, where the post_save receivers read it in
+# whatever order they run, and post_save then records the saved status.
+
+def stored_status(instance, default=None):
+    """Status the application had in the database when loaded or last saved"""
+    return getattr(instance, '_loaded_status', default)
+
+
+def previous_status(instance):
+    """Status the save in progress moves the application from; None for a new one"""
+    return getattr(instance, '_previous_status', None)
+
+
+@receiver(post_init, sender=JobApplication)
+def remember_loaded_status(sender, instance, **kwargs):
+    if instance.pk and 'status' not in instance.get_deferred_fields():
+        instance._loaded_status = instance.status
+
+
+@receiver(pre_save, sender=JobApplication)
+def remember_previous_status(sender, instance, raw=False, **kwargs):
+    """Falls back to the stored status for instances loaded without it (e.g. via .only())"""
+    if not instance.pk:
+        instance._previous_status = None
+    elif raw or hasattr(instance, '_loaded_status'):
+        instance._previous_status = stored_status(instance)
+    else:
+        instance._previous_status = JobApplication.objects.filter(
+            pk=instance.pk
+        ).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender=JobApplication)
+def remember_saved_status(sender, instance, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or 'status' in update_fields:
+        instance._loaded_status = instance.status
+
+
+@receiver(post_save, sender=JobApplication)
+def refresh_applicant_placement(sender, instance, created, raw=False, **kwargs):
+    """Hiring an applicant, or moving a hired application on, changes their placement"""
+    if raw:
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    old_status = previous_status(instance)
+    if old_status != instance.status and placements.HIRED in (old_status, instance.status):
+        placements.sync_users([instance.applicant_id])
+
+
+@receiver(post_delete, sender=JobApplication)
+def remove_applicant_placement(sender, instance, **kwargs):
+    if instance.status == placements.HIRED:
+        placements.sync_users([instance.applicant_id])
+
+
+@receiver(applications_status_changed, sender=JobApplication)
+def refresh_bulk_placements(sender, transitions, **kwargs):
+    placements.sync_users({
+        application.applicant_id
+        for application, old_status, new_status in transitions
+        if placements.HIRED in (old_status, new_status)
+    })
+
+
+@receiver(post_save, sender=JobApplication)
+def record_status_event(sender, instance, created, raw=False, **kwargs):
+    """The initial status of a new application, or the status a save moved it to"""
+    if raw:
+        return
+    old_status = previous_status(instance)
+    if created:
+        status_events.record([(instance, None, instance.status)])
+    elif old_status is not None:
+        status_events.record([(instance, old_status, instance.status)])
+
+
+@receiver(applications_status_changed, sender=JobApplication)
+def record_bulk_status_events(sender, transitions, **kwargs):
+    status_events.record(transitions)
+
+
+@receiver(post_save, sender=StudentProfile)
+def refresh_student_placement(sender, instance, raw=False, **kwargs):
+    """Manual placement, passout year and branch are copied into Placement"""
+    if raw:
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and not {
+        'placement_status', 'placed_job_id', 'passout_year', 'branch'
+    } & set(update_fields):
+        return
+    placements.sync_profiles([instance.pk])
+
+
+@receiver(post_save, sender=JobPosting)
+def refresh_job_placements(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or 'company' in update_fields:
+        placements.company_changed(instance)
+
+
+@receiver(post_delete, sender=JobPosting)
+def detach_job_placements(sender, instance, **kwargs):
+    placements.job_deleted(instance.pk)
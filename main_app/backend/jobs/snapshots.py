@@ -0,0 +1,175 @@
+"""
+Content-addressed store for application snapshots.
+
+An application snapshot (see create_enhanced_application_snapshot) is
+mostly a copy of the student's profile, identical across all the
+applications a student makes until the profile changes. The shared parts
+are stored once per distinct content in SnapshotSection, keyed by the
+SHA-256 of their canonical JSON, and applications reference them:
+
+  profile_snapshot     basic_info, academic_info, contact_info
+  documents_snapshot   documents (resume and certificates)
+
+applied_data_snapshot keeps what is specific to the application: custom
+responses, submission metadata and the custom field files listed under
+documents. JobApplication.snapshot merges the three back into the
+original layout.
+
+Sections are never updated in place. Changing one, e.g. a new primary
+resume, stores the new content (or finds it already stored) and moves
+the applications over with one UPDATE per distinct section they
+referenced (update_documents()). Sections no application references any
+more are removed by compact_application_snapshots.
+"""
+
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+
+from .models import JobApplication, SnapshotSection
+
+PROFILE_SECTIONS = ('basic_info', 'academic_info', 'contact_info')
+DOCUMENTS = 'documents'
+
+
+def digest(data):
+    """SHA-256 of the canonical JSON of a section"""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), cls=DjangoJSONEncoder)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def store_section(data, model=None):
+    """
+    Id of the section holding data, stored if new (of model, so
+    migrations can pass theirs). None if data is None.
+    """
+    if data is None:
+        return None
+    model = model or SnapshotSection
+    section, _ = model.objects.get_or_create(digest=digest(data), defaults={'data': data})
+    return section.pk
+
+
+def split(snapshot):
+    """
+    (profile, documents, rest) of a full snapshot, profile / documents
+    being None if the snapshot has none. Documents that are custom field
+    files (also listed in custom_responses) stay in rest, so the documents
+    section remains shared across applications.
+    """
+    rest = dict(snapshot or {})
+    profile = {key: rest.pop(key) for key in PROFILE_SECTIONS if key in rest} or None
+
+    if DOCUMENTS not in rest:
+        return profile, None, rest
+    documents = dict(rest.pop(DOCUMENTS) or {})
+    custom_responses = rest.get('custom_responses') or {}
+    uploads = {
+        key: documents.pop(key) for key in list(documents)
+        if key in custom_responses and custom_responses[key] == documents[key]
+    }
+    if uploads:
+        rest[DOCUMENTS] = uploads
+        if not documents:
+            documents = None
+    return profile, documents, rest
+
+
+def stored_fields(snapshot, model=None):
+    """
+    JobApplication field values storing a full snapshot, for create(),
+    update() or serializer.save()
+    """
+    profile, documents, rest = split(snapshot)
+    return {
+        'profile_snapshot_id': store_section(profile, model),
+        'documents_snapshot_id': store_section(documents, model),
+        'applied_data_snapshot': rest,
+    }
+
+
+def assign(application, snapshot):
+    """Point an (unsaved) application at the storage of a full snapshot"""
+    for field, value in stored_fields(snapshot).items():
+        setattr(application, field, value)
+
+
+@transaction.atomic
+def update_documents(applications, changes):
+    """
+    Apply changes (a dict of document keys) to the documents of the given
+    applications. Returns the number of applications moved to a new
+    section.
+    """
+    # Documents still held inline would win over the section in
+    # JobApplication.snapshot, so move them into the store first
+    compact_applications(inline_applications(applications))
+
+    section_ids = list(applications.order_by().values_list('documents_snapshot_id', flat=True).distinct())
+    sections = dict(
+        SnapshotSection.objects.filter(pk__in=[pk for pk in section_ids if pk]).values_list('id', 'data')
+    )
+
+    moved = 0
+    for section_id in section_ids:
+        new_id = store_section({**sections.get(section_id, {}), **changes})
+        if new_id != section_id:
+            moved += applications.filter(documents_snapshot_id=section_id).update(documents_snapshot_id=new_id)
+    return moved
+
+
+def inline_applications(applications=None):
+    """
+    Applications (default: all) that may hold shared sections in
+    applied_data_snapshot (stored before this module existed, or written
+    directly)
+    """
+    applications = JobApplication.objects.all() if applications is None else applications
+    return applications.filter(
+        Q(applied_data_snapshot__has_any_keys=list(PROFILE_SECTIONS)) |
+        Q(applied_data_snapshot__has_key=DOCUMENTS, documents_snapshot__isnull=True)
+    )
+
+
+def unreferenced_sections():
+    """Sections no application, hot or archived, references"""
+    return SnapshotSection.objects.filter(
+        profile_applications__isnull=True, documents_applications__isnull=True,
+        archived_profile_applications__isnull=True, archived_documents_applications__isnull=True,
+    )
+
+
+def needs_compaction(application):
+    profile, documents, _ = split(application.applied_data_snapshot)
+    return profile is not None or documents is not None
+
+
+def compact_applications(applications):
+    """
+    Move the shared sections some applications still hold in
+    applied_data_snapshot into the store. Returns the number moved.
+    """
+    moved = []
+    for application in applications.select_related('profile_snapshot', 'documents_snapshot').iterator():
+        if needs_compaction(application):
+            assign(application, application.snapshot)
+            moved.append(application)
+    JobApplication.objects.bulk_update(
+        moved, ['profile_snapshot', 'documents_snapshot', 'applied_data_snapshot'], batch_size=500
+    )
+    return len(moved)
+
+
+@transaction.atomic
+def compact():
+    """
+    Move shared sections still held in applied_data_snapshot into the
+    store and delete sections no application references. Returns
+    (applications moved, sections deleted).
+    """
+    moved = compact_applications(inline_applications())
+    deleted, _ = unreferenced_sections().delete()
+    return moved, deleted
@@ -0,0 +1,266 @@
+"""
+Application status events.
+
+ApplicationStatusEvent holds one row per status an application entered:
+the status it was created with (from_status '') and every change after
+that, with when and by whom. Funnel and time-between-statuses analytics
+are then indexed queries over the events instead of parsing the
+status_history JSON of every application.
+
+Events are written by jobs.signals:
+  JobApplication created               its initial status, at applied_at
+  JobApplication saved, status changed one event
+  applications_status_changed          one bulk insert for the batch; the
+                                       whole history of restored ones
+The time and author come from add_status_change() when the change went
+through it. Applications created before events existed, or by bulk
+writes, get their events from status_history via backfill
+(backfill_status_events); ones that have later events but lack the
+initial one (from_status '') get just that event.
+"""
+
+import numpy as np
+from django.db.models import Case, Count, F, IntegerField, Max, Min, OuterRef, Q, Subquery, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ApplicationStatusEvent, JobApplication
+
+# Pipeline order of the funnel; REJECTED is an exit from any stage
+FUNNEL_STAGES = ['APPLIED', 'UNDER_REVIEW', 'SHORTLISTED', 'HIRED']
+REJECTED = 'REJECTED'
+
+LATENCY_PERCENTILES = [50, 75, 90, 95, 99]
+
+
+def event_for(application, old_status, new_status):
+    """Unsaved event for an application moving from old_status (None when created) to new_status"""
+    changed_by_id, changed_at = None, None
+    change = getattr(application, '_status_change', None)
+    if change and change[0] == new_status:
+        _, changed_by_id, changed_at = change
+    if old_status is None:
+        changed_at = application.applied_at
+    return ApplicationStatusEvent(
+        application_id=application.pk,
+        job_id=application.job_id,
+        from_status=old_status or '',
+        to_status=new_status,
+        changed_at=changed_at or timezone.now(),
+        changed_by_id=changed_by_id,
+    )
+
+
+def record(transitions):
+    """
+    Store the events of (application, old_status, new_status) transitions.
+    An application arriving with a status history (old_status None, e.g.
+    restored from the archive) gets the events of its history.
+    """
+    from django.contrib.auth import get_user_model
+
+    transitions = [transition for transition in transitions if transition[1] != transition[2]]
+    replayed = [application for application, old_status, _ in transitions if old_status is None and application.status_history]
+    user_ids = set()
+    if replayed:
+        referenced = {
+            entry.get('changed_by') for application in replayed for entry in application.status_history
+            if isinstance(entry, dict)
+        }
+        user_ids = set(get_user_model().objects.filter(pk__in=referenced).values_list('id', flat=True))
+
+    events = []
+    for application, old_status, new_status in transitions:
+        if old_status is None and application.status_history:
+            events.extend(history_events(
+                ApplicationStatusEvent, application.pk, application.job_id, application.status,
+                application.applied_at, application.status_history, user_ids=user_ids,
+            ))
+        else:
+            events.append(event_for(application, old_status, new_status))
+    ApplicationStatusEvent.objects.bulk_create(events)
+    return len(events)
+
+
+def _history_time(value, default):
+    changed_at = parse_datetime(value) if isinstance(value, str) else None
+    if changed_at is None:
+        return default
+    if timezone.is_naive(changed_at):
+        changed_at = timezone.make_aware(changed_at)
+    return changed_at
+
+
+def history_events(model, application_id, job_id, status, applied_at, status_history, user_ids=()):
+    """
+    Unsaved events (of model, so migrations can pass theirs) recovered
+    from an application's status_history. changed_by is kept if it is one
+    of user_ids.
+    """
+    history = [
+        entry for entry in (status_history if isinstance(status_history, list) else [])
+        if isinstance(entry, dict) and entry.get('to_status')
+    ]
+    initial = (history[0].get('from_status') if history else None) or status
+    events = [model(
+        application_id=application_id, job_id=job_id, from_status='', to_status=initial, changed_at=applied_at
+    )]
+
+    current = initial
+    for entry in history:
+        if entry['to_status'] == current:
+            continue
+        changed_by = entry.get('changed_by')
+        events.append(model(
+            application_id=application_id,
+            job_id=job_id,
+            from_status=current,
+            to_status=entry['to_status'],
+            changed_at=_history_time(entry.get('changed_at'), applied_at),
+            changed_by_id=changed_by if changed_by in user_ids else None,
+        ))
+        current = entry['to_status']
+    return events
+
+
+def applications_without_events():
+    return JobApplication.objects.filter(status_events__isnull=True)
+
+
+def applications_without_initial_event(applications=None):
+    """Applications (default: all) with no from_status '' event, including those with no events at all"""
+    applications = JobApplication.objects.all() if applications is None else applications
+    return applications.exclude(status_events__from_status='')
+
+
+def backfill(applications=None):
+    """
+    Create the missing events of applications (default: all) without an
+    initial event: the whole history from status_history for those with
+    no events, otherwise only the initial event, entering the status the
+    earliest stored event moved from. Returns the number of events created.
+    """
+    from django.contrib.auth import get_user_model
+
+    user_ids = set(get_user_model().objects.values_list('id', flat=True))
+    earliest = ApplicationStatusEvent.objects.filter(application=OuterRef('pk')).order_by('changed_at', 'pk')
+    rows = applications_without_initial_event(applications).annotate(
+        first_from=Subquery(earliest.values('from_status')[:1])
+    ).values_list('id', 'job_id', 'status', 'applied_at', 'status_history', 'first_from')
+
+    created = 0
+    batch = []
+    for application_id, job_id, status, applied_at, status_history, first_from in rows.iterator():
+        if first_from is None:
+            batch.extend(history_events(
+                ApplicationStatusEvent, application_id, job_id, status, applied_at, status_history,
+                user_ids=user_ids,
+            ))
+        else:
+            batch.append(ApplicationStatusEvent(
+                application_id=application_id, job_id=job_id, from_status='', to_status=first_from,
+                changed_at=applied_at,
+            ))
+        if len(batch) >= 1000:
+            created += len(ApplicationStatusEvent.objects.bulk_create(batch))
+            batch = []
+    created += len(ApplicationStatusEvent.objects.bulk_create(batch))
+    return created
+
+
+def filtered_events(job_id=None, company_id=None, passout_year=None, date_from=None, date_to=None):
+    """Events of the (not deleted) applications matching the filters; dates bound applied_at"""
+    events = ApplicationStatusEvent.objects.filter(application__is_deleted=False)
+    if job_id is not None:
+        events = events.filter(job_id=job_id)
+    if company_id is not None:
+        events = events.filter(job__company_id=company_id)
+    if passout_year is not None:
+        events = events.filter(application__applicant__student_profile__passout_year=passout_year)
+    if date_from is not None:
+        events = events.filter(application__applied_at__date__gte=date_from)
+    if date_to is not None:
+        events = events.filter(application__applied_at__date__lte=date_to)
+    return events
+
+
+def _percent(part, whole):
+    return round(part / whole * 100, 2) if whole else 0.0
+
+
+def funnel(**filters):
+    """
+    How many applications reached each FUNNEL_STAGES stage (or a later
+    one), with conversion rates, and where rejected applications left.
+    """
+    events = filtered_events(**filters)
+
+    stage_rank = Case(
+        *[When(to_status=stage, then=Value(rank)) for rank, stage in enumerate(FUNNEL_STAGES)],
+        default=Value(-1), output_field=IntegerField(),
+    )
+    furthest = np.fromiter(
+        events.order_by().values('application').annotate(rank=Max(stage_rank)).values_list('rank', flat=True),
+        dtype=np.int64,
+    )
+    total = len(furthest)
+    # An application that reached a stage also passed every stage before it
+    at_stage = np.bincount(furthest[furthest >= 0], minlength=len(FUNNEL_STAGES))
+    reached = np.cumsum(at_stage[::-1])[::-1]
+
+    stages = []
+    for rank, stage in enumerate(FUNNEL_STAGES):
+        count = int(reached[rank])
+        previous = total if rank == 0 else int(reached[rank - 1])
+        stages.append({
+            'status': stage,
+            'reached': count,
+            'conversion_from_previous': _percent(count, previous),
+            'conversion_from_start': _percent(count, total),
+        })
+
+    rejected_by_stage = dict(
+        events.filter(to_status=REJECTED).order_by().values('from_status')
+        .annotate(total=Count('application', distinct=True)).values_list('from_status', 'total')
+    )
+    return {
+        'total_applications': total,
+        'stages': stages,
+        'rejected': {
+            'total': sum(rejected_by_stage.values()),
+            'by_stage': {stage or 'UNKNOWN': count for stage, count in rejected_by_stage.items()},
+        },
+    }
+
+
+def latency(from_status='APPLIED', to_status='HIRED', **filters):
+    """
+    Percentiles (hours) of the time applications took from first entering
+    from_status to first entering to_status, over the applications that
+    did both in that order.
+    """
+    spans = filtered_events(**filters).order_by().values('application').annotate(
+        started=Min('changed_at', filter=Q(to_status=from_status)),
+        ended=Min('changed_at', filter=Q(to_status=to_status)),
+    ).filter(started__isnull=False, ended__isnull=False, ended__gte=F('started'))
+
+    hours = np.fromiter(
+        ((ended - started).total_seconds() / 3600 for started, ended in spans.values_list('started', 'ended')),
+        dtype=np.float64,
+    )
+    result = {'from_status': from_status, 'to_status': to_status, 'count': int(len(hours))}
+    if not len(hours):
+        result.update({
+            'mean_hours': None, 'min_hours': None, 'max_hours': None,
+            'percentiles_hours': {f'p{pct}': None for pct in LATENCY_PERCENTILES},
+        })
+        return result
+
+    values = np.percentile(hours, LATENCY_PERCENTILES)
+    result.update({
+        'mean_hours': round(float(hours.mean()), 2),
+        'min_hours': round(float(hours.min()), 2),
+        'max_hours': round(float(hours.max()), 2),
+        'percentiles_hours': {f'p{pct}': round(float(value), 2) for pct, value in zip(LATENCY_PERCENTILES, values)},
+    })
+    return result
@@ -1,3 +1,68 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from college.models import College
+from companies.models import Company
+from .models import JobPosting, JobApplication
+
+
+class JobStatsListViewTests(TestCase):
+    """The job stats list reads application counts from annotations, not a query per job"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        college = College.objects.create(name='Test College', slug='test')
+        cls.admin = User.objects.create_superuser(email='admin@example.com', password='x', college=college)
+
+        company = Company.objects.create(
+            name='Acme', description='', industry='', size='', founded='2000',
+            location='', website='https://example.com'
+        )
+        cls.jobs = [
+            JobPosting.objects.create(
+                company=company, title=f'Job {index}', description='', location='',
+                required_skills='', application_deadline=date(2030, 1, 1)
+            )
+            for index in range(5)
+        ]
+
+        statuses = ['APPLIED', 'HIRED', 'REJECTED', 'HIRED']
+        for index, status in enumerate(statuses):
+            student = User.objects.create_user(
+                email=f'student{index}@example.com', password='x', college=college
+            )
+            JobApplication.objects.create(job=cls.jobs[0], applicant=student, status=status)
+            if index < 2:
+                JobApplication.objects.create(job=cls.jobs[1], applicant=student)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get_stats(self):
+        response = self.client.get('/api/v1/jobs/job-stats/')
+        self.assertEqual(response.status_code, 200)
+        return {row['id']: row for row in response.data['data']}
+
+    def test_counts(self):
+        stats = self.get_stats()
+
+        first = stats[self.jobs[0].id]
+        self.assertEqual(first['total_applicants'], 4)
+        self.assertEqual(first['total_hired'], 2)
+        self.assertEqual(first['status_breakdown']['REJECTED'], 1)
+        self.assertEqual(first['status_breakdown']['SHORTLISTED'], 0)
+        self.assertIsNotNone(first['last_applied_at'])
+
+        self.assertEqual(stats[self.jobs[1].id]['total_applicants'], 2)
+        self.assertEqual(stats[self.jobs[2].id]['total_applicants'], 0)
+        self.assertIsNone(stats[self.jobs[2].id]['last_applied_at'])
 
-# Create your tests here.
+    def test_query_count_does_not_grow_with_jobs(self):
+        # One COUNT for the paginator and one SELECT for the page
+        with self.assertNumQueries(2):
+            self.get_stats()
@@ -19,6 +19,7 @@ from .views import (
     EnhancedJobDetailView,
     EnhancedJobApplicationCreateView,
     JobApplicationEligibilityView,
+    JobsEligibilityBatchView,
     JobStatsView,
     CompanyStatsView,
     ApplicationStatsView,
@@ -32,9 +33,14 @@ from .views import (
     EnhancedApplicationsListView,
     ApplicationDetailView,
     ApplicationExportView,
+    ExportJobListCreateView,
+    ExportJobDetailView,
+    ExportJobDownloadView,
     StudentProfileFieldsView,
     BulkApplicationUpdateView,
     CalendarEventsView,
+    CalendarFeedLinkView,
+    CalendarFeedView,
     PlacedStudentsView,
     PlacedStudentsExportView,
     PlacedStudentsPassoutYearsView,
@@ -67,6 +73,7 @@ urlpatterns = [
     path('create/', AdminJobPostingCreateView.as_view(), name='admin-job-posting-create'),
     path('<int:pk>/', EnhancedJobDetailView.as_view(), name='enhanced-job-detail'),
     path('<int:pk>/can-apply/', JobApplicationEligibilityView.as_view(), name='job-application-eligibility'),
+    path('can-apply/', JobsEligibilityBatchView.as_view(), name='jobs-eligibility-batch'),
     path('<int:pk>/toggle-publish/', JobPublishToggleView.as_view(), name='job-publish-toggle'),
     path('<int:job_id>/apply/', EnhancedJobApplicationCreateView.as_view(), name='enhanced-job-application-create'),
     path('<int:job_id>/applications/', JobApplicationsListView.as_view(), name='job-applications-list'),
@@ -101,6 +108,9 @@ urlpatterns = [
     path('applications/', EnhancedApplicationsListView.as_view(), name='enhanced-applications-list'),
     path('applications/<int:pk>/', ApplicationDetailView.as_view(), name='application-detail'),
     path('applications/export/', ApplicationExportView.as_view(), name='applications-export'),
+    path('applications/export/jobs/', ExportJobListCreateView.as_view(), name='export-jobs'),
+    path('applications/export/jobs/<uuid:pk>/', ExportJobDetailView.as_view(), name='export-job-detail'),
+    path('applications/export/jobs/<uuid:pk>/download/', ExportJobDownloadView.as_view(), name='export-job-download'),
     path('applications/fields/', StudentProfileFieldsView.as_view(), name='profile-fields'),
     path('applications/bulk-update/', BulkApplicationUpdateView.as_view(), name='bulk-application-update'),
     
@@ -111,6 +121,8 @@ urlpatterns = [
     
     # Calendar API
     path('calendar/events/', CalendarEventsView.as_view(), name='calendar-events'),
+    path('calendar/feed/', CalendarFeedLinkView.as_view(), name='calendar-feed-link'),
+    path('calendar/feed/<str:token>/', CalendarFeedView.as_view(), name='calendar-feed'),
     
     # ATS (Applicant Tracking System) API
     path('ats/board/', KanbanBoardView.as_view(), name='ats-kanban-board'),
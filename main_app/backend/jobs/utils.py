@@ -2,14 +2,32 @@ from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 import math
 import csv
+import datetime
+import decimal
 import io
-import pandas as pd
+import tempfile
+from collections import namedtuple
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse, FileResponse
 from django.utils import timezone
 
+# Rows fetched per database round trip while exporting
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+# Larger spreadsheet exports are handed to a background job (jobs.exports)
+EXPORT_INLINE_MAX_ROWS = getattr(settings, 'EXPORT_INLINE_MAX_ROWS', 5000)
+# Leading rows used to size the columns of an Excel export
+XLSX_WIDTH_SAMPLE_ROWS = 200
+XLSX_MAX_COLUMN_WIDTH = 50
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
@@ -86,6 +104,158 @@ def get_pagination_params(request):
     return page, per_page 
 
 
+class Echo:
+    """File-like object whose write() hands the written value back, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(headers, rows):
+    """Encode headers and rows as CSV, one line of bytes at a time"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(headers).encode('utf-8')
+    for row in rows:
+        yield writer.writerow(row).encode('utf-8')
+
+
+def _excel_value(value):
+    """Coerce a value to something openpyxl can write"""
+    if value is None or isinstance(value, (bool, int, float, decimal.Decimal)):
+        return value
+    if isinstance(value, datetime.datetime):
+        # Excel has no time zones
+        return timezone.localtime(value).replace(tzinfo=None) if timezone.is_aware(value) else value
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value
+    return ILLEGAL_CHARACTERS_RE.sub('', str(value))
+
+
+def write_xlsx(output, headers, rows, sheet_title):
+    """
+    Write headers and rows to output as an Excel workbook.
+
+    Uses openpyxl's write-only mode, which streams rows to disk instead of
+    keeping every cell in memory. Column widths have to be set before the
+    first row is written, so they are estimated from the first
+    XLSX_WIDTH_SAMPLE_ROWS rows.
+    """
+    rows = iter(rows)
+    sample = []
+    for row in rows:
+        sample.append([_excel_value(value) for value in row])
+        if len(sample) >= XLSX_WIDTH_SAMPLE_ROWS:
+            break
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=sheet_title)
+    for index, header in enumerate(headers):
+        width = max([len(str(header))] + [
+            len(str(row[index])) for row in sample if row[index] is not None
+        ])
+        worksheet.column_dimensions[get_column_letter(index + 1)].width = min(width + 2, XLSX_MAX_COLUMN_WIDTH)
+
+    worksheet.append(list(headers))
+    for row in sample:
+        worksheet.append(row)
+    for row in rows:
+        worksheet.append([_excel_value(value) for value in row])
+
+    workbook.save(output)
+    return output
+
+
+def export_response(file_data):
+    """
+    Build the download response for a generate_export() result: a
+    streaming response for iterables of bytes, a file response for file
+    objects and a plain response for bytes.
+    """
+    content = file_data['content']
+    if isinstance(content, bytes):
+        response = HttpResponse(content, content_type=file_data['content_type'])
+    elif hasattr(content, 'read'):
+        response = FileResponse(content, content_type=file_data['content_type'])
+    else:
+        response = StreamingHttpResponse(content, content_type=file_data['content_type'])
+    response['Content-Disposition'] = f'attachment; filename="{file_data["filename"]}"'
+    return response
+
+
+# Columns read from the application and its relations rather than from
+# its snapshot
+APPLICATION_COLUMNS = (
+    'student_name', 'student_email', 'student_id', 'branch',
+    'job_title', 'company_name', 'status', 'applied_at',
+)
+
+
+def _per_row(getter):
+    """getter(application), evaluated once per row however many columns use it"""
+    last = [None, None]
+
+    def get(application):
+        if last[0] is not application:
+            last[0], last[1] = application, getter(application)
+        return last[1]
+
+    return get
+
+
+def application_column_accessors():
+    """accessor(application, sections) for each of APPLICATION_COLUMNS"""
+    from jobs.models import JobApplication
+
+    profile = _per_row(lambda application: application.applicant.student_profile)
+    status_labels = dict(JobApplication._meta.get_field('status').flatchoices)
+
+    def student_name(application, sections):
+        student = profile(application)
+        return f"{student.first_name} {student.last_name}"
+
+    return {
+        'student_name': student_name,
+        'student_email': lambda application, sections: application.applicant.email,
+        'student_id': lambda application, sections: profile(application).student_id,
+        'branch': lambda application, sections: profile(application).branch,
+        'job_title': lambda application, sections: application.job.title,
+        'company_name': lambda application, sections: application.job.company.name,
+        'status': lambda application, sections: status_labels.get(application.status, application.status),
+        'applied_at': lambda application, sections: application.applied_at.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+_MISSING = object()
+
+
+SnapshotSections = namedtuple('SnapshotSections', ['raw', 'custom_responses', 'merged'])
+
+
+def snapshot_sections(application):
+    """
+    The snapshot of an application, prepared once per row:
+    merged holds the keys of every section with the value
+    get_column_value() would return for them, so a snapshot column is a
+    single lookup.
+    """
+    snapshot = application.snapshot
+    custom_responses = snapshot.get('custom_responses', {})
+
+    # Later updates win, mirroring the basic > academic > contact > custom
+    # lookup order
+    merged = {key: _as_text(value) for key, value in custom_responses.items()}
+    merged.update(snapshot.get('contact_info', {}))
+    merged.update(snapshot.get('academic_info', {}))
+    merged.update(snapshot.get('basic_info', {}))
+    return SnapshotSections(snapshot, custom_responses, merged)
+
+
+def _as_text(value):
+    if isinstance(value, list):
+        return ', '.join(str(v) for v in value)
+    return str(value)
+
+
 class ApplicationExportService:
     """Service for exporting application data"""
     
@@ -153,80 +323,79 @@ class ApplicationExportService:
             'all': standard_columns + dynamic_columns
         }
     
-    def generate_export(self, queryset, format, columns, job_id=None):
-        """Generate export in specified format"""
+    def get_queryset(self, config):
+        """
+        Applications matching the filters of an export config, read from
+        the archive (jobs.archive) if config['archived'] is set
+        """
+        from jobs.models import ArchivedApplication, JobApplication
+
+        model = ArchivedApplication if config.get('archived') else JobApplication
+        queryset = model.objects.select_related(
+            'job', 'job__company', 'applicant__student_profile', 'profile_snapshot', 'documents_snapshot'
+        ).filter(is_deleted=False)
+        
+        if config.get('job_id'):
+            queryset = queryset.filter(job_id=config['job_id'])
+        
+        if config.get('status'):
+            queryset = queryset.filter(status__in=config['status'])
+        
+        if config.get('date_from'):
+            queryset = queryset.filter(applied_at__gte=config['date_from'])
+        
+        if config.get('date_to'):
+            queryset = queryset.filter(applied_at__lte=config['date_to'])
+        
+        return queryset
+
+    def generate_export(self, queryset, format, columns, job_id=None, progress=None):
+        """
+        Generate export in specified format. progress, if given, is called
+        with the number of rows written after every EXPORT_CHUNK_SIZE rows.
+        """
         
         if format == 'csv':
-            return self.generate_csv(queryset, columns)
+            return self.generate_csv(queryset, columns, progress)
         elif format == 'xlsx':
-            return self.generate_excel(queryset, columns, job_id)
+            return self.generate_excel(queryset, columns, job_id, progress)
         elif format == 'pdf':
-            return self.generate_pdf(queryset, columns, job_id)
+            return self.generate_pdf(queryset, columns, job_id, progress)
         else:
             raise ValueError(f"Unsupported format: {format}")
     
-    def generate_csv(self, queryset, columns):
-        """Generate CSV export"""
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        headers = self.get_column_headers(columns)
-        writer.writerow(headers)
-        
-        # Write data
-        for application in queryset:
-            row = self.get_application_row(application, columns)
-            writer.writerow(row)
-        
+    def iter_rows(self, queryset, columns, progress=None):
+        """Rows of column values, fetching the queryset in chunks"""
+        accessors = self.compile_columns(columns)
+        for count, application in enumerate(queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE), 1):
+            sections = snapshot_sections(application)
+            yield [accessor(application, sections) for accessor in accessors]
+            if progress and count % EXPORT_CHUNK_SIZE == 0:
+                progress(count)
+
+    def generate_csv(self, queryset, columns, progress=None):
+        """Generate CSV export, streamed row by row"""
         return {
-            'content': output.getvalue().encode('utf-8'),
+            'content': iter_csv(self.get_column_headers(columns), self.iter_rows(queryset, columns, progress)),
             'content_type': 'text/csv',
             'filename': f'applications_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv'
         }
     
-    def generate_excel(self, queryset, columns, job_id=None):
-        """Generate Excel export"""
-        data = []
-        
-        # Prepare data
-        for application in queryset:
-            row_data = {}
-            for col in columns:
-                row_data[self.get_column_header(col)] = self.get_column_value(application, col)
-            data.append(row_data)
-        
-        # Create DataFrame
-        df = pd.DataFrame(data)
-        
-        # Create Excel file
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Applications', index=False)
-            
-            # Format the worksheet
-            worksheet = writer.sheets['Applications']
-            for column in worksheet.columns:
-                max_length = 0
-                column_name = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_name].width = adjusted_width
-        
+    def generate_excel(self, queryset, columns, job_id=None, progress=None):
+        """Generate Excel export into a temporary file"""
+        output = tempfile.TemporaryFile()
+        write_xlsx(
+            output, self.get_column_headers(columns), self.iter_rows(queryset, columns, progress), 'Applications'
+        )
         output.seek(0)
         
         return {
-            'content': output.getvalue(),
-            'content_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            'content': output,
+            'content_type': XLSX_CONTENT_TYPE,
             'filename': f'applications_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
         }
     
-    def generate_pdf(self, queryset, columns, job_id=None):
+    def generate_pdf(self, queryset, columns, job_id=None, progress=None):
         """Generate PDF export"""
         output = io.BytesIO()
         
@@ -244,8 +413,8 @@ class ApplicationExportService:
         headers = [self.get_column_header(col) for col in columns]
         data = [headers]
         
-        for application in queryset:
-            row = [str(self.get_column_value(application, col)) for col in columns]
+        for values in self.iter_rows(queryset, columns, progress):
+            row = [str(value) for value in values]
             # Truncate long text for PDF
             row = [text[:30] + '...' if len(text) > 30 else text for text in row]
             data.append(row)
@@ -305,10 +474,77 @@ class ApplicationExportService:
     def get_application_row(self, application, columns):
         """Get row data for application"""
         return [self.get_column_value(application, col) for col in columns]
+
+    def compile_columns(self, columns):
+        """Accessors for a list of columns, see compile_column()"""
+        fixed = application_column_accessors()
+        return [self.compile_column(column, fixed) for column in columns]
+
+    def compile_column(self, column, fixed=None):
+        """
+        Compile a column into accessor(application, sections), where sections
+        is snapshot_sections(application). Accessors return what
+        get_column_value() returns, but which lookups apply to the column
+        is decided once per export, and the labels of an additional field
+        once per job, instead of for every cell.
+        """
+        if column in APPLICATION_COLUMNS:
+            return (fixed or application_column_accessors())[column]
+
+        if column.startswith('field_'):
+            fallback = self._compile_additional_field(column)
+        else:
+            # Legacy format fallback (for old data)
+            def fallback(application, sections):
+                if column in sections.raw:
+                    return _as_text(sections.raw.get(column, ''))
+                return ''
+
+        def accessor(application, sections):
+            value = sections.merged.get(column, _MISSING)
+            if value is _MISSING:
+                return fallback(application, sections)
+            return value
+
+        return accessor
+
+    def _compile_additional_field(self, column):
+        """Accessor for a field_<id> column not found directly in custom_responses"""
+        field_id = column.replace('field_', '')
+        labels_by_job = {}
+
+        def accessor(application, sections):
+            custom_responses = sections.custom_responses
+            if field_id in custom_responses:
+                return _as_text(custom_responses[field_id])
+
+            labels = labels_by_job.get(application.job_id)
+            if labels is None:
+                labels = labels_by_job[application.job_id] = self._additional_field_labels(
+                    application.job, field_id
+                )
+            for label in labels:
+                if label in custom_responses:
+                    return _as_text(custom_responses[label])
+            return ''
+
+        return accessor
+
+    def _additional_field_labels(self, job, field_id):
+        """Labels of the job's additional fields matching field_id, in order"""
+        labels = []
+        try:
+            for field in job.additional_fields or []:
+                if (str(field.get('id', '')) == field_id or
+                        field.get('label', '').replace(' ', '_').lower() == field_id):
+                    labels.append(field.get('label', ''))
+        except (AttributeError, TypeError):
+            pass
+        return labels
     
     def get_column_value(self, application, column):
         """Get value for specific column"""
-        snapshot = application.applied_data_snapshot or {}
+        snapshot = application.snapshot
         
         # Basic application fields
         if column == 'student_name':
@@ -409,64 +645,32 @@ class PlacedStudentsExportService:
         else:
             raise ValueError(f"Unsupported format: {format}")
     
+    def iter_rows(self, queryset, columns):
+        """Rows of column values, fetching querysets in chunks"""
+        if hasattr(queryset, 'iterator'):
+            queryset = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        for student in queryset:
+            yield [self.get_column_value(student, col) for col in columns]
+
     def generate_csv(self, queryset, columns):
-        """Generate CSV export"""
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
+        """Generate CSV export, streamed row by row"""
         headers = [self.get_column_header(col) for col in columns]
-        writer.writerow(headers)
-        
-        # Write data
-        for student in queryset:
-            row = [self.get_column_value(student, col) for col in columns]
-            writer.writerow(row)
-        
         return {
-            'content': output.getvalue().encode('utf-8'),
+            'content': iter_csv(headers, self.iter_rows(queryset, columns)),
             'content_type': 'text/csv',
             'filename': f'placed_students_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv'
         }
     
     def generate_excel(self, queryset, columns):
-        """Generate Excel export"""
-        data = []
-        
-        # Prepare data
-        for student in queryset:
-            row_data = {}
-            for col in columns:
-                row_data[self.get_column_header(col)] = self.get_column_value(student, col)
-            data.append(row_data)
-        
-        # Create DataFrame
-        df = pd.DataFrame(data)
-        
-        # Create Excel file
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Placed Students', index=False)
-            
-            # Format the worksheet
-            worksheet = writer.sheets['Placed Students']
-            for column in worksheet.columns:
-                max_length = 0
-                column_name = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_name].width = adjusted_width
-        
+        """Generate Excel export into a temporary file"""
+        headers = [self.get_column_header(col) for col in columns]
+        output = tempfile.TemporaryFile()
+        write_xlsx(output, headers, self.iter_rows(queryset, columns), 'Placed Students')
         output.seek(0)
         
         return {
-            'content': output.getvalue(),
-            'content_type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            'content': output,
+            'content_type': XLSX_CONTENT_TYPE,
             'filename': f'placed_students_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
         }
     
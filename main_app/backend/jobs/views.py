@@ -1,11 +1,25 @@
 from rest_framework import viewsets, generics, permissions, status, serializers
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from .models import CompanyForm, JobPosting
+from .models import CompanyForm, JobPosting, ExportJob
+from . import eligibility
+from . import search as job_search
+from .exports import request_export
+from . import bulk
+from . import calendar_events
+from . import placements
+from . import applications
+from . import snapshots
+from .applications import create_enhanced_application_snapshot
 from .serializers import CompanyFormSerializer, JobPostingCreateUpdateSerializer
 from django.shortcuts import get_object_or_404
+from django.core.exceptions import ObjectDoesNotExist
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse
+from django.core import signing
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -33,11 +47,12 @@ from .serializers import (
     StatsSerializer,
     DetailedJobApplicationSerializer,
     ExportConfigSerializer,
+    ExportJobSerializer,
     StudentProfileFieldsSerializer,
     PlacedStudentSerializer
 )
 # EmployerProfile removed
-from .utils import StandardResultsSetPagination, get_paginated_response, get_correct_pagination_data, ApplicationExportService
+from .utils import StandardResultsSetPagination, get_paginated_response, get_correct_pagination_data, ApplicationExportService, export_response, iter_csv, EXPORT_CHUNK_SIZE, EXPORT_INLINE_MAX_ROWS
 from django.contrib.auth import get_user_model
 from datetime import datetime, timedelta
 from django.utils import timezone
@@ -46,97 +61,6 @@ import csv
 
 User = get_user_model()
 
-def create_enhanced_application_snapshot(student_profile, custom_responses=None, request=None):
-    """Create enhanced application snapshot with organized structure"""
-    # Get primary resume from Resume model (preferred) or fallback to profile resume
-    resume_url = None
-    resume_data = {}
-    
-    try:
-        # Try to get primary resume from Resume model
-        from accounts.models import Resume
-        primary_resume = Resume.objects.filter(
-            student=student_profile, 
-            is_primary=True
-        ).first()
-        
-        if primary_resume and primary_resume.file:
-            resume_url = primary_resume.file.url
-            resume_data = {
-                "resume_url": resume_url,
-                "resume_id": primary_resume.id,
-                "resume_name": primary_resume.name,
-                "resume_uploaded_at": primary_resume.uploaded_at.isoformat() if primary_resume.uploaded_at else None,
-            }
-        # Fallback to latest resume if no primary resume
-        elif not primary_resume:
-            latest_resume = Resume.objects.filter(student=student_profile).first()
-            if latest_resume and latest_resume.file:
-                resume_url = latest_resume.file.url
-                resume_data = {
-                    "resume_url": resume_url,
-                    "resume_id": latest_resume.id,
-                    "resume_name": latest_resume.name,
-                    "resume_uploaded_at": latest_resume.uploaded_at.isoformat() if latest_resume.uploaded_at else None,
-                }
-    except Exception as e:
-        print(f"Error getting resume from Resume model: {e}")
-    
-    # Final fallback to StudentProfile.resume field
-    if not resume_url and student_profile.resume:
-        resume_url = student_profile.resume.url
-        resume_data = {"resume_url": resume_url}
-    
-    snapshot = {
-        "basic_info": {
-            "name": f"{student_profile.first_name} {student_profile.last_name}",
-            "email": student_profile.contact_email or student_profile.user.email,
-            "student_id": student_profile.student_id,
-            "branch": student_profile.branch,
-            "current_cgpa": student_profile.gpa,
-            "university": student_profile.college_name or student_profile.college.name if student_profile.college else None,
-        },
-        "academic_info": {
-            "tenth_percentage": student_profile.tenth_percentage,
-            "twelfth_percentage": student_profile.twelfth_percentage,
-            "graduation_year": student_profile.passout_year,
-            "joining_year": student_profile.joining_year,
-            "semester_wise_cgpa": {
-                f"semester{i}": getattr(student_profile, f'semester{i}_cgpa') 
-                for i in range(1, 9) 
-                if getattr(student_profile, f'semester{i}_cgpa')
-            }
-        },
-        "contact_info": {
-            "phone": student_profile.phone,
-            "address": student_profile.address,
-            "city": student_profile.city,
-            "state": student_profile.state,
-            "pincode": student_profile.pincode,
-            "country": student_profile.country,
-        },
-        "documents": {
-            **resume_data,  # Include resume data from Resume model
-            "tenth_certificate_url": student_profile.tenth_certificate.url if student_profile.tenth_certificate else None,
-            "twelfth_certificate_url": student_profile.twelfth_certificate.url if student_profile.twelfth_certificate else None,
-        },
-        "custom_responses": custom_responses or {},
-        "metadata": {
-            "form_version": "1.0",
-            "submission_ip": request.META.get('REMOTE_ADDR') if request else None,
-            "user_agent": request.META.get('HTTP_USER_AGENT') if request else None,
-            "submission_timestamp": timezone.now().isoformat(),
-        }
-    }
-    
-    # Clean up None values to keep the JSON clean
-    def clean_dict(d):
-        if isinstance(d, dict):
-            return {k: clean_dict(v) for k, v in d.items() if v is not None and v != ""}
-        return d
-    
-    return clean_dict(snapshot)
-
 class JobPostingListView(generics.ListAPIView):
     serializer_class = JobPostingCreateUpdateSerializer  
     permission_classes = [permissions.IsAuthenticated]
@@ -145,31 +69,13 @@ class JobPostingListView(generics.ListAPIView):
         queryset = JobPosting.objects.filter(is_active=True, is_published=True)
         
         # Get the current user's student profile
-        user = self.request.user
         try:
-            student_profile = user.student_profile
-            user_passout_year = student_profile.passout_year
-            
-            # Filter jobs in Python since JSONField queries can be complex
-            filtered_jobs = []
-            for job in queryset:
-                allowed_years = job.allowed_passout_years or []
-                if not allowed_years or user_passout_year in allowed_years:
-                    filtered_jobs.append(job)
-            
-            # Convert back to queryset-like object
-            from django.db.models import QuerySet
-            if filtered_jobs:
-                job_ids = [job.id for job in filtered_jobs]
-                queryset = JobPosting.objects.filter(id__in=job_ids)
-            else:
-                queryset = JobPosting.objects.none()
-                
-        except:
-            # If user doesn't have a student profile or passout_year, show all jobs
-            pass
-            
-        return queryset
+            student_profile = self.request.user.student_profile
+        except ObjectDoesNotExist:
+            # If user doesn't have a student profile, show all jobs
+            return queryset
+
+        return eligibility.eligible_jobs(student_profile, queryset)
 
 class JobPostingCreateView(generics.CreateAPIView):
     serializer_class = JobPostingCreateUpdateSerializer
@@ -273,7 +179,7 @@ class JobApplicationCreateView(generics.CreateAPIView):
             job=job,
             applicant=self.request.user,
             resume=uploaded_resume if uploaded_resume else None,
-            applied_data_snapshot=snapshot
+            **snapshots.stored_fields(snapshot)
         )
 
 
@@ -380,7 +286,7 @@ class JobApplicationStatusUpdateView(generics.UpdateAPIView):
 
 
 class JobStatsListView(generics.ListAPIView):
-    queryset = JobPosting.objects.prefetch_related('applications').all()
+    queryset = JobPosting.objects.select_related('company').with_application_stats().order_by('-created_at', '-id')
     serializer_class = JobWithApplicationStatsSerializer
     permission_classes = [permissions.IsAdminUser]
     pagination_class = StandardResultsSetPagination
@@ -558,63 +464,23 @@ class EnhancedJobListCreateView(generics.ListCreateAPIView):
         if salary_min:
             queryset = queryset.filter(salary_min__gte=salary_min)
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search) |
-                Q(company__name__icontains=search)
-            )
+            queryset = job_search.search_jobs(queryset, search)
         if company_id:
             queryset = queryset.filter(company_id=company_id)
 
-        # Filter by student's passout year for non-admin users
+        # Filter by the student's passout year, department and arrears for
+        # non-admin users
         if not self.request.user.is_staff:
             try:
                 student_profile = self.request.user.student_profile
-                user_passout_year = student_profile.passout_year
-                user_department = student_profile.branch
-                user_active_arrears = student_profile.active_arrears or 0
-                
-                # Filter jobs where allowed_passout_years is empty (all students) 
-                # or contains the user's passout year
-                allowed_jobs = []
-                active_years = YearManagement.get_active_years()
-                
-                for job in queryset:
-                    allowed_years_list = job.allowed_passout_years or []
-                    allowed_depts = job.allowed_departments or []
-                    
-                    # If job has specific year restrictions, check if any allowed year is active
-                    if allowed_years_list:
-                        # Job is only visible if at least one of its allowed years is active
-                        has_active_year = any(year in active_years for year in allowed_years_list)
-                        if not has_active_year:
-                            continue  # Skip this job
-                    
-                    # Check passout year filter for the current user
-                    year_allowed = not allowed_years_list or user_passout_year in allowed_years_list
-                    # Check department filter
-                    dept_allowed = not allowed_depts or user_department in allowed_depts
-                    # Check arrears filter
-                    if job.arrears_requirement == 'NO_RESTRICTION':
-                        arrears_allowed = True
-                    elif job.arrears_requirement == 'ALLOW_WITH_ARREARS':
-                        arrears_allowed = True  # Allow any student
-                    elif job.arrears_requirement == 'NO_ARREARS_ALLOWED':
-                        arrears_allowed = user_active_arrears == 0
-                    else:
-                        arrears_allowed = True  # Default to allow
-                    
-                    if year_allowed and dept_allowed and arrears_allowed:
-                        allowed_jobs.append(job.id)
-                
-                if allowed_jobs:
-                    queryset = queryset.filter(id__in=allowed_jobs)
-                else:
-                    queryset = queryset.none()
-                    
-            except:
-                # If user doesn't have a student profile or passout_year, show all jobs
+            except ObjectDoesNotExist:
+                # If user doesn't have a student profile, show all jobs
                 pass
+            else:
+                # Read from the materialized cohort -> job mapping; jobs
+                # restricted to passout years are only listed while one of
+                # those years is active
+                queryset = eligibility.eligible_jobs(student_profile, queryset)
 
         return queryset
 
@@ -662,13 +528,6 @@ class JobApplicationEligibilityView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, pk, slug=None):
-        try:
-            job = JobPosting.objects.get(id=pk)
-        except JobPosting.DoesNotExist:
-            return Response({"detail": "Job posting not found."}, status=404)
-        except Exception as e:
-            return Response({"detail": f"Error fetching job: {str(e)}"}, status=500)
-
         try:
             student = request.user.student_profile
         except AttributeError:
@@ -680,41 +539,51 @@ class JobApplicationEligibilityView(APIView):
             return Response({"detail": f"Error fetching student profile: {str(e)}"}, status=500)
 
         try:
-            # Check freeze status
-            if student.freeze_status == 'complete':
-                return Response({
-                    "can_apply": False,
-                    "freeze_status": "complete",
-                    "reason": "Your account is completely frozen. You cannot apply to any jobs.",
-                    "freeze_reason": student.freeze_reason
-                })
+            results = eligibility.evaluate_jobs(student, [pk])
+        except Exception as e:
+            return Response({"detail": f"Error checking eligibility: {str(e)}"}, status=500)
 
-            if student.freeze_status == 'partial':
-                can_apply = student.can_apply_to_job(job)
-                if not can_apply:
-                    restriction_reasons = student.get_freeze_restriction_reasons(job)
-                    return Response({
-                        "can_apply": False,
-                        "freeze_status": "partial",
-                        "reason": f"Your account has partial restrictions. {student.freeze_reason}",
-                        "freeze_reason": student.freeze_reason,
-                        "restrictions": restriction_reasons
-                    })
+        if pk not in results:
+            return Response({"detail": "Job posting not found."}, status=404)
+        return Response(results[pk])
 
-            # Check if already applied
-            if JobApplication.objects.filter(job=job, applicant=request.user).exists():
-                return Response({
-                    "can_apply": False,
-                    "reason": "You have already applied to this job."
-                })
 
+class JobsEligibilityBatchView(APIView):
+    """
+    Eligibility of the student for many jobs at once, e.g. every card of
+    the job board: ?job_ids=1,2,3 returns the can-apply result of each
+    existing job, keyed by job id, with a constant number of queries.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            job_ids = [int(job_id) for job_id in request.query_params.get('job_ids', '').split(',') if job_id.strip()]
+        except ValueError:
+            return Response({"detail": "job_ids must be a comma separated list of job ids."}, status=400)
+        job_ids = list(dict.fromkeys(job_ids))
+        if len(job_ids) > eligibility.ELIGIBILITY_BATCH_MAX_JOBS:
             return Response({
-                "can_apply": True,
-                "freeze_status": student.freeze_status
-            })
+                "detail": f"At most {eligibility.ELIGIBILITY_BATCH_MAX_JOBS} jobs can be checked at once."
+            }, status=400)
+
+        try:
+            student = request.user.student_profile
+        except AttributeError:
+            return Response({
+                "detail": "User does not have a student profile. Please complete your student profile first."
+            }, status=400)
+
+        try:
+            results = eligibility.evaluate_jobs(student, job_ids)
         except Exception as e:
             return Response({"detail": f"Error checking eligibility: {str(e)}"}, status=500)
 
+        return Response({
+            "results": {str(job_id): result for job_id, result in results.items()},
+            "not_found": [job_id for job_id in job_ids if job_id not in results],
+        })
+
 
 class EnhancedJobApplicationCreateView(generics.CreateAPIView):
     """Enhanced job application create view"""
@@ -722,10 +591,8 @@ class EnhancedJobApplicationCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        import os
-        from django.core.files.storage import default_storage
-        from django.core.files.base import ContentFile
-        
+        import json
+
         # Get job with proper error handling
         try:
             job = JobPosting.objects.get(id=self.kwargs['job_id'])
@@ -742,12 +609,6 @@ class EnhancedJobApplicationCreateView(generics.CreateAPIView):
                 "user": "User does not have a student profile. Please complete your profile first."
             })
 
-        # Check if user has already applied to this job
-        if JobApplication.objects.filter(job=job, applicant=self.request.user).exists():
-            raise serializers.ValidationError({
-                "application": "You have already applied to this job."
-            })
-
         # Check freeze restrictions
         if student.freeze_status == 'complete':
             raise serializers.ValidationError({
@@ -763,51 +624,30 @@ class EnhancedJobApplicationCreateView(generics.CreateAPIView):
                 })
 
         uploaded_resume = self.request.FILES.get("resume", None)
-        profile_resume = student.resume
-        
-        # Get resume_id from request if provided
-        resume_id = self.request.data.get('resume_id')
-
-        # Check for resumes in the new Resume model
-        student_resumes = student.resumes.all()
-        primary_resume = student.resumes.filter(is_primary=True).first()
-        latest_resume = student_resumes.first() if student_resumes.exists() else None
-        
-        # If resume_id is provided, try to get that specific resume
-        selected_resume = None
-        if resume_id:
-            try:
-                from accounts.models import Resume
-                selected_resume = Resume.objects.filter(
-                    id=resume_id,
-                    student=student
-                ).first()
-                if selected_resume:
-                    print(f"✅ Selected resume by ID {resume_id}: {selected_resume.name} (file: {selected_resume.file.name})")
-                else:
-                    print(f"⚠️ Resume ID {resume_id} not found for student {student.student_id}")
-            except (ValueError, TypeError) as e:
-                print(f"⚠️ Error parsing resume_id: {e}")
 
-        if not uploaded_resume and not profile_resume and not student_resumes.exists():
-            raise serializers.ValidationError({
-                "resume": "A resume must be uploaded or present in the student profile."
-            })
-
-        # Priority: uploaded_resume > selected_resume > primary_resume > latest_resume > profile_resume
-        final_resume = uploaded_resume if uploaded_resume else (
-            selected_resume.file if selected_resume else (
-                primary_resume.file if primary_resume else (
-                    latest_resume.file if latest_resume else (
-                        profile_resume if profile_resume else None
-                    )
-                )
+        # Resume to attach, in order of priority: uploaded > selected by
+        # resume_id > primary > latest > profile resume. An uploaded resume
+        # is stored once the application is committed.
+        existing_resume = None
+        if not uploaded_resume:
+            resumes = list(student.resumes.all())  # primary first, then newest
+            resume_id = self.request.data.get('resume_id')
+            selected_resume = next(
+                (resume for resume in resumes if resume_id and str(resume.id) == str(resume_id)), None
             )
-        )
-        
-        # Process additional fields and handle file uploads
+            if selected_resume:
+                existing_resume = selected_resume.file
+            elif resumes:
+                existing_resume = resumes[0].file
+            elif student.resume:
+                existing_resume = student.resume
+            else:
+                raise serializers.ValidationError({
+                    "resume": "A resume must be uploaded or present in the student profile."
+                })
+
+        # Process additional fields; uploaded files are stored after commit
         additional_fields = {}
-        uploaded_file_urls = {}
 
         # Get additional field responses from serializer data
         additional_field_responses = self.request.data.get('additional_field_responses', {})
@@ -817,72 +657,43 @@ class EnhancedJobApplicationCreateView(generics.CreateAPIView):
         # Handle regular form data (for backward compatibility)
         for key, value in self.request.data.items():
             # Exclude system fields that shouldn't go into custom_responses
-            if key not in ['cover_letter', 'job', 'resume', 'resume_id', 'additional_field_responses']:
-                # Try to parse JSON for complex fields
-                try:
-                    import json
-                    if isinstance(value, str) and (value.startswith('{') or value.startswith('[')):
-                        additional_fields[key] = json.loads(value)
-                    else:
-                        additional_fields[key] = value
-                except (json.JSONDecodeError, ValueError):
+            if key in ['cover_letter', 'job', 'resume', 'resume_id', 'additional_field_responses'] or key in self.request.FILES:
+                continue
+            # Try to parse JSON for complex fields
+            try:
+                if isinstance(value, str) and (value.startswith('{') or value.startswith('[')):
+                    additional_fields[key] = json.loads(value)
+                else:
                     additional_fields[key] = value
-        
-        # Handle file uploads
-        for key, file in self.request.FILES.items():
-            if key != 'resume':  # Skip the main resume field
-                # Create a safe filename
-                import uuid
-                from django.utils.text import slugify
-                timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-                safe_filename = f"{timestamp}_{slugify(file.name[:50])}"
-                
-                # Save file locally
-                file_path = f"application_files/{student.student_id}/{safe_filename}"
-                file_url = default_storage.save(file_path, ContentFile(file.read()))
-                
-                # Store file URL in additional fields
-                uploaded_file_urls[key] = f"/media/{file_url}"
-                additional_fields[key] = f"/media/{file_url}"
-        
-        # Create enhanced snapshot using utility function
-        snapshot = create_enhanced_application_snapshot(
-            student_profile=student,
-            custom_responses=additional_fields,
-            request=self.request
-        )
-        
-        # Add uploaded file URLs to the documents section
-        if uploaded_file_urls:
-            if 'documents' not in snapshot:
-                snapshot['documents'] = {}
-            snapshot['documents'].update(uploaded_file_urls)
-
-        # Determine which resume file to save to application.resume field
-        # This is the resume that will be shown in candidate details
-        resume_to_save = None
-        resume_source = None
-        if uploaded_resume:
-            # User uploaded a new resume file
-            resume_to_save = uploaded_resume
-            resume_source = "uploaded"
-        elif selected_resume:
-            # User selected an existing resume by ID
-            resume_to_save = selected_resume.file
-            resume_source = f"selected (ID: {resume_id}, name: {selected_resume.name})"
-        elif final_resume:
-            # Fallback to the resume we determined earlier
-            resume_to_save = final_resume
-            resume_source = "fallback"
-        
-        print(f"💾 Saving application with resume from: {resume_source}")
-        print(f"   Resume file path: {resume_to_save.name if resume_to_save else 'None'}")
+            except (json.JSONDecodeError, ValueError):
+                additional_fields[key] = value
 
-        serializer.save(
-            job=job,
-            applicant=self.request.user,
-            resume=resume_to_save,
-            applied_data_snapshot=snapshot
+        custom_files = [
+            applications.read_upload(key, file)
+            for key, file in self.request.FILES.items()
+            if key != 'resume'  # Skip the main resume field
+        ]
+        submission = applications.submission_metadata(self.request)
+
+        # The (job, applicant) unique constraint rejects a second application
+        try:
+            application = applications.insert_application(
+                serializer,
+                job=job,
+                applicant=self.request.user,
+                resume=existing_resume,
+                applied_data_snapshot=applications.pending_snapshot(additional_fields, submission)
+            )
+        except applications.AlreadyApplied:
+            raise serializers.ValidationError({
+                "application": "You have already applied to this job."
+            })
+
+        applications.finalize_after_commit(
+            application.pk,
+            resume_file=applications.read_upload('resume', uploaded_resume) if uploaded_resume else None,
+            custom_files=custom_files,
+            submission=submission
         )
 
 
@@ -1376,11 +1187,7 @@ class AdminJobListView(generics.ListAPIView):
         if stipend_max:
             queryset = queryset.filter(stipend__lte=stipend_max)
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search) |
-                Q(company__name__icontains=search)
-            )
+            queryset = job_search.search_jobs(queryset, search)
         if is_published is not None:
             queryset = queryset.filter(is_published=is_published.lower() == 'true')
         if deadline:
@@ -1438,7 +1245,7 @@ class EnhancedApplicationsListView(generics.ListAPIView):
 
     def get_queryset(self):
         queryset = JobApplication.objects.select_related(
-            'job', 'job__company', 'applicant__student_profile'
+            'job', 'job__company', 'applicant__student_profile', 'profile_snapshot', 'documents_snapshot'
         ).filter(is_deleted=False)
         
         # Apply filters
@@ -1535,7 +1342,7 @@ class ApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = DetailedJobApplicationSerializer
     permission_classes = [permissions.IsAdminUser]
     queryset = JobApplication.objects.select_related(
-        'job', 'job__company', 'applicant__student_profile'
+        'job', 'job__company', 'applicant__student_profile', 'profile_snapshot', 'documents_snapshot'
     )
 
     def perform_update(self, serializer):
@@ -1572,6 +1379,12 @@ class ApplicationExportView(APIView):
         return Response(columns)
 
     def post(self, request):
+        """
+        Stream CSV and small spreadsheet exports directly. PDFs and
+        spreadsheets of more than EXPORT_INLINE_MAX_ROWS rows are generated
+        by a background job instead: the response is the job (202 while it
+        runs), to be polled until it has a download_url.
+        """
         serializer = ExportConfigSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
@@ -1579,6 +1392,11 @@ class ApplicationExportView(APIView):
         
         # Get filtered queryset
         queryset = self.get_export_queryset(config)
+
+        if config['format'] == 'pdf' or (
+            config['format'] == 'xlsx' and queryset.count() > EXPORT_INLINE_MAX_ROWS
+        ):
+            return export_job_response(*request_export(config['format'], config, request.user))
         
         # Generate export
         export_service = ApplicationExportService()
@@ -1589,33 +1407,61 @@ class ApplicationExportView(APIView):
             job_id=config.get('job_id')
         )
         
-        response = HttpResponse(
-            file_data['content'],
-            content_type=file_data['content_type']
-        )
-        response['Content-Disposition'] = f'attachment; filename="{file_data["filename"]}"'
-        
-        return response
+        return export_response(file_data)
 
     def get_export_queryset(self, config):
         """Get filtered queryset for export"""
-        queryset = JobApplication.objects.select_related(
-            'job', 'job__company', 'applicant__student_profile'
-        ).filter(is_deleted=False)
-        
-        if config.get('job_id'):
-            queryset = queryset.filter(job_id=config['job_id'])
-        
-        if config.get('status'):
-            queryset = queryset.filter(status__in=config['status'])
-        
-        if config.get('date_from'):
-            queryset = queryset.filter(applied_at__gte=config['date_from'])
-        
-        if config.get('date_to'):
-            queryset = queryset.filter(applied_at__lte=config['date_to'])
-        
-        return queryset
+        return ApplicationExportService().get_queryset(config)
+
+
+def export_job_response(job, created):
+    """Job status response; reused tells whether an existing export was returned"""
+    data = ExportJobSerializer(job).data
+    data['reused'] = not created
+    return Response(data, status=status.HTTP_200_OK if job.status == 'COMPLETED' else status.HTTP_202_ACCEPTED)
+
+
+class ExportJobListCreateView(APIView):
+    """Queue background exports and list the current user's recent ones"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        jobs = ExportJob.objects.filter(requested_by=request.user)[:20]
+        return Response({'data': ExportJobSerializer(jobs, many=True).data})
+
+    def post(self, request):
+        serializer = ExportConfigSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        config = serializer.validated_data
+        return export_job_response(*request_export(config['format'], config, request.user))
+
+
+class ExportJobDetailView(generics.RetrieveAPIView):
+    """Progress of a background export"""
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = ExportJobSerializer
+    queryset = ExportJob.objects.all()
+
+
+class ExportJobDownloadView(APIView):
+    """Download the file of a completed background export"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, pk):
+        job = get_object_or_404(ExportJob, pk=pk)
+        if job.status != 'COMPLETED':
+            return Response(
+                {"error": f"Export is {job.get_status_display().lower()}", "status": job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+        if not job.file or not job.file.storage.exists(job.file.name):
+            return Response(
+                {"error": "Export file has expired; request the export again"},
+                status=status.HTTP_410_GONE
+            )
+        return FileResponse(
+            job.file.open('rb'), as_attachment=True, filename=job.filename, content_type=job.content_type
+        )
 
 
 class StudentProfileFieldsView(APIView):
@@ -1629,13 +1475,18 @@ class StudentProfileFieldsView(APIView):
 
 
 class BulkApplicationUpdateView(APIView):
-    """Bulk update applications"""
+    """
+    Bulk update applications. Status updates are applied set-based
+    (jobs.bulk.change_status); with dry_run nothing is written and the
+    response says how many applications would change.
+    """
     permission_classes = [permissions.IsAdminUser]
 
     def post(self, request):
         application_ids = request.data.get('application_ids', [])
         action = request.data.get('action')
         value = request.data.get('value')
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
         
         if not application_ids or not action:
             return Response(
@@ -1651,22 +1502,35 @@ class BulkApplicationUpdateView(APIView):
         updated_count = 0
         
         if action == 'status_update':
-            for application in queryset:
-                if application.status != value:
-                    application.add_status_change(
-                        new_status=value,
-                        changed_by=request.user,
-                        notes=f"Bulk update by {request.user.email}"
-                    )
-                    application.save()
-                    updated_count += 1
+            if value not in bulk.STATUS_CHOICES:
+                return Response(
+                    {'error': f'Invalid status: {value}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            if dry_run:
+                by_status = bulk.status_change_preview(queryset, value)
+                return Response({
+                    'dry_run': True,
+                    'updated_count': sum(by_status.values()),
+                    'by_status': by_status,
+                })
+
+            updated_count = bulk.change_status(
+                queryset,
+                value,
+                changed_by=request.user,
+                notes=f"Bulk update by {request.user.email}"
+            )
         
         elif action == 'delete':
-            queryset.update(
+            if dry_run:
+                return Response({'dry_run': True, 'updated_count': queryset.count()})
+
+            updated_count = queryset.update(
                 is_deleted=True,
                 deleted_at=timezone.now()
             )
-            updated_count = queryset.count()
         
         return Response({
             'message': f'Successfully updated {updated_count} applications',
@@ -1713,122 +1577,53 @@ class CalendarEventsView(APIView):
 
             events = []
 
-            # 1. Application deadlines from job postings
-            job_postings = JobPosting.objects.filter(
-                application_deadline__gte=start_date,
-                application_deadline__lte=end_date,
-                is_active=True
-            ).exclude(application_deadline__isnull=True).select_related('company')
-            
-            # Filter by passout year and branch if specified (in Python since SQLite doesn't support JSON array operations)
-            if (passout_year_param and passout_year_param != 'All') or branch_param:
-                filtered_jobs = []
-                for job in job_postings:
-                    # Check passout year eligibility
-                    passout_eligible = True
-                    if passout_year_param and passout_year_param != 'All':
-                        try:
-                            passout_year = int(passout_year_param)
-                            allowed_years = job.allowed_passout_years or []
-                            if allowed_years and passout_year not in allowed_years:
-                                passout_eligible = False
-                        except (ValueError, TypeError):
-                            passout_eligible = False
-                    
-                    # Check branch eligibility
-                    branch_eligible = True
-                    if branch_param:
-                        allowed_departments = job.allowed_departments or []
-                        if allowed_departments and branch_param not in allowed_departments:
-                            branch_eligible = False
-                    
-                    if passout_eligible and branch_eligible:
-                        filtered_jobs.append(job)
-                job_postings = filtered_jobs
-            else:
-                # When no specific filters are selected, filter out jobs that only allow inactive years
-                active_years = set(YearManagement.get_active_years())
-                filtered_jobs = []
-                for job in job_postings:
-                    allowed_years = job.allowed_passout_years or []
-                    if not allowed_years or any(year in active_years for year in allowed_years):
-                        filtered_jobs.append(job)
-                job_postings = filtered_jobs
-
-            for job in job_postings:
+            # 1./2. Application deadlines and interview rounds, read from the
+            # calendar event rows maintained by jobs.calendar_events
+            passout_year = None
+            active_years = None
+            cohort_valid = True
+            if passout_year_param and passout_year_param != 'All':
                 try:
-                    events.append({
-                        'id': f'job_deadline_{job.id}',
-                        'title': f'Application Deadline: {job.title}',
-                        'type': 'APPLICATION_DEADLINE',
-                        'date': job.application_deadline.isoformat(),
-                        'time': '23:59',  # End of day
-                        'company': job.company.name if job.company else 'Unknown Company',
-                        'description': f'Application deadline for {job.title} at {job.company.name if job.company else "Unknown Company"}',
-                        'status': 'upcoming' if job.application_deadline > today else 'past',
-                        'priority': 'high',
-                        'color': '#ef4444',  # Red for deadlines
-                        'location': job.location or 'TBD',
-                        'job_id': job.id,
-                        'company_id': job.company.id if job.company else None
-                    })
-                except Exception as e:
-                    print(f"Error processing job deadline for job {job.id}: {str(e)}")
-                    continue
+                    passout_year = int(passout_year_param)
+                except (ValueError, TypeError):
+                    cohort_valid = False
+            elif not branch_param:
+                # When no specific filters are selected, leave out jobs that only allow inactive years
+                active_years = YearManagement.get_active_years()
 
-            # 2. Interview rounds from job postings
-            for job in job_postings:
-                if job.interview_rounds and isinstance(job.interview_rounds, list):
-                    for round_info in job.interview_rounds:
-                        if isinstance(round_info, dict) and 'date' in round_info and 'time' in round_info:
-                            try:
-                                round_date = datetime.strptime(round_info['date'], '%Y-%m-%d').date()
-                                if start_date <= round_date <= end_date:
-                                    events.append({
-                                        'id': f'interview_{job.id}_{round_info.get("name", "round")}',
-                                        'title': f'Interview: {round_info.get("name", "Round")} - {job.title}',
-                                        'type': 'INTERVIEW',
-                                        'date': round_date.isoformat(),
-                                        'time': round_info.get('time', '09:00'),
-                                        'company': job.company.name if job.company else 'Unknown Company',
-                                        'description': f'Interview round for {job.title} at {job.company.name if job.company else "Unknown Company"}',
-                                        'status': 'upcoming' if round_date > today else ('ongoing' if round_date == today else 'past'),
-                                        'priority': 'high',
-                                        'color': '#f59e0b',  # Orange for interviews
-                                        'location': job.location or 'TBD',
-                                        'job_id': job.id,
-                                        'company_id': job.company.id if job.company else None,
-                                        'round_name': round_info.get('name', 'Interview Round')
-                                    })
-                            except (ValueError, KeyError, TypeError) as e:
-                                print(f"Error processing interview round for job {job.id}: {str(e)}")
-                                continue
+            if cohort_valid:
+                job_events = calendar_events.events_between(
+                    start_date, end_date,
+                    passout_year=passout_year, branch=branch_param, active_years=active_years
+                )
+                events.extend(calendar_events.event_payload(event, today) for event in job_events)
 
             # 3. Recent applications and status changes (last 30 days)
             recent_applications = JobApplication.objects.filter(
-                applied_at__gte=timezone.now() - timedelta(days=30)
-            ).select_related('job', 'applicant').prefetch_related('job__company')
+                applied_at__gte=timezone.now() - timedelta(days=30),
+                applied_at__date__gte=start_date,
+                applied_at__date__lte=end_date,
+            ).select_related('job__company', 'applicant')
 
             for app in recent_applications:
                 try:
                     event_date = app.applied_at.date()
-                    if start_date <= event_date <= end_date:
-                        events.append({
-                            'id': f'application_{app.id}',
-                            'title': f'New Application: {app.job.title}',
-                            'type': 'APPLICATION_SUBMITTED',
-                            'date': event_date.isoformat(),
-                            'time': app.applied_at.strftime('%H:%M'),
-                            'company': app.job.company.name if app.job.company else 'Unknown Company',
-                            'description': f'New application submitted for {app.job.title}',
-                            'status': 'completed',
-                            'priority': 'medium',
-                            'color': '#10b981',  # Green for applications
-                            'location': 'Online',
-                            'job_id': app.job.id,
-                            'company_id': app.job.company.id if app.job.company else None,
-                            'applicant_name': f"{app.applicant.first_name or ''} {app.applicant.last_name or ''}".strip() or app.applicant.username
-                        })
+                    events.append({
+                        'id': f'application_{app.id}',
+                        'title': f'New Application: {app.job.title}',
+                        'type': 'APPLICATION_SUBMITTED',
+                        'date': event_date.isoformat(),
+                        'time': app.applied_at.strftime('%H:%M'),
+                        'company': app.job.company.name if app.job.company else 'Unknown Company',
+                        'description': f'New application submitted for {app.job.title}',
+                        'status': 'completed',
+                        'priority': 'medium',
+                        'color': '#10b981',  # Green for applications
+                        'location': 'Online',
+                        'job_id': app.job.id,
+                        'company_id': app.job.company.id if app.job.company else None,
+                        'applicant_name': f"{app.applicant.first_name or ''} {app.applicant.last_name or ''}".strip() or app.applicant.username
+                    })
                 except Exception as e:
                     print(f"Error processing application {app.id}: {str(e)}")
                     continue
@@ -1876,169 +1671,91 @@ class CalendarEventsView(APIView):
             return Response({'error': str(e)}, status=500)
 
 
-class PlacedStudentsView(generics.ListAPIView):
-    """View for listing placed students with pagination, search, and sorting"""
-    permission_classes = [permissions.IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
 
-    def get_queryset(self):
-        # Get all hired applications with related data
-        hired_applications = JobApplication.objects.filter(
-            status='HIRED'
-        ).select_related(
-            'applicant__student_profile',
-            'job__company'
-        )
+class CalendarFeedLinkView(APIView):
+    """
+    Subscription URL of the ICS calendar feed for a cohort
+    (passout_year and/or branch, both optional)
+    """
+    permission_classes = [IsAuthenticated]
 
-        # Get students with placement_status = 'placed'
-        from accounts.models import StudentProfile
-        placed_students = StudentProfile.objects.filter(
-            placement_status='placed'
-        ).select_related('user')
+    def get(self, request):
+        passout_year_param = request.query_params.get('passout_year')
+        branch = request.query_params.get('branch') or None
 
-        # Combine the querysets - we'll handle this in the list method
-        # For now, return the hired applications queryset for compatibility
-        return hired_applications.order_by('-applied_at')
+        passout_year = None
+        if passout_year_param and passout_year_param != 'All':
+            try:
+                passout_year = int(passout_year_param)
+            except (ValueError, TypeError):
+                return Response({'error': 'passout_year must be a year'}, status=status.HTTP_400_BAD_REQUEST)
 
-    def list(self, request, *args, **kwargs):
-        # Get all placed students from both sources
-        placed_students_data = []
-
-        # 1. Get students from JobApplication with status 'HIRED'
-        hired_applications = JobApplication.objects.filter(
-            status='HIRED'
-        ).select_related(
-            'applicant__student_profile',
-            'job__company'
-        )
+        token = calendar_events.feed_token(passout_year, branch)
+        return Response({
+            'url': request.build_absolute_uri(reverse('calendar-feed', args=[token])),
+            'passout_year': passout_year,
+            'branch': branch,
+        })
 
-        for application in hired_applications:
-            student_profile = application.applicant.student_profile
-            job = application.job
-            company = job.company
-
-            placed_students_data.append({
-                'student_id': student_profile.student_id,
-                'name': f"{student_profile.first_name} {student_profile.last_name}".strip(),
-                'email': student_profile.contact_email or student_profile.user.email,
-                'branch': student_profile.branch or '',
-                'passout_year': student_profile.passout_year,
-                'gpa': student_profile.gpa,
-                'job_title': job.title,
-                'company_name': company.name,
-                'job_location': job.location,
-                'salary_min': job.salary_min,
-                'salary_max': job.salary_max,
-                'placed_at': application.applied_at,
-                'job_id': job.id,
-                'source': 'application'  # Track the source
-            })
 
-        # 2. Get students from StudentProfile with placement_status = 'placed'
-        from accounts.models import StudentProfile
-        placed_profiles = StudentProfile.objects.filter(
-            placement_status='placed'
-        ).select_related('user')
+class CalendarFeedView(APIView):
+    """
+    ICS feed of application deadlines and interview rounds for the cohort
+    signed into the token. Calendar clients cannot send credentials, so
+    the signed token is the only access check.
+    """
+    permission_classes = []
+    authentication_classes = []
 
-        for profile in placed_profiles:
-            # Try to get job information from placed_job_id
-            job_info = None
-            if profile.placed_job_id:
-                try:
-                    job = JobPosting.objects.select_related('company').get(id=profile.placed_job_id)
-                    job_info = {
-                        'job_title': job.title,
-                        'company_name': job.company.name if job.company else 'Unknown Company',
-                        'job_location': job.location,
-                        'salary_min': job.salary_min,
-                        'salary_max': job.salary_max,
-                        'job_id': job.id
-                    }
-                except JobPosting.DoesNotExist:
-                    job_info = {
-                        'job_title': 'Job Not Found',
-                        'company_name': 'Unknown Company',
-                        'job_location': '',
-                        'salary_min': None,
-                        'salary_max': None,
-                        'job_id': profile.placed_job_id
-                    }
-
-            placed_students_data.append({
-                'student_id': profile.student_id,
-                'name': f"{profile.first_name} {profile.last_name}".strip(),
-                'email': profile.contact_email or profile.user.email,
-                'branch': profile.branch or '',
-                'passout_year': profile.passout_year,
-                'gpa': profile.gpa,
-                'job_title': job_info['job_title'] if job_info else 'Not Specified',
-                'company_name': job_info['company_name'] if job_info else 'Not Specified',
-                'job_location': job_info['job_location'] if job_info else '',
-                'salary_min': job_info['salary_min'] if job_info else None,
-                'salary_max': job_info['salary_max'] if job_info else None,
-                'placed_at': profile.updated_at,  # Use updated_at as placement date
-                'job_id': job_info['job_id'] if job_info else None,
-                'source': 'manual'  # Track the source
-            })
+    def get(self, request, token):
+        try:
+            passout_year, branch = calendar_events.read_feed_token(token)
+        except (signing.BadSignature, ValueError, TypeError):
+            return Response({'error': 'Invalid calendar link'}, status=status.HTTP_404_NOT_FOUND)
 
-        # Remove duplicates based on student_id (prefer application source over manual)
-        seen_student_ids = set()
-        unique_students = []
-        for student in placed_students_data:
-            if student['student_id'] not in seen_student_ids:
-                seen_student_ids.add(student['student_id'])
-                unique_students.append(student)
-            elif student['source'] == 'application':
-                # Replace manual entry with application entry
-                for i, existing in enumerate(unique_students):
-                    if existing['student_id'] == student['student_id']:
-                        unique_students[i] = student
-                        break
-
-        # Apply search filter
-        search_term = self.request.query_params.get('search', '').strip()
-        if search_term:
-            unique_students = [
-                student for student in unique_students
-                if (
-                    search_term.lower() in student['name'].lower() or
-                    search_term.lower() in student['student_id'].lower() or
-                    search_term.lower() in student['job_title'].lower() or
-                    search_term.lower() in student['company_name'].lower()
-                )
-            ]
+        body, etag = calendar_events.ics_feed(passout_year, branch)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+            response['Content-Disposition'] = 'inline; filename="placements.ics"'
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=calendar_events.ICS_CACHE_SECONDS)
+        return response
 
-        # Apply passout_year filter
-        passout_year = self.request.query_params.get('passout_year')
-        if passout_year and passout_year != 'all':
-            try:
-                year = int(passout_year)
-                unique_students = [
-                    student for student in unique_students
-                    if student['passout_year'] == year
-                ]
-            except (ValueError, TypeError):
-                pass
+def placed_students_filters(query_params):
+    """placements.placed_students() arguments from placed students query parameters"""
+    def as_int(value):
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return None
+
+    passout_year = query_params.get('passout_year')
+    return {
+        'search': query_params.get('search', '').strip(),
+        'passout_year': as_int(passout_year) if passout_year and passout_year != 'all' else None,
+        'branch': query_params.get('branch', '').strip() or None,
+        'company_id': as_int(query_params.get('company_id')),
+        'sort_by': query_params.get('sort_by', 'placed_at'),
+        'sort_order': query_params.get('sort_order', 'desc'),
+    }
 
-        # Apply sorting
-        sort_by = self.request.query_params.get('sort_by', 'placed_at')
-        sort_order = self.request.query_params.get('sort_order', 'desc')
-
-        sort_functions = {
-            'name': lambda x: x['name'].lower(),
-            'student_id': lambda x: x['student_id'].lower(),
-            'passout_year': lambda x: x['passout_year'] or 0,
-            'company_name': lambda x: x['company_name'].lower(),
-            'placed_at': lambda x: x['placed_at'] or timezone.now(),
-            'job_title': lambda x: x['job_title'].lower()
-        }
 
-        if sort_by in sort_functions:
-            reverse = sort_order == 'desc'
-            unique_students.sort(key=sort_functions[sort_by], reverse=reverse)
+class PlacedStudentsView(generics.ListAPIView):
+    """View for listing placed students with pagination, search, and sorting"""
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardResultsSetPagination
+
+    def get_queryset(self):
+        # Hired applications and manually placed profiles, merged in the
+        # Placement read model (jobs.placements)
+        return placements.placed_students(**placed_students_filters(self.request.query_params))
 
-        # Apply pagination
-        page = self.paginate_queryset(unique_students)
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+
+        page = self.paginate_queryset(queryset)
         if page is not None:
             # Use corrected pagination calculation
             pagination_data = get_correct_pagination_data(
@@ -2049,12 +1766,12 @@ class PlacedStudentsView(generics.ListAPIView):
             )
 
             return Response({
-                'data': page,
+                'data': [placements.as_dict(placement) for placement in page],
                 'pagination': pagination_data
             })
 
         # Handle non-paginated case
-        return Response({'data': unique_students})
+        return Response({'data': [placements.as_dict(placement) for placement in queryset]})
 
 
 class PlacedStudentsPassoutYearsView(APIView):
@@ -2063,262 +1780,51 @@ class PlacedStudentsPassoutYearsView(APIView):
 
     def get(self, request):
         """Get distinct passout years for filtering"""
-        years = set()
-
-        # Get years from JobApplication with status 'HIRED'
-        hired_years = JobApplication.objects.filter(
-            status='HIRED'
-        ).select_related('applicant__student_profile').values_list(
-            'applicant__student_profile__passout_year', flat=True
-        ).distinct()
-
-        years.update(hired_years)
-
-        # Get years from StudentProfile with placement_status = 'placed'
-        from accounts.models import StudentProfile
-        manual_years = StudentProfile.objects.filter(
-            placement_status='placed'
-        ).values_list('passout_year', flat=True).distinct()
-
-        years.update(manual_years)
-
-        # Filter out None values and return as sorted list
-        valid_years = sorted([year for year in years if year is not None], reverse=True)
-        return Response({'years': valid_years})
-
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        page = self.paginate_queryset(queryset)
-
-        if page is not None:
-            # Transform the data for serialization
-            placed_students_data = []
-            for application in page:
-                student_profile = application.applicant.student_profile
-                job = application.job
-                company = job.company
-
-                placed_students_data.append({
-                    'student_id': student_profile.student_id,
-                    'name': f"{student_profile.first_name} {student_profile.last_name}".strip(),
-                    'email': student_profile.contact_email or student_profile.user.email,
-                    'branch': student_profile.branch or '',
-                    'passout_year': student_profile.passout_year,
-                    'gpa': student_profile.gpa,
-                    'job_title': job.title,
-                    'company_name': company.name,
-                    'job_location': job.location,
-                    'salary_min': job.salary_min,
-                    'salary_max': job.salary_max,
-                    'placed_at': application.applied_at,
-                    'job_id': job.id
-                })
-
-            # Use corrected pagination calculation
-            pagination_data = get_correct_pagination_data(
-                request,
-                self.paginator.page.paginator,
-                self.paginator.page,
-                self.pagination_class.page_size
-            )
-
-            return Response({
-                'data': placed_students_data,
-                'pagination': pagination_data
-            })
-
-        # Handle non-paginated case
-        placed_students_data = []
-        for application in queryset:
-            student_profile = application.applicant.student_profile
-            job = application.job
-            company = job.company
-
-            placed_students_data.append({
-                'student_id': student_profile.student_id,
-                'name': f"{student_profile.first_name} {student_profile.last_name}".strip(),
-                'email': student_profile.contact_email or student_profile.user.email,
-                'branch': student_profile.branch or '',
-                'passout_year': student_profile.passout_year,
-                'gpa': student_profile.gpa,
-                'job_title': job.title,
-                'company_name': company.name,
-                'job_location': job.location,
-                'salary_min': job.salary_min,
-                'salary_max': job.salary_max,
-                'placed_at': application.applied_at,
-                'job_id': job.id
-            })
-
-        return Response({'data': placed_students_data})
+        return Response({'years': placements.passout_years()})
 
 
 class PlacedStudentsExportView(generics.ListAPIView):
     """View for exporting placed students data to CSV"""
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        # Get all hired applications with related data (no pagination for export)
-        queryset = JobApplication.objects.filter(
-            status='HIRED'
-        ).select_related(
-            'applicant__student_profile',
-            'job__company'
-        ).order_by('-applied_at')
-
-        # Apply search filter
-        search_term = self.request.query_params.get('search', '').strip()
-        if search_term:
-            queryset = queryset.filter(
-                Q(applicant__student_profile__first_name__icontains=search_term) |
-                Q(applicant__student_profile__last_name__icontains=search_term) |
-                Q(applicant__student_profile__student_id__icontains=search_term) |
-                Q(job__title__icontains=search_term) |
-                Q(job__company__name__icontains=search_term)
-            )
-
-        # Apply passout_year filter
-        passout_year = self.request.query_params.get('passout_year')
-        if passout_year and passout_year != 'all':
-            try:
-                year = int(passout_year)
-                queryset = queryset.filter(applicant__student_profile__passout_year=year)
-            except (ValueError, TypeError):
-                pass  # Ignore invalid year values
-
-        # Apply sorting
-        sort_by = self.request.query_params.get('sort_by', 'placed_at')
-        sort_order = self.request.query_params.get('sort_order', 'desc')
-
-        sort_mapping = {
-            'name': 'applicant__student_profile__first_name',
-            'student_id': 'applicant__student_profile__student_id',
-            'passout_year': 'applicant__student_profile__passout_year',
-            'company_name': 'job__company__name',
-            'job_title': 'job__title'
-        }
-
-        if sort_by in sort_mapping:
-            field = sort_mapping[sort_by]
-            if sort_order == 'desc':
-                queryset = queryset.order_by(f'-{field}')
-            else:
-                queryset = queryset.order_by(field)
+    # Keys of placements.as_dict() -> CSV headers
+    EXPORT_COLUMNS = [
+        ('branch', 'Branch'),
+        ('company_name', 'Company_Name'),
+        ('email', 'Email'),
+        ('gpa', 'GPA'),
+        ('job_id', 'Job_ID'),
+        ('job_location', 'Job_Location'),
+        ('job_title', 'Job_Title'),
+        ('name', 'Name'),
+        ('passout_year', 'Passout_Year'),
+        ('placed_at', 'Placed_At'),
+        ('salary_max', 'Salary_Max'),
+        ('salary_min', 'Salary_Min'),
+        ('student_id', 'Student_ID'),
+        ('source', 'source'),
+    ]
 
-        return queryset
+    def get_queryset(self):
+        return placements.placed_students(**placed_students_filters(self.request.query_params))
+
+    def iter_rows(self, queryset):
+        for placement in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            student = placements.as_dict(placement)
+            if student['placed_at']:
+                student['placed_at'] = student['placed_at'].isoformat()
+            yield [
+                '' if student[key] is None else student[key]
+                for key, _ in self.EXPORT_COLUMNS
+            ]
 
     def list(self, request, *args, **kwargs):
-        # Get all placed students from both sources for export
-        placed_students_data = []
-
-       
-
-        # 1. Get students from JobApplication with status 'HIRED'
-        hired_applications = JobApplication.objects.filter(
-            status='HIRED'
-        ).select_related(
-            'applicant__student_profile',
-            'job__company'
-        )
-
-        for application in hired_applications:
-            student_profile = application.applicant.student_profile
-            job = application.job
-            company = job.company
-
-            placed_students_data.append({
-                'Student_ID': student_profile.student_id,
-                'Name': f"{student_profile.first_name} {student_profile.last_name}".strip(),
-                'Email': student_profile.contact_email or student_profile.user.email,
-                'Branch': student_profile.branch or '',
-                'Passout_Year': student_profile.passout_year,
-                'GPA': student_profile.gpa,
-                'Job_Title': job.title,
-                'Company_Name': company.name,
-                'Job_Location': job.location,
-                'Salary_Min': job.salary_min,
-                'Salary_Max': job.salary_max,
-                'Placed_At': application.applied_at.isoformat() if application.applied_at else '',
-                'Job_ID': job.id,
-                'source': 'application'
-            })
-
-        # 2. Get students from StudentProfile with placement_status = 'placed'
-        from accounts.models import StudentProfile
-        placed_profiles = StudentProfile.objects.filter(
-            placement_status='placed'
-        ).select_related('user')
-
-        for profile in placed_profiles:
-            # Try to get job information from placed_job_id
-            job_info = None
-            if profile.placed_job_id:
-                try:
-                    job = JobPosting.objects.select_related('company').get(id=profile.placed_job_id)
-                    job_info = {
-                        'job_title': job.title,
-                        'company_name': job.company.name if job.company else 'Unknown Company',
-                        'job_location': job.location,
-                        'salary_min': job.salary_min,
-                        'salary_max': job.salary_max,
-                        'job_id': job.id
-                    }
-                except JobPosting.DoesNotExist:
-                    job_info = {
-                        'job_title': 'Job Not Found',
-                        'company_name': 'Unknown Company',
-                        'job_location': '',
-                        'salary_min': None,
-                        'salary_max': None,
-                        'job_id': profile.placed_job_id
-                    }
-
-            placed_students_data.append({
-                'Student_ID': profile.student_id,
-                'Name': f"{profile.first_name} {profile.last_name}".strip(),
-                'Email': profile.contact_email or profile.user.email,
-                'Branch': profile.branch or '',
-                'Passout_Year': profile.passout_year,
-                'GPA': profile.gpa,
-                'Job_Title': job_info['job_title'] if job_info else 'Not Specified',
-                'Company_Name': job_info['company_name'] if job_info else 'Not Specified',
-                'Job_Location': job_info['job_location'] if job_info else '',
-                'Salary_Min': job_info['salary_min'] if job_info else None,
-                'Salary_Max': job_info['salary_max'] if job_info else None,
-                'Placed_At': profile.updated_at.isoformat() if profile.updated_at else '',
-                'Job_ID': job_info['job_id'] if job_info else None,
-                'source': 'manual'
-            })
-
-        # Remove duplicates based on Student_ID (prefer application source over manual)
-        seen_student_ids = set()
-        unique_students = []
-        for student in placed_students_data:
-            if student['Student_ID'] not in seen_student_ids:
-                seen_student_ids.add(student['Student_ID'])
-                unique_students.append(student)
-            elif student['source'] == 'application':
-                # Replace manual entry with application entry
-                for i, existing in enumerate(unique_students):
-                    if existing['Student_ID'] == student['Student_ID']:
-                        unique_students[i] = student
-                        break
-
-        # Dynamically collect all unique fieldnames from the data
-        fieldnames = set()
-        for student in unique_students:
-            fieldnames.update(student.keys())
-        fieldnames = sorted(list(fieldnames))  # Sort for consistent order
-
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="placed_students_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-        
-        writer = csv.DictWriter(response, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(unique_students)
-        
-        return response
+        headers = [header for _, header in self.EXPORT_COLUMNS]
+        return export_response({
+            'content': iter_csv(headers, self.iter_rows(self.get_queryset())),
+            'content_type': 'text/csv',
+            'filename': f'placed_students_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv',
+        })
 
 
 class RecommendedJobsView(generics.ListAPIView):
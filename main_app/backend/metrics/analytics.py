@@ -0,0 +1,156 @@
+"""
+Vectorised GPA analytics over StudentProfile.
+
+The metric calculators used to materialise every profile just to call
+float(student.gpa), once per department or year. StudentGPAFrame pulls
+(branch, passout_year, gpa_numeric) in a single values_list query into
+NumPy arrays and derives every GPA-based figure (averages, extremes,
+high performers, performance tiers, range buckets and per-branch /
+per-year group-bys) from them. Missing GPAs are NaN.
+"""
+
+import numpy as np
+
+HIGH_PERFORMER_GPA = 8.5
+PLACEMENT_READY_GPA = 6.0
+
+# Lower bounds of the average / good / high performer tiers
+PERFORMANCE_TIER_EDGES = [6.0, 7.0, HIGH_PERFORMER_GPA]
+PERFORMANCE_TIERS = ['poor_performers', 'average_performers', 'good_performers', 'high_performers']
+
+# (lower bound, label) pairs, lowest first; values below the first bound go to 'Below 6.0'
+STUDENT_GPA_RANGES = [
+    (6.0, '6.0-6.9'), (7.0, '7.0-7.9'), (8.0, '8.0-8.9'), (9.0, '9.0+'),
+]
+ENHANCED_GPA_RANGES = [
+    (6.0, '6.0-6.4'), (6.5, '6.5-6.9'), (7.0, '7.0-7.4'), (7.5, '7.5-7.9'),
+    (8.0, '8.0-8.4'), (8.5, '8.5-8.9'), (9.0, '9.0+'),
+]
+BELOW_RANGE_LABEL = 'Below 6.0'
+
+MISSING_YEAR = -1
+
+
+class StudentGPAFrame:
+    """
+    Column arrays for a set of students: branch, passout_year and numeric GPA.
+    Filtering returns a new, smaller frame; the database is not queried again.
+    """
+
+    def __init__(self, branches, passout_years, gpas):
+        self.branches = branches
+        self.passout_years = passout_years
+        self.gpas = gpas
+        self.valid = ~np.isnan(gpas)
+
+    @classmethod
+    def from_queryset(cls, queryset):
+        rows = list(queryset.values_list('branch', 'passout_year', 'gpa_numeric'))
+        count = len(rows)
+
+        branches = np.array([row[0] or '' for row in rows], dtype=str)
+        passout_years = np.fromiter(
+            (MISSING_YEAR if row[1] is None else row[1] for row in rows),
+            dtype=np.int64, count=count
+        )
+        gpas = np.fromiter(
+            (np.nan if row[2] is None else row[2] for row in rows),
+            dtype=np.float64, count=count
+        )
+        return cls(branches, passout_years, gpas)
+
+    def __len__(self):
+        return len(self.gpas)
+
+    def filter(self, mask):
+        return StudentGPAFrame(self.branches[mask], self.passout_years[mask], self.gpas[mask])
+
+    def for_year(self, year):
+        return self.filter(self.passout_years == year)
+
+    def for_branch(self, branch):
+        return self.filter(self.branches == branch)
+
+    def count_at_least(self, threshold):
+        return int(np.count_nonzero(self.gpas[self.valid] >= threshold))
+
+    def summary(self):
+        """GPA statistics over the whole frame"""
+        return self._aggregate(np.zeros(len(self), dtype=np.int64), 1)[0]
+
+    def group_by(self, field):
+        """
+        GPA statistics per distinct 'branch' or 'passout_year', as a dict
+        keyed by the (plain Python) group value.
+        """
+        keys = self.branches if field == 'branch' else self.passout_years
+        if not len(keys):
+            return {}
+
+        uniques, inverse = np.unique(keys, return_inverse=True)
+        groups = self._aggregate(inverse, len(uniques))
+        return {key.item(): stats for key, stats in zip(uniques, groups)}
+
+    def distribution(self, ranges, include_empty=True):
+        """
+        Count valid GPAs per range, highest range first, in the
+        [{'gpa_range': label, 'count': n}, ...] shape the API returns.
+        """
+        edges = [lower for lower, _ in ranges]
+        labels = [BELOW_RANGE_LABEL] + [label for _, label in ranges]
+
+        buckets = np.searchsorted(edges, self.gpas[self.valid], side='right')
+        counts = np.bincount(buckets, minlength=len(labels))
+
+        distribution = [
+            {'gpa_range': label, 'count': int(count)}
+            for label, count in zip(reversed(labels), reversed(counts))
+        ]
+        if not include_empty:
+            distribution = [item for item in distribution if item['count'] > 0]
+        return distribution
+
+    def _aggregate(self, group_index, group_count):
+        valid_index = group_index[self.valid]
+        valid_gpas = self.gpas[self.valid]
+
+        totals = np.bincount(group_index, minlength=group_count)
+        gpa_counts = np.bincount(valid_index, minlength=group_count)
+        gpa_sums = np.bincount(valid_index, weights=valid_gpas, minlength=group_count)
+
+        tiers = np.searchsorted(PERFORMANCE_TIER_EDGES, valid_gpas, side='right')
+        tier_counts = np.zeros((group_count, len(PERFORMANCE_TIERS)), dtype=np.int64)
+        np.add.at(tier_counts, (valid_index, tiers), 1)
+
+        # Seeded like the old loops: max starts at 0, min at 10
+        max_gpas = np.zeros(group_count)
+        np.maximum.at(max_gpas, valid_index, valid_gpas)
+        min_gpas = np.full(group_count, 10.0)
+        np.minimum.at(min_gpas, valid_index, valid_gpas)
+
+        groups = []
+        for i in range(group_count):
+            gpa_count = int(gpa_counts[i])
+            stats = {
+                'total': int(totals[i]),
+                'gpa_count': gpa_count,
+                'avg_gpa': round(float(gpa_sums[i]) / gpa_count, 2) if gpa_count > 0 else 0,
+                'max_gpa': float(max_gpas[i]) if max_gpas[i] > 0 else 0,
+                'min_gpa': float(min_gpas[i]) if min_gpas[i] < 10 else 0,
+            }
+            for tier, count in zip(PERFORMANCE_TIERS, tier_counts[i]):
+                stats[tier] = int(count)
+            groups.append(stats)
+
+        return groups
+
+
+# Statistics for a group with no students, e.g. a branch with no GPA rows
+EMPTY_GPA_STATS = {
+    'total': 0,
+    'gpa_count': 0,
+    'avg_gpa': 0,
+    'max_gpa': 0,
+    'min_gpa': 0,
+    **{tier: 0 for tier in PERFORMANCE_TIERS},
+}
@@ -0,0 +1,370 @@
+"""
+Benchmark harness for the metric calculators and metrics API views.
+
+generate_dataset() fills an (empty, throwaway) database with a
+deterministic fixture at one of the SCALES; run_benchmarks() times every
+calculator in metrics/utils.py and every view in metrics/views.py against
+it, recording wall time, SQL query count and peak Python memory; and
+compare_reports() flags regressions against a stored baseline report.
+Driven by the benchmark_metrics management command.
+"""
+
+import gc
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import django
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# students, applications per student, jobs, companies
+SCALES = {
+    'smoke': (200, 3, 20, 10),
+    '1k': (1000, 5, 50, 20),
+    '10k': (10000, 10, 200, 50),
+    '100k': (100000, 10, 500, 100),
+}
+
+BRANCHES = ['CSE', 'ECE', 'EEE', 'MECH', 'CIVIL', 'IT']
+STATUSES = ['APPLIED', 'UNDER_REVIEW', 'SHORTLISTED', 'REJECTED', 'HIRED']
+STATUS_WEIGHTS = [40, 20, 15, 20, 5]
+TIERS = ['Tier 1', 'Tier 2', 'Tier 3']
+
+BATCH_SIZE = 5000
+
+
+@contextmanager
+def _explicit_timestamps(model, field_name):
+    """Let bulk_create keep the given value of an auto_now_add field"""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def generate_dataset(scale, seed=42, log=None):
+    """
+    Populate the current database with the fixture for a scale.
+    Rows are bulk inserted, so the placement counters, timeline rollups, job
+    eligibility rows, search index, status events, calendar events,
+    placements and numeric GPA columns are filled in directly rather than
+    by signals and save(). The inactive year's metrics are frozen, for the
+    frozen-year views.
+    """
+    from accounts.models import User, StudentProfile, YearManagement, parse_gpa_value
+    from college.models import College
+    from companies.models import Company
+    from jobs import calendar_events, eligibility, placements, search as job_search, status_events
+    from jobs.models import JobPosting, JobApplication
+    from .counters import rebuild_counters, rebuild_timeline_rollups
+    from .frozen import freeze_year
+
+    log = log or (lambda message: None)
+    student_count, applications_each, job_count, company_count = SCALES[scale]
+    rng = random.Random(seed)
+    current_year = timezone.now().year
+    years = [current_year - 1, current_year, current_year + 1]
+
+    college, _ = College.objects.get_or_create(id=1, defaults={'name': 'Benchmark College', 'slug': 'benchmark'})
+    for year in years:
+        YearManagement.objects.get_or_create(year=year, defaults={'is_active': year != years[0]})
+
+    User.objects.create_superuser(email='benchmark-admin@example.com', password=None, college=college)
+
+    log(f'Creating {company_count} companies and {job_count} jobs')
+    Company.objects.bulk_create([
+        Company(
+            name=f'Company {i}', slug=f'company-{i}', description='Benchmark company',
+            industry=rng.choice(['Software', 'Hardware', 'Finance', 'Consulting']),
+            size='1,000+ employees', founded=str(rng.randint(1950, 2020)), location='Bengaluru',
+            website='https://example.com', tier=rng.choice(TIERS), campus_recruiting=rng.random() < 0.5,
+        )
+        for i in range(company_count)
+    ], batch_size=BATCH_SIZE)
+    company_ids = list(Company.objects.values_list('id', flat=True))
+
+    JobPosting.objects.bulk_create([
+        JobPosting(
+            company_id=rng.choice(company_ids), title=f'Engineer {i}', description='Benchmark job',
+            location='Bengaluru', job_type=rng.choice(['FULL_TIME', 'INTERNSHIP']),
+            required_skills='python, sql', application_deadline=date.today() + timedelta(days=rng.randint(-60, 60)),
+            is_active=rng.random() < 0.8, is_published=rng.random() < 0.7,
+            allowed_passout_years=rng.choice([[], [years[1]], years[1:]]),
+            allowed_departments=rng.choice([[], BRANCHES[:2], BRANCHES[:4]]),
+        )
+        for i in range(job_count)
+    ], batch_size=BATCH_SIZE)
+    job_ids = list(JobPosting.objects.values_list('id', flat=True))
+
+    log(f'Creating {student_count} students')
+    User.objects.bulk_create([
+        User(email=f'student{i}@example.com', password='!', college=college, user_type='STUDENT')
+        for i in range(student_count)
+    ], batch_size=BATCH_SIZE)
+    user_ids = list(User.objects.filter(user_type='STUDENT').order_by('id').values_list('id', flat=True))
+
+    profiles = []
+    for i, user_id in enumerate(user_ids):
+        gpa = rng.choice(['', '0.0', f'{rng.uniform(5, 10):.2f}', f'{rng.uniform(5, 10):.2f}', f'{rng.uniform(5, 10):.1f}'])
+        semester1 = rng.choice([None, f'{rng.uniform(5, 10):.2f}'])
+        profiles.append(StudentProfile(
+            user_id=user_id, college=college, first_name=f'Student{i}', last_name='Bench',
+            student_id=f'BENCH{i:06d}', branch=rng.choice(BRANCHES), passout_year=rng.choice(years),
+            joining_year=current_year - 3, gender=rng.choice(['Male', 'Female']),
+            active_arrears=rng.choice([0, 0, 0, 1, 2]),
+            gpa=gpa, gpa_numeric=parse_gpa_value(gpa),
+            semester1_cgpa=semester1, semester1_cgpa_numeric=parse_gpa_value(semester1),
+        ))
+        if len(profiles) >= BATCH_SIZE:
+            StudentProfile.objects.bulk_create(profiles)
+            profiles = []
+    StudentProfile.objects.bulk_create(profiles)
+
+    log(f'Creating {student_count * applications_each} applications')
+    now = timezone.now()
+    applications = []
+    with _explicit_timestamps(JobApplication, 'applied_at'):
+        for user_id in user_ids:
+            for job_id in rng.sample(job_ids, min(applications_each, len(job_ids))):
+                applications.append(JobApplication(
+                    job_id=job_id, applicant_id=user_id,
+                    status=rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+                    applied_at=now - timedelta(days=rng.randint(0, 540), seconds=rng.randint(0, 86400)),
+                ))
+                if len(applications) >= BATCH_SIZE:
+                    JobApplication.objects.bulk_create(applications)
+                    applications = []
+        JobApplication.objects.bulk_create(applications)
+
+    rebuild_counters()
+    rebuild_timeline_rollups()
+    eligibility.rebuild()
+    job_search.rebuild_index()
+    status_events.backfill()
+    calendar_events.rebuild()
+    placements.rebuild()
+    freeze_year(years[0])
+    log('Dataset ready')
+
+
+def reset_caches():
+    """Drop every cached metric and page so the next call is a cold one"""
+    from .models import MetricsCache
+    from . import cache as metrics_cache
+
+    MetricsCache.objects.all().delete()
+    cache.clear()
+    metrics_cache.local_cache.clear()
+    metrics_cache.generation_cache.clear()
+
+
+def measure(fn, repeat=3, cold=True):
+    """
+    Time fn() repeat times, then run it once more under tracemalloc and a
+    query capture. With cold=True caches are reset before every run.
+    """
+    timings = []
+    for _ in range(repeat):
+        if cold:
+            reset_caches()
+        # Keep garbage collection pauses out of the timed region
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            gc.enable()
+
+    if cold:
+        reset_caches()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_ms': round(statistics.median(timings), 2),
+        'wall_ms_min': round(min(timings), 2),
+        'runs': repeat,
+        'queries': len(queries.captured_queries),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def calculator_cases():
+    """(name, callable) for every calculator, plus their parameterised forms"""
+    from . import utils
+
+    current_year = timezone.now().year
+    names = [
+        'calculate_dashboard_stats', 'calculate_company_stats', 'calculate_student_stats',
+        'calculate_enhanced_student_stats', 'calculate_student_department_breakdown',
+        'calculate_student_year_analysis', 'calculate_job_stats', 'calculate_application_stats',
+        'calculate_department_stats', 'calculate_placement_stats', 'calculate_placement_rate',
+    ]
+    cases = [(f'calculator:{name}', getattr(utils, name)) for name in names]
+    cases += [
+        (f'calculator:calculate_dashboard_stats?year={current_year}',
+         lambda: utils.calculate_dashboard_stats(year=str(current_year))),
+        ('calculator:calculate_student_year_analysis?department=CSE',
+         lambda: utils.calculate_student_year_analysis(department='CSE')),
+    ]
+    return cases
+
+
+def view_cases():
+    """(name, view class, URL kwargs, query params, cached) for every metrics API view"""
+    from . import views
+
+    current_year = str(timezone.now().year)
+    frozen_year = timezone.now().year - 1
+    cases = [
+        ('CachedMetricsView', views.CachedMetricsView, {}, {'type': 'dashboard_stats'}, True),
+        ('CachedMetricsView', views.CachedMetricsView, {}, {'type': 'dashboard_stats', 'year': current_year}, True),
+        ('CachedMetricsView', views.CachedMetricsView, {}, {'type': 'placement_stats'}, True),
+        ('ApplicationTimelineView', views.ApplicationTimelineView, {}, {'year': current_year}, False),
+        ('ApplicationTimelineView', views.ApplicationTimelineView, {}, {'year': 'All'}, False),
+        ('DashboardSnapshotView', views.DashboardSnapshotView, {}, {}, True),
+        ('DashboardSnapshotView', views.DashboardSnapshotView, {}, {'year': current_year}, True),
+        ('CacheStatusView', views.CacheStatusView, {}, {}, False),
+        ('EnhancedStudentMetricsView', views.EnhancedStudentMetricsView, {}, {}, True),
+        ('StudentDepartmentStatsView', views.StudentDepartmentStatsView, {}, {}, True),
+        ('StudentYearStatsView', views.StudentYearStatsView, {}, {'department': 'CSE'}, True),
+        ('StudentPerformanceAnalyticsView', views.StudentPerformanceAnalyticsView, {}, {}, False),
+        ('CachedCompanyListView', views.CachedCompanyListView, {}, {'page_size': 20}, True),
+        ('CachedStudentListView', views.CachedStudentListView, {}, {'page_size': 20}, True),
+        ('CachedStudentListView', views.CachedStudentListView, {}, {'page_size': 20, 'cgpa_min': 8}, True),
+        ('CachedJobListView', views.CachedJobListView, {}, {'page_size': 20}, True),
+        ('HiringFunnelView', views.HiringFunnelView, {}, {}, False),
+        ('HiringFunnelView', views.HiringFunnelView, {}, {'passout_year': current_year}, False),
+        ('HiringFunnelView', views.HiringFunnelView, {}, {'passout_year': frozen_year}, False),
+        ('StatusLatencyView', views.StatusLatencyView, {}, {}, False),
+        ('StatusLatencyView', views.StatusLatencyView, {}, {'from_status': 'APPLIED', 'to_status': 'SHORTLISTED'}, False),
+        ('FrozenYearListView', views.FrozenYearListView, {}, {}, False),
+        ('FrozenYearDetailView', views.FrozenYearDetailView, {'year': frozen_year}, {}, False),
+    ]
+    return cases
+
+
+def _view_caller(view_class, url_kwargs, params, user):
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    factory = APIRequestFactory()
+    view = view_class.as_view()
+
+    def call():
+        request = factory.get('/', params)
+        force_authenticate(request, user=user)
+        response = view(request, **url_kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f'HTTP {response.status_code}: {getattr(response, "data", "")}')
+        # Render like the real request cycle would; pre-serialized bodies
+        # (DashboardSnapshotView) are plain HttpResponses
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    return call
+
+
+def run_benchmarks(repeat=3, only=None, log=None):
+    """
+    Benchmark every calculator and view. Returns {case name: result},
+    where a failing case records its error instead of timings.
+    """
+    from accounts.models import User
+
+    log = log or (lambda message: None)
+    admin = User.objects.filter(is_superuser=True).first()
+
+    cases = [(name, fn, True) for name, fn in calculator_cases()]
+    for view_name, view_class, url_kwargs, params, cached in view_cases():
+        path = ''.join(f'/{value}' for value in url_kwargs.values())
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        name = f'view:{view_name}{path}' + (f'?{query}' if query else '')
+        call = _view_caller(view_class, url_kwargs, params, admin)
+        cases.append((name, call, True))
+        if cached:
+            cases.append((f'{name} [warm]', call, False))
+
+    results = {}
+    for name, fn, cold in cases:
+        if only and only not in name:
+            continue
+        if not cold:
+            # Prime the caches once, then measure cache hits
+            reset_caches()
+            fn()
+        try:
+            results[name] = measure(fn, repeat=repeat, cold=cold)
+        except Exception as e:
+            results[name] = {'error': f'{type(e).__name__}: {e}'}
+        log(f'{name}: {results[name]}')
+
+    return results
+
+
+def build_report(scale, results):
+    from accounts.models import StudentProfile
+    from jobs.models import JobApplication
+
+    return {
+        'meta': {
+            'scale': scale,
+            'students': StudentProfile.objects.count(),
+            'applications': JobApplication.objects.count(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'created_at': timezone.now().isoformat(),
+        },
+        'results': results,
+    }
+
+
+def compare_reports(report, baseline, time_tolerance=0.25, memory_tolerance=0.25, min_delta_ms=10.0):
+    """
+    List regressions of report against baseline: new errors, more SQL
+    queries, or wall time / peak memory beyond the tolerances. Wall time
+    is compared on the fastest run, the least noisy figure, and differences
+    under min_delta_ms are ignored.
+    """
+    regressions = []
+
+    for name, result in report['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+
+        if 'error' in result:
+            if 'error' not in base:
+                regressions.append(f"{name}: now fails with {result['error']}")
+            continue
+        if 'error' in base:
+            continue
+
+        if result['queries'] > base['queries']:
+            regressions.append(f"{name}: queries {base['queries']} -> {result['queries']}")
+
+        slower = result['wall_ms_min'] - base['wall_ms_min']
+        if result['wall_ms_min'] > base['wall_ms_min'] * (1 + time_tolerance) and slower > min_delta_ms:
+            regressions.append(f"{name}: wall time {base['wall_ms_min']}ms -> {result['wall_ms_min']}ms")
+
+        if result['peak_kb'] > base['peak_kb'] * (1 + memory_tolerance) and result['peak_kb'] - base['peak_kb'] > 64:
+            regressions.append(f"{name}: peak memory {base['peak_kb']}KB -> {result['peak_kb']}KB")
+
+    return regressions
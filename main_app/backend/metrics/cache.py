@@ -0,0 +1,347 @@
+"""
+Two-tier read-through cache for computed metrics.
+
+Lookups go through a bounded, process-local LRU first, then the shared
+Django cache backend, and only then the MetricsCache table. Entries are
+stamped with per-metric generations kept in the shared cache (CACHES,
+which must be shared by every process), so an invalidation in one worker
+process or management command is seen by every other process without
+having to reach into their local memory. Each process re-reads the
+generations at most every GENERATION_TTL_SECONDS, so a warm local hit
+costs no round trip.
+
+Concurrent misses for the same (metric_type, metric_key) are collapsed:
+inside a process callers wait on a single in-flight computation, and
+across processes a short-lived lock in the shared cache lets one worker
+compute while the others poll for its result.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+LOCAL_CACHE_MAX_ENTRIES = getattr(settings, 'METRICS_LOCAL_CACHE_MAX_ENTRIES', 256)
+DEFAULT_TTL_SECONDS = 30 * 60
+COMPUTE_LOCK_TIMEOUT = getattr(settings, 'METRICS_COMPUTE_LOCK_TIMEOUT', 120)
+COMPUTE_WAIT_TIMEOUT = getattr(settings, 'METRICS_COMPUTE_WAIT_TIMEOUT', 30)
+COMPUTE_POLL_INTERVAL = 0.1
+# How long a process trusts the generations it read from the shared cache
+GENERATION_TTL_SECONDS = getattr(settings, 'METRICS_GENERATION_TTL_SECONDS', 2)
+
+KEY_PREFIX = 'metrics'
+
+
+def _data_key(metric_type, metric_key):
+    return f"{KEY_PREFIX}:data:{metric_type}:{metric_key}"
+
+
+def _type_generation_key(metric_type):
+    return f"{KEY_PREFIX}:gen:{metric_type}"
+
+
+def _key_generation_key(metric_type, metric_key):
+    return f"{KEY_PREFIX}:gen:{metric_type}:{metric_key}"
+
+
+def _lock_key(metric_type, metric_key):
+    return f"{KEY_PREFIX}:lock:{metric_type}:{metric_key}"
+
+
+class LocalMetricsCache:
+    """
+    Bounded LRU of metric payloads held in process memory.
+
+    Each entry remembers its expiry time and the generation it was
+    computed under; a lookup with a different generation is a miss.
+    """
+
+    def __init__(self, max_entries=LOCAL_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            data, expires_at, entry_generation = entry
+            if entry_generation != generation or expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return data
+
+    def set(self, key, data, ttl_seconds, generation):
+        if ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (data, time.monotonic() + ttl_seconds, generation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, metric_type, metric_key=None):
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == metric_type and (metric_key is None or key[1] == metric_key):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time within this process.
+
+    Callers arriving while a computation is running block until it
+    finishes and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+        return call.result
+
+
+local_cache = LocalMetricsCache()
+single_flight = SingleFlight()
+
+
+class GenerationCache:
+    """
+    Process-local copy of the generations read from the shared cache,
+    each trusted for GENERATION_TTL_SECONDS. A warm hit in the local tier
+    then costs no round trip at all; an invalidation from another process
+    is seen here at most GENERATION_TTL_SECONDS later, and one from this
+    process at once.
+    """
+
+    def __init__(self, ttl_seconds=GENERATION_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        values, missing = {}, []
+        with self._lock:
+            for key in keys:
+                entry = self._values.get(key)
+                if entry is not None and entry[1] > now:
+                    values[key] = entry[0]
+                else:
+                    missing.append(key)
+
+        if missing:
+            fetched = cache.get_many(missing)
+            expires_at = now + self.ttl_seconds
+            with self._lock:
+                for key in missing:
+                    values[key] = fetched.get(key, 0)
+                    self._values[key] = (values[key], expires_at)
+        return values
+
+    def set(self, key, value):
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + self.ttl_seconds)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+generation_cache = GenerationCache()
+
+
+def get_generation(metric_type, metric_key):
+    """
+    Return the current (type, key) generation pair for a metric.
+    Both generations live in the shared cache; see GenerationCache.
+    """
+    type_key = _type_generation_key(metric_type)
+    key_key = _key_generation_key(metric_type, metric_key)
+    values = generation_cache.get_many([type_key, key_key])
+    return (values[type_key], values[key_key])
+
+
+def get_generations(metrics):
+    """
+    Return {(metric_type, metric_key): generation} for several metrics,
+    fetched from the shared cache in at most one round trip.
+    """
+    metrics = list(metrics)
+    keys = set()
+    for metric_type, metric_key in metrics:
+        keys.update([_type_generation_key(metric_type), _key_generation_key(metric_type, metric_key)])
+    values = generation_cache.get_many(list(keys))
+    return {
+        (metric_type, metric_key): (
+            values[_type_generation_key(metric_type)],
+            values[_key_generation_key(metric_type, metric_key)],
+        )
+        for metric_type, metric_key in metrics
+    }
+
+
+def get_metric(metric_type, metric_key, generation):
+    """
+    Look up a metric in the local tier, then the shared tier.
+    Returns None on a miss in both.
+    """
+    key = (metric_type, metric_key)
+
+    data = local_cache.get(key, generation)
+    if data is not None:
+        return data
+
+    entry = cache.get(_data_key(metric_type, metric_key))
+    if not entry or entry.get('generation') != generation:
+        return None
+
+    remaining = entry['expires_at'] - time.time()
+    if remaining <= 0:
+        return None
+
+    local_cache.set(key, entry['data'], remaining, generation)
+    return entry['data']
+
+
+def set_metric(metric_type, metric_key, data, generation, ttl_seconds=DEFAULT_TTL_SECONDS):
+    """
+    Store a metric in both tiers under the generation it was read or
+    computed against. If an invalidation bumped the generation in the
+    meantime the entry is simply never served.
+    """
+    if ttl_seconds <= 0:
+        return
+
+    local_cache.set((metric_type, metric_key), data, ttl_seconds, generation)
+    cache.set(
+        _data_key(metric_type, metric_key),
+        {'data': data, 'generation': generation, 'expires_at': time.time() + ttl_seconds},
+        int(ttl_seconds) or 1,
+    )
+
+
+def _bump(generation_key):
+    # A fresh value rather than incr(): on the database backend incr is a
+    # read then a write, and two racing bumps could both land on the same
+    # number, leaving entries computed in between looking current
+    generation = uuid.uuid4().hex
+    cache.set(generation_key, generation, None)
+    generation_cache.set(generation_key, generation)
+
+
+def invalidate_metric(metric_type, metric_key=None):
+    """
+    Invalidate a metric type, or a single key of it, in both tiers. The
+    shared entry is left to expire: it is stamped with the old generation
+    and so is never served again.
+    """
+    if metric_key:
+        _bump(_key_generation_key(metric_type, metric_key))
+    else:
+        _bump(_type_generation_key(metric_type))
+    local_cache.discard(metric_type, metric_key)
+
+
+def compute_once(metric_type, metric_key, compute, lookup):
+    """
+    Run compute() for a metric, collapsing concurrent callers.
+
+    lookup() is re-checked once leadership is obtained and while waiting
+    on another process, so late arrivals pick up a result that has just
+    been stored instead of recomputing it.
+    """
+
+    def lead():
+        data = lookup()
+        if data is not None:
+            return data
+
+        lock_key = _lock_key(metric_type, metric_key)
+        if cache.add(lock_key, True, COMPUTE_LOCK_TIMEOUT):
+            try:
+                return compute()
+            finally:
+                cache.delete(lock_key)
+
+        # Another process is computing this metric; wait for its result
+        deadline = time.monotonic() + COMPUTE_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(COMPUTE_POLL_INTERVAL)
+            data = lookup()
+            if data is not None:
+                return data
+            if cache.get(lock_key) is None:
+                break
+
+        logger.warning(f"Computing {metric_type}/{metric_key} without lock after waiting for another worker")
+        return compute()
+
+    return single_flight.do((metric_type, metric_key), lead)
+
+
+def compute_if_idle(metric_type, metric_key, compute):
+    """
+    Run compute() unless another worker already holds the lock for this
+    metric. Used by background refreshes, which have a stale value to fall
+    back on and so never wait. Returns False if the refresh was skipped.
+    """
+    lock_key = _lock_key(metric_type, metric_key)
+    if not cache.add(lock_key, True, COMPUTE_LOCK_TIMEOUT):
+        return False
+
+    try:
+        compute()
+    finally:
+        cache.delete(lock_key)
+    return True
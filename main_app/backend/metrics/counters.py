@@ -0,0 +1,262 @@
+"""
+Delta maintenance for PlacementCounter and ApplicationMonthlyRollup.
+
+The signal handlers call these with the before/after state of a
+JobApplication or StudentProfile, so each save or delete touches a fixed
+handful of counter rows instead of invalidating the placement metrics and
+re-counting every application. rebuild_counters() recomputes the whole
+table from scratch; run it (reconcile_placement_counters) after bulk
+writes that bypass signals, such as queryset.update(). Set-based status
+changes (jobs.bulk) report their transitions to applications_changed(),
+which applies them in one pass.
+rebuild_timeline_rollups() does the same for the monthly rollups
+(rebuild_application_timeline).
+"""
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from accounts.models import StudentProfile
+from jobs.models import JobApplication
+from .models import PlacementCounter, ApplicationMonthlyRollup
+from .cache import invalidate_metric
+
+HIRED = 'HIRED'
+APPLICATION_STATUSES = [value for value, _ in JobApplication._meta.get_field('status').choices]
+
+UNKNOWN_KEY = PlacementCounter.key_for(None, None)
+
+
+def student_key(user_id):
+    """Counter key of the student profile belonging to a user"""
+    row = StudentProfile.objects.filter(user_id=user_id).values_list('passout_year', 'branch').first()
+    if row is None:
+        return UNKNOWN_KEY
+    return PlacementCounter.key_for(*row)
+
+
+def student_keys(user_ids):
+    """Counter keys of many users' student profiles, as {user_id: key}"""
+    keys = {user_id: UNKNOWN_KEY for user_id in user_ids}
+    rows = StudentProfile.objects.filter(user_id__in=keys).values_list('user_id', 'passout_year', 'branch')
+    for user_id, passout_year, branch in rows:
+        keys[user_id] = PlacementCounter.key_for(passout_year, branch)
+    return keys
+
+
+def application_student_key(application):
+    """
+    Counter key of an application's applicant, looked up once per save or
+    delete and shared by the counter and invalidation signal handlers.
+    """
+    if getattr(application, '_student_key', None) is None:
+        application._student_key = student_key(application.applicant_id)
+    return application._student_key
+
+
+def _has_other_hire(user_id, exclude_pk):
+    return JobApplication.objects.filter(
+        applicant_id=user_id, status=HIRED
+    ).exclude(pk=exclude_pk).exists()
+
+
+def application_changed(application, old_status, new_status):
+    """
+    Apply an application's status transition. old_status is None for a new
+    application and new_status is None for one being deleted.
+    """
+    if old_status == new_status:
+        return
+
+    key = application_student_key(application)
+    if old_status:
+        PlacementCounter.adjust(key, old_status, -1)
+        ApplicationMonthlyRollup.adjust(application.applied_at, old_status, -1)
+    if new_status:
+        PlacementCounter.adjust(key, new_status, 1)
+        ApplicationMonthlyRollup.adjust(application.applied_at, new_status, 1)
+
+    # The student's placed flag only flips on their first hire / last un-hire
+    if HIRED in (old_status, new_status) and not _has_other_hire(application.applicant_id, application.pk):
+        PlacementCounter.adjust(key, PlacementCounter.PLACED, 1 if new_status == HIRED else -1)
+
+
+def applications_changed(transitions):
+    """
+    Bulk form of application_changed() for (application, old_status,
+    new_status) transitions written without signals, e.g. by bulk_update.
+    Call it once the new statuses are stored. Each counter and rollup row
+    is adjusted once, however many applications moved through it.
+    Returns the student keys of the applications that changed.
+    """
+    transitions = [
+        (application, old_status, new_status)
+        for application, old_status, new_status in transitions
+        if old_status != new_status
+    ]
+    if not transitions:
+        return set()
+
+    keys = student_keys({application.applicant_id for application, _, _ in transitions})
+    counter_deltas = {}
+    rollup_deltas = {}
+    hires_moved = {}
+
+    def add(deltas, key, delta):
+        deltas[key] = deltas.get(key, 0) + delta
+
+    for application, old_status, new_status in transitions:
+        key = keys[application.applicant_id]
+        month = ApplicationMonthlyRollup.month_of(application.applied_at)
+        for status, delta in ((old_status, -1), (new_status, 1)):
+            if status:
+                add(counter_deltas, (key, status), delta)
+                add(rollup_deltas, month + (status,), delta)
+        if HIRED in (old_status, new_status):
+            add(hires_moved, application.applicant_id, 1 if new_status == HIRED else -1)
+
+    # A student's placed flag follows whether they have any hire at all,
+    # before and after the whole batch
+    if hires_moved:
+        hires_now = dict(
+            JobApplication.objects.filter(applicant_id__in=hires_moved, status=HIRED)
+            .values('applicant_id').annotate(total=Count('id')).values_list('applicant_id', 'total')
+            .order_by()
+        )
+        for user_id, moved in hires_moved.items():
+            after = hires_now.get(user_id, 0)
+            placed = int(after > 0) - int(after - moved > 0)
+            if placed:
+                add(counter_deltas, (keys[user_id], PlacementCounter.PLACED), placed)
+
+    PlacementCounter.adjust_many(counter_deltas)
+    ApplicationMonthlyRollup.adjust_many(rollup_deltas)
+    return {keys[application.applicant_id] for application, _, _ in transitions}
+
+
+def student_changed(profile, old_key, new_key):
+    """
+    Apply a student profile's move between (passout_year, branch) keys.
+    old_key is None for a new profile and new_key is None for a deleted one.
+    """
+    if old_key == new_key:
+        return
+
+    if old_key:
+        PlacementCounter.adjust(old_key, PlacementCounter.STUDENTS, -1)
+    if new_key:
+        PlacementCounter.adjust(new_key, PlacementCounter.STUDENTS, 1)
+
+    # Applications are counted under their applicant's key, so they follow
+    # the profile. A new profile picks up any applications that were made
+    # before it existed. On delete they are left in place: when the user is
+    # deleted the applications go too and take their counts with them.
+    if new_key is None:
+        return
+
+    source_key = old_key or UNKNOWN_KEY
+    status_counts = JobApplication.objects.filter(
+        applicant_id=profile.user_id
+    ).values('status').annotate(total=Count('id')).order_by()
+
+    for row in status_counts:
+        PlacementCounter.adjust(source_key, row['status'], -row['total'])
+        PlacementCounter.adjust(new_key, row['status'], row['total'])
+        if row['status'] == HIRED:
+            PlacementCounter.adjust(source_key, PlacementCounter.PLACED, -1)
+            PlacementCounter.adjust(new_key, PlacementCounter.PLACED, 1)
+
+
+def count_from_source():
+    """
+    Count every (passout_year, branch, status) key from the source tables.
+    Returns {(passout_year, branch, status): count} without zero entries.
+    """
+    totals = {}
+
+    def add(passout_year, branch, status, count):
+        key = PlacementCounter.key_for(passout_year, branch) + (status,)
+        totals[key] = totals.get(key, 0) + count
+
+    for row in StudentProfile.objects.values('passout_year', 'branch').annotate(total=Count('id')).order_by():
+        add(row['passout_year'], row['branch'], PlacementCounter.STUDENTS, row['total'])
+
+    year_field = 'applicant__student_profile__passout_year'
+    branch_field = 'applicant__student_profile__branch'
+
+    application_counts = JobApplication.objects.values(
+        year_field, branch_field, 'status'
+    ).annotate(total=Count('id')).order_by()
+    for row in application_counts:
+        add(row[year_field], row[branch_field], row['status'], row['total'])
+
+    placed_counts = JobApplication.objects.filter(status=HIRED).values(
+        year_field, branch_field
+    ).annotate(total=Count('applicant', distinct=True)).order_by()
+    for row in placed_counts:
+        add(row[year_field], row[branch_field], PlacementCounter.PLACED, row['total'])
+
+    return {key: count for key, count in totals.items() if count}
+
+
+def stored_counts():
+    """Current counter table as {(passout_year, branch, status): count}"""
+    return {
+        (passout_year, branch, status): count
+        for passout_year, branch, status, count in PlacementCounter.objects.values_list(
+            'passout_year', 'branch', 'status', 'count'
+        )
+        if count
+    }
+
+
+@transaction.atomic
+def rebuild_counters():
+    """
+    Replace the counter table with counts recomputed from the source tables.
+    Returns the number of counter rows written.
+    """
+    counters = [
+        PlacementCounter(passout_year=passout_year, branch=branch, status=status, count=count)
+        for (passout_year, branch, status), count in count_from_source().items()
+    ]
+
+    PlacementCounter.objects.all().delete()
+    PlacementCounter.objects.bulk_create(counters, batch_size=1000)
+
+    return len(counters)
+
+
+def count_timeline_from_source():
+    """
+    Count applications per (year, month, status) from JobApplication,
+    bucketing applied_at by month in the current time zone.
+    """
+    rows = JobApplication.objects.annotate(
+        month_start=TruncMonth('applied_at', tzinfo=timezone.get_current_timezone())
+    ).values('month_start', 'status').annotate(total=Count('id')).order_by()
+
+    return {
+        (row['month_start'].year, row['month_start'].month, row['status']): row['total']
+        for row in rows
+    }
+
+
+@transaction.atomic
+def rebuild_timeline_rollups():
+    """
+    Replace ApplicationMonthlyRollup with counts recomputed from JobApplication.
+    Returns the number of rollup rows written.
+    """
+    rollups = [
+        ApplicationMonthlyRollup(year=year, month=month, status=status, count=count)
+        for (year, month, status), count in count_timeline_from_source().items()
+    ]
+
+    ApplicationMonthlyRollup.objects.all().delete()
+    ApplicationMonthlyRollup.objects.bulk_create(rollups, batch_size=1000)
+    invalidate_metric('application_timeline')
+
+    return len(rollups)
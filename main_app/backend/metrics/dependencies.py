@@ -0,0 +1,158 @@
+"""
+Declared dependencies between source data and cached metrics.
+
+Signal handlers describe what changed with record_change('student',
+years=..., departments=...). Changes are collected for the current
+transaction and resolved against METRIC_DEPENDENCIES once, on commit, so a
+bulk import inside transaction.atomic() invalidates each affected metric
+key a single time instead of once per saved row. Outside a transaction the
+flush happens immediately, as on_commit does in autocommit mode.
+
+Scopes say which cache keys of a metric a change can reach:
+  ALL_KEYS       every key of the metric
+  BY_YEAR        the keys of the changed passout years, plus every key
+                 that is not a year (e.g. 'all', 'default')
+  BY_DEPARTMENT  the 'dept_<branch>' keys of the changed branches, plus
+                 every key that is not department specific
+A change recorded without years/departments falls back to ALL_KEYS.
+"""
+
+import threading
+
+from django.db import transaction
+
+from .models import MetricsCache
+from .page_cache import page_store
+
+ALL_KEYS = 'all_keys'
+BY_YEAR = 'by_year'
+BY_DEPARTMENT = 'by_department'
+
+DEPARTMENT_KEY_PREFIX = 'dept_'
+
+METRIC_DEPENDENCIES = {
+    'company': {
+        'dashboard_stats': ALL_KEYS,
+        'company_stats': ALL_KEYS,
+    },
+    'student': {
+        'dashboard_stats': BY_YEAR,
+        'student_stats': ALL_KEYS,
+        'enhanced_student_stats': ALL_KEYS,
+        'student_department_breakdown': ALL_KEYS,
+        'student_year_analysis': BY_DEPARTMENT,
+        'department_stats': ALL_KEYS,
+        'placement_stats': ALL_KEYS,
+    },
+    'job': {
+        'dashboard_stats': ALL_KEYS,
+        'job_stats': ALL_KEYS,
+        'company_stats': ALL_KEYS,
+    },
+    'application': {
+        'dashboard_stats': BY_YEAR,
+        'application_stats': ALL_KEYS,
+        'student_stats': ALL_KEYS,
+        'placement_stats': ALL_KEYS,
+        'student_year_analysis': BY_DEPARTMENT,
+        'application_timeline': ALL_KEYS,
+    },
+    # Applications moving into or out of HIRED
+    'placement': {
+        'department_stats': ALL_KEYS,
+    },
+    'year_management': {
+        'dashboard_stats': ALL_KEYS,
+        'student_stats': ALL_KEYS,
+        'department_stats': ALL_KEYS,
+        'placement_stats': ALL_KEYS,
+        'enhanced_student_stats': ALL_KEYS,
+        'student_department_breakdown': ALL_KEYS,
+        'student_year_analysis': ALL_KEYS,
+    },
+}
+
+PAGINATED_DEPENDENCIES = {
+    'company': ['companies_list'],
+    'student': ['students_list'],
+    'job': ['jobs_list'],
+    'application': ['applications_list'],
+}
+
+
+class _PendingInvalidations(threading.local):
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # metric_type -> None (all keys) or {'years': set, 'departments': set}
+        self.metrics = {}
+        self.paginated = set()
+
+
+_pending = _PendingInvalidations()
+
+
+def record_change(data_type, years=None, departments=None):
+    """
+    Note that rows of data_type changed, optionally limited to the given
+    passout years / branches. The affected metrics are invalidated when
+    the surrounding transaction commits.
+    """
+    for metric_type, scope in METRIC_DEPENDENCIES.get(data_type, {}).items():
+        _add_metric(metric_type, scope, years, departments)
+    _pending.paginated.update(PAGINATED_DEPENDENCIES.get(data_type, []))
+
+    # Every call registers a callback, so a rolled-back savepoint cannot
+    # drop the flush for changes recorded outside it; later callbacks in
+    # the same commit find nothing left to do.
+    transaction.on_commit(flush)
+
+
+def _add_metric(metric_type, scope, years, departments):
+    if metric_type in _pending.metrics and _pending.metrics[metric_type] is None:
+        return
+
+    if scope == BY_YEAR and years is not None:
+        values = {'years': {year for year in years if year}}
+    elif scope == BY_DEPARTMENT and departments is not None:
+        values = {'departments': {branch.lower() for branch in departments if branch}}
+    else:
+        _pending.metrics[metric_type] = None
+        return
+
+    scoped = _pending.metrics.setdefault(metric_type, {})
+    for name, items in values.items():
+        scoped.setdefault(name, set()).update(items)
+
+
+def _key_is_affected(metric_key, scoped):
+    years = scoped.get('years')
+    if years is not None and metric_key.isdigit():
+        return int(metric_key) in years
+
+    departments = scoped.get('departments')
+    if departments is not None and metric_key.startswith(DEPARTMENT_KEY_PREFIX):
+        return metric_key[len(DEPARTMENT_KEY_PREFIX):].lower() in departments
+
+    return True
+
+
+def flush():
+    """Invalidate everything recorded so far in this thread"""
+    metrics, paginated = _pending.metrics, _pending.paginated
+    _pending.reset()
+
+    for metric_type, scoped in metrics.items():
+        if scoped is None:
+            MetricsCache.invalidate_metric(metric_type)
+            continue
+
+        stored_keys = MetricsCache.objects.filter(
+            metric_type=metric_type
+        ).values_list('metric_key', flat=True)
+        keys = [key for key in stored_keys if _key_is_affected(key, scoped)]
+        MetricsCache.invalidate_keys(metric_type, keys)
+
+    for cache_type in paginated:
+        page_store.invalidate(cache_type)
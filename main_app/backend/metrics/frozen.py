@@ -0,0 +1,73 @@
+"""
+Frozen per-year metrics.
+
+Archiving a passout year (jobs.archive) moves its applications out of the
+hot tables, and with them out of the counters, rollups and status events
+the live metrics are computed from. freeze_year() stores the year's
+figures beforehand in FrozenYearMetrics, and the dashboard, hiring funnel
+and time-to-hire endpoints serve those for the year from then on.
+Restoring the year's applications drops them again (unfreeze_year()).
+"""
+
+from django.db.models import Count
+from django.utils import timezone
+
+from jobs import status_events
+from jobs.models import JobApplication
+from .counters import APPLICATION_STATUSES
+from .dependencies import record_change
+from .models import FrozenYearMetrics, PlacementCounter
+from .utils import calculate_dashboard_stats
+
+
+def build_year(year):
+    """Metrics of a passout year from the live tables (not stored)"""
+    branch_counts = {
+        status: PlacementCounter.by_branch(status, year)
+        for status in APPLICATION_STATUSES + [PlacementCounter.STUDENTS, PlacementCounter.PLACED]
+    }
+    branches = sorted(set().union(*branch_counts.values()))
+
+    company_placements = JobApplication.objects.filter(
+        status='HIRED', applicant__student_profile__passout_year=year
+    ).values('job__company_id', 'job__company__name').annotate(count=Count('id')).order_by('-count')
+
+    return {
+        'year': year,
+        'dashboard': calculate_dashboard_stats(year),
+        'applications_by_status': {
+            status: PlacementCounter.total(status, years=[year]) for status in APPLICATION_STATUSES
+        },
+        'branches': [
+            {'branch': branch, **{status.lower(): counts.get(branch, 0) for status, counts in branch_counts.items()}}
+            for branch in branches
+        ],
+        'placed_students': PlacementCounter.total(PlacementCounter.PLACED, years=[year]),
+        'company_wise_placements': list(company_placements),
+        'funnel': status_events.funnel(passout_year=year),
+        'time_to_hire': status_events.latency(passout_year=year),
+    }
+
+
+def freeze_year(year, refresh=False):
+    """
+    Store the metrics of a passout year, unless it already has frozen
+    metrics and refresh is not set. Returns (FrozenYearMetrics, created).
+    """
+    frozen = FrozenYearMetrics.objects.filter(year=year).first()
+    if frozen is not None and not refresh:
+        return frozen, False
+
+    frozen, created = FrozenYearMetrics.objects.update_or_create(
+        year=year, defaults={'data': build_year(year), 'frozen_at': timezone.now()}
+    )
+    record_change('application', years=[year])
+    return frozen, created
+
+
+def unfreeze_year(year):
+    """Serve a passout year from the live tables again. Returns whether it was frozen."""
+    deleted, _ = FrozenYearMetrics.objects.filter(year=year).delete()
+    if deleted:
+        record_change('application', years=[year])
+    return bool(deleted)
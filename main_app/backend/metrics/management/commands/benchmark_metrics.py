@@ -0,0 +1,158 @@
+"""
+Management command to benchmark the metric calculators and metrics views.
+
+Builds a throwaway test database (the same way the test runner does),
+fills it with a generated dataset, times every calculator and view and
+writes a JSON report. With --baseline the report is compared against a
+stored one and the command fails on regressions, so it can gate CI.
+
+    python manage.py benchmark_metrics --scale 10k --baseline benchmarks/10k.json
+    python manage.py benchmark_metrics --scale 10k --save-baseline benchmarks/10k.json
+"""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+
+from metrics.benchmark import SCALES, generate_dataset, run_benchmarks, build_report, compare_reports
+
+
+class Command(BaseCommand):
+    help = 'Benchmark metric calculators and views on a generated dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            choices=list(SCALES),
+            default='1k',
+            help='Dataset size: ' + ', '.join(
+                f'{name} ({students} students, {students * per_student} applications)'
+                for name, (students, per_student, _, _) in SCALES.items()
+            ),
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Timed runs per case; the median is reported (default: 3)',
+        )
+        parser.add_argument(
+            '--only',
+            type=str,
+            help='Only run cases whose name contains this text',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the generated dataset (default: 42)',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Where to write the JSON report (default: benchmark-<scale>.json)',
+        )
+        parser.add_argument(
+            '--baseline',
+            type=str,
+            help='Baseline report to compare against; regressions make the command fail',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            type=str,
+            help='Also write the report to this path as the new baseline',
+        )
+        parser.add_argument(
+            '--time-tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed wall time increase as a fraction of the baseline (default: 0.25)',
+        )
+        parser.add_argument(
+            '--memory-tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed peak memory increase as a fraction of the baseline (default: 0.25)',
+        )
+        parser.add_argument(
+            '--min-delta-ms',
+            type=float,
+            default=10.0,
+            help='Ignore wall time increases smaller than this many milliseconds (default: 10)',
+        )
+        parser.add_argument(
+            '--keepdb',
+            action='store_true',
+            help='Keep the benchmark database and reuse an already generated dataset',
+        )
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        verbosity = options['verbosity']
+
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not read baseline {options["baseline"]}: {e}')
+            if baseline.get('meta', {}).get('scale') != scale:
+                raise CommandError(
+                    f'Baseline was recorded at scale {baseline.get("meta", {}).get("scale")}, not {scale}'
+                )
+
+        log = (lambda message: self.stdout.write(f'  {message}')) if verbosity > 1 else None
+
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'], aliases={'default'})
+        try:
+            from accounts.models import StudentProfile
+
+            if not (options['keepdb'] and StudentProfile.objects.exists()):
+                self.stdout.write(f'🏗️  Generating {scale} dataset...')
+                started = time.time()
+                generate_dataset(scale, seed=options['seed'], log=log)
+                self.stdout.write(f'   Generated in {time.time() - started:.1f}s')
+
+            self.stdout.write('⏱️  Running benchmarks...')
+            results = run_benchmarks(repeat=options['repeat'], only=options['only'], log=log)
+            report = build_report(scale, results)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+
+        output = options['output'] or f'benchmark-{scale}.json'
+        for path in filter(None, [output, options['save_baseline']]):
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+
+        self._print_results(results)
+        self.stdout.write(self.style.SUCCESS(f'📄 Report written to {output}'))
+
+        if baseline is None:
+            return
+
+        regressions = compare_reports(
+            report, baseline,
+            time_tolerance=options['time_tolerance'],
+            memory_tolerance=options['memory_tolerance'],
+            min_delta_ms=options['min_delta_ms'],
+        )
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f'  ❌ {regression}'))
+            raise CommandError(f'{len(regressions)} benchmark regressions against {options["baseline"]}')
+
+        self.stdout.write(self.style.SUCCESS('✅ No regressions against baseline'))
+
+    def _print_results(self, results):
+        width = max((len(name) for name in results), default=0)
+        self.stdout.write(f"{'case'.ljust(width)}  {'wall ms':>10}  {'queries':>8}  {'peak KB':>10}")
+        for name, result in results.items():
+            if 'error' in result:
+                self.stdout.write(self.style.WARNING(f"{name.ljust(width)}  {result['error']}"))
+                continue
+            self.stdout.write(
+                f"{name.ljust(width)}  {result['wall_ms']:>10}  {result['queries']:>8}  {result['peak_kb']:>10}"
+            )
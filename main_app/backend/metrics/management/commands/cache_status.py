@@ -6,7 +6,8 @@ Provides detailed information about cache hit rates, sizes, and health.
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.db.models import Count, Avg
-from metrics.models import MetricsCache, PaginatedDataCache
+from metrics.models import MetricsCache
+from metrics.page_cache import page_store
 from accounts.models import StudentProfile
 from companies.models import Company
 from jobs.models import JobPosting, JobApplication
@@ -108,42 +109,11 @@ class Command(BaseCommand):
 
     def get_paginated_cache_stats(self, now):
         """Get paginated cache statistics."""
-        total_entries = PaginatedDataCache.objects.count()
-        valid_entries = PaginatedDataCache.objects.filter(is_valid=True).count()
-        
-        # Age distribution
-        recent_entries = PaginatedDataCache.objects.filter(
-            last_updated__gte=now - timedelta(minutes=15)
-        ).count()
-        
-        old_entries = PaginatedDataCache.objects.filter(
-            last_updated__lt=now - timedelta(minutes=30)
-        ).count()
-        
-        # Type distribution
-        type_distribution = list(
-            PaginatedDataCache.objects.values('cache_type')
-            .annotate(count=Count('id'))
-            .order_by('-count')
-        )
-        
-        # Page size distribution
-        page_size_distribution = list(
-            PaginatedDataCache.objects.values('page_size')
-            .annotate(count=Count('id'))
-            .order_by('-count')
+        stats = page_store.stats()
+        stats['cache_hit_rate'] = round(
+            (stats['valid_entries'] / stats['total_entries'] * 100) if stats['total_entries'] > 0 else 0, 2
         )
-        
-        return {
-            'total_entries': total_entries,
-            'valid_entries': valid_entries,
-            'invalid_entries': total_entries - valid_entries,
-            'recent_entries': recent_entries,
-            'old_entries': old_entries,
-            'type_distribution': type_distribution,
-            'page_size_distribution': page_size_distribution,
-            'cache_hit_rate': round((valid_entries / total_entries * 100) if total_entries > 0 else 0, 2),
-        }
+        return stats
 
     def get_system_stats(self):
         """Get system-wide statistics."""
@@ -186,15 +156,14 @@ class Command(BaseCommand):
         self.stdout.write(f"  Cache hit rate: {paginated['cache_hit_rate']}%")
         self.stdout.write(f"  Recent entries (15min): {paginated['recent_entries']}")
         self.stdout.write(f"  Old entries (30min+): {paginated['old_entries']}")
+        self.stdout.write(
+            f"  Size: {paginated['total_bytes'] / 1024:.1f} KB of {paginated['byte_budget'] / 1024:.0f} KB budget"
+        )
         
         if detailed:
             self.stdout.write("  Type distribution:")
             for item in paginated['type_distribution']:
                 self.stdout.write(f"    {item['cache_type']}: {item['count']}")
-            
-            self.stdout.write("  Page size distribution:")
-            for item in paginated['page_size_distribution']:
-                self.stdout.write(f"    {item['page_size']} items/page: {item['count']} caches")
         
         # System statistics
         self.stdout.write(self.style.HTTP_INFO('\n🏢 System Statistics'))
@@ -269,32 +238,19 @@ class Command(BaseCommand):
         metrics_deleted = old_metrics.count()
         old_metrics.delete()
         
-        # Clean up old paginated cache (older than 1 hour)
-        old_paginated = PaginatedDataCache.objects.filter(
-            last_updated__lt=now - timedelta(hours=1)
-        )
-        paginated_deleted = old_paginated.count()
-        old_paginated.delete()
+        # Paginated pages expire on their own; drop the invalidated ones now
+        invalid_paginated_deleted = page_store.purge_invalid()
         
         # Clean up invalid entries
         invalid_metrics = MetricsCache.objects.filter(is_valid=False)
         invalid_metrics_deleted = invalid_metrics.count()
         invalid_metrics.delete()
         
-        invalid_paginated = PaginatedDataCache.objects.filter(is_valid=False)
-        invalid_paginated_deleted = invalid_paginated.count()
-        invalid_paginated.delete()
-        
         self.stdout.write(
             self.style.SUCCESS(
                 f"  ✓ Deleted {metrics_deleted} old metrics cache entries"
             )
         )
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"  ✓ Deleted {paginated_deleted} old paginated cache entries"
-            )
-        )
         self.stdout.write(
             self.style.SUCCESS(
                 f"  ✓ Deleted {invalid_metrics_deleted} invalid metrics cache entries"
@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
-from metrics.models import MetricsCache, PaginatedDataCache
+from metrics.models import MetricsCache
+from metrics.cache import invalidate_metric
+from metrics.page_cache import page_store
 
 
 class Command(BaseCommand):
@@ -26,13 +28,14 @@ class Command(BaseCommand):
         if options['all'] or options['metrics']:
             count = MetricsCache.objects.count()
             MetricsCache.objects.all().delete()
+            for metric_type, _ in MetricsCache.METRIC_TYPES:
+                invalidate_metric(metric_type)
             self.stdout.write(
                 self.style.SUCCESS(f'Cleared {count} metrics cache entries')
             )
 
         if options['all'] or options['pagination']:
-            count = PaginatedDataCache.objects.count()
-            PaginatedDataCache.objects.all().delete()
+            count = page_store.clear()
             self.stdout.write(
                 self.style.SUCCESS(f'Cleared {count} pagination cache entries')
             )
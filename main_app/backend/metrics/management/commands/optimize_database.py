@@ -164,7 +164,7 @@ class Command(BaseCommand):
         common_filters = [
             ('accounts_studentprofile', 'branch'),
             ('accounts_studentprofile', 'passout_year'),
-            ('accounts_studentprofile', 'gpa'),
+            ('accounts_studentprofile', 'gpa_numeric'),
             ('companies_company', 'tier'),
             ('companies_company', 'industry'),
             ('companies_company', 'campus_recruiting'),
@@ -204,7 +204,7 @@ class Command(BaseCommand):
             {
                 'name': 'idx_student_search_composite',
                 'table': 'accounts_studentprofile',
-                'columns': ['branch', 'passout_year', 'gpa'],
+                'columns': ['branch', 'passout_year', 'gpa_numeric'],
                 'description': 'Composite index for student filtering'
             },
             {
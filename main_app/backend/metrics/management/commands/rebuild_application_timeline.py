@@ -0,0 +1,49 @@
+"""
+Management command to backfill ApplicationMonthlyRollup from JobApplication.
+Run it after bulk writes that bypass model signals (queryset.update, raw
+imports) or to check that the timeline rollups have not drifted.
+"""
+from django.core.management.base import BaseCommand
+from metrics.counters import count_timeline_from_source, rebuild_timeline_rollups
+from metrics.models import ApplicationMonthlyRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly application rollups behind the application timeline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report months that differ from the applications table',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            expected = count_timeline_from_source()
+            stored = {
+                (year, month, status): count
+                for year, month, status, count in ApplicationMonthlyRollup.objects.values_list(
+                    'year', 'month', 'status', 'count'
+                )
+                if count
+            }
+            drifted = sorted(
+                key for key in set(expected) | set(stored)
+                if expected.get(key, 0) != stored.get(key, 0)
+            )
+
+            if not drifted:
+                self.stdout.write(self.style.SUCCESS(f'✅ All {len(expected)} rollups match'))
+                return
+
+            for year, month, status in drifted:
+                key = (year, month, status)
+                self.stdout.write(
+                    f'  {year}-{month:02d} / {status}: stored {stored.get(key, 0)}, actual {expected.get(key, 0)}'
+                )
+            self.stdout.write(self.style.WARNING(f'⚠️  {len(drifted)} rollups out of sync'))
+            return
+
+        written = rebuild_timeline_rollups()
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt {written} monthly rollups'))
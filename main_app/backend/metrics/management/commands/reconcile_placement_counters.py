@@ -0,0 +1,48 @@
+"""
+Management command to rebuild PlacementCounter from the source tables.
+Run it after bulk writes that bypass model signals (queryset.update, raw
+imports) or whenever the counters are suspected to have drifted.
+"""
+from django.core.management.base import BaseCommand
+from metrics.counters import count_from_source, stored_counts, rebuild_counters
+from metrics.models import MetricsCache
+
+
+class Command(BaseCommand):
+    help = 'Rebuild placement counters (students, applications by status, placed students) from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report counters that differ from the source tables',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            expected = count_from_source()
+            stored = stored_counts()
+            drifted = sorted(
+                key for key in set(expected) | set(stored)
+                if expected.get(key, 0) != stored.get(key, 0)
+            )
+
+            if not drifted:
+                self.stdout.write(self.style.SUCCESS(f'✅ All {len(expected)} counters match'))
+                return
+
+            for passout_year, branch, status in drifted:
+                key = (passout_year, branch, status)
+                self.stdout.write(
+                    f'  {passout_year or "-"} / {branch or "-"} / {status}: '
+                    f'stored {stored.get(key, 0)}, actual {expected.get(key, 0)}'
+                )
+            self.stdout.write(self.style.WARNING(f'⚠️  {len(drifted)} counters out of sync'))
+            return
+
+        written = rebuild_counters()
+
+        MetricsCache.invalidate_metric('dashboard_stats')
+        MetricsCache.invalidate_metric('placement_stats')
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt {written} placement counters'))
@@ -0,0 +1,76 @@
+"""
+Long-running worker that keeps cached metrics fresh.
+
+Every --interval seconds it picks the auto_refresh MetricsCache rows that
+are invalidated or about to pass their refresh_interval and recomputes
+them on a bounded thread pool, so readers keep getting cached (or briefly
+stale) values instead of waiting on a calculation.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from metrics.refresher import MetricRefresher, find_due_metrics
+
+
+class Command(BaseCommand):
+    help = 'Continuously refresh cached metrics shortly before they expire'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of metrics computed in parallel (default: 4)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=15,
+            help='Seconds between scans for metrics due a refresh (default: 15)',
+        )
+        parser.add_argument(
+            '--lead-seconds',
+            type=int,
+            default=60,
+            help='Refresh metrics this many seconds before they expire (default: 60)',
+        )
+        parser.add_argument(
+            '--lead-factor',
+            type=float,
+            default=3.0,
+            help='Also refresh this many average compute times before expiry (default: 3.0)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run a single scan, wait for its refreshes and exit',
+        )
+
+    def handle(self, *args, **options):
+        refresher = MetricRefresher(options['workers'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"🔄 Metrics refresher started with {options['workers']} workers")
+        )
+
+        try:
+            while True:
+                due = find_due_metrics(options['lead_seconds'], options['lead_factor'])
+                submitted = 0
+                for row in due:
+                    if refresher.submit(row.metric_type, row.metric_key, row.compute_kwargs):
+                        submitted += 1
+
+                if submitted:
+                    self.stdout.write(f'Scheduled {submitted} of {len(due)} due metrics')
+
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Stopping metrics refresher...'))
+        finally:
+            refresher.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS('Metrics refresher stopped'))
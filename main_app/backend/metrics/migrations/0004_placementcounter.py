@@ -0,0 +1,68 @@
+# Generated by Django 3.2.25 on 2026-10-16 23:47
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_placement_counters(apps, schema_editor):
+    """Seed the counters from existing profiles and applications"""
+    PlacementCounter = apps.get_model('metrics', 'PlacementCounter')
+    StudentProfile = apps.get_model('accounts', 'StudentProfile')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+
+    totals = {}
+
+    def add(passout_year, branch, status, count):
+        key = (passout_year or 0, branch or '', status)
+        totals[key] = totals.get(key, 0) + count
+
+    for row in StudentProfile.objects.values('passout_year', 'branch').annotate(total=Count('id')).order_by():
+        add(row['passout_year'], row['branch'], 'STUDENTS', row['total'])
+
+    year_field = 'applicant__student_profile__passout_year'
+    branch_field = 'applicant__student_profile__branch'
+
+    for row in JobApplication.objects.values(year_field, branch_field, 'status').annotate(total=Count('id')).order_by():
+        add(row[year_field], row[branch_field], row['status'], row['total'])
+
+    hired = JobApplication.objects.filter(status='HIRED').values(year_field, branch_field)
+    for row in hired.annotate(total=Count('applicant', distinct=True)).order_by():
+        add(row[year_field], row[branch_field], 'PLACED', row['total'])
+
+    PlacementCounter.objects.bulk_create([
+        PlacementCounter(passout_year=passout_year, branch=branch, status=status, count=count)
+        for (passout_year, branch, status), count in totals.items()
+        if count
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0003_alter_metricscache_metric_type'),
+        ('accounts', '0023_studentprofile_numeric_gpa'),
+        ('jobs', '0021_candidatecard_candidatecomment_pipelinestage_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlacementCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('passout_year', models.IntegerField(default=0)),
+                ('branch', models.CharField(blank=True, default='', max_length=100)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='placementcounter',
+            index=models.Index(fields=['status', 'passout_year'], name='metrics_pla_status_2b1db1_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='placementcounter',
+            unique_together={('passout_year', 'branch', 'status')},
+        ),
+        migrations.RunPython(populate_placement_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-16 23:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0004_placementcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='metricscache',
+            name='avg_compute_ms',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='metricscache',
+            name='compute_kwargs',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='metricscache',
+            name='last_compute_ms',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:02
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+
+def populate_monthly_rollups(apps, schema_editor):
+    """Seed the rollups from existing applications"""
+    ApplicationMonthlyRollup = apps.get_model('metrics', 'ApplicationMonthlyRollup')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+
+    rows = JobApplication.objects.annotate(
+        month_start=TruncMonth('applied_at', tzinfo=timezone.get_current_timezone())
+    ).values('month_start', 'status').annotate(total=Count('id')).order_by()
+
+    ApplicationMonthlyRollup.objects.bulk_create([
+        ApplicationMonthlyRollup(
+            year=row['month_start'].year, month=row['month_start'].month,
+            status=row['status'], count=row['total'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0005_metricscache_compute_tracking'),
+        ('jobs', '0021_candidatecard_candidatecomment_pipelinestage_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='applicationmonthlyrollup',
+            index=models.Index(fields=['year', 'month'], name='metrics_app_year_09dde9_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='applicationmonthlyrollup',
+            unique_together={('year', 'month', 'status')},
+        ),
+        migrations.RunPython(populate_monthly_rollups, migrations.RunPython.noop),
+    ]
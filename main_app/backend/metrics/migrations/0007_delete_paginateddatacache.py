@@ -0,0 +1,16 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0006_applicationmonthlyrollup'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='PaginatedDataCache',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:04
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0007_delete_paginateddatacache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FrozenYearMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField(unique=True)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('frozen_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-year'],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 import json
 
@@ -31,6 +32,9 @@ class MetricsCache(models.Model):
     is_valid = models.BooleanField(default=True)  # To mark if data needs refresh
     auto_refresh = models.BooleanField(default=True)  # Auto-refresh when data changes
     refresh_interval = models.IntegerField(default=30)  # Refresh interval in minutes
+    compute_kwargs = models.JSONField(null=True, blank=True)  # Calculator arguments, so the key can be recomputed
+    last_compute_ms = models.FloatField(null=True, blank=True)  # Duration of the latest calculation
+    avg_compute_ms = models.FloatField(null=True, blank=True)  # Moving average of calculation time
     
     class Meta:
         unique_together = ['metric_type', 'metric_key']
@@ -43,39 +47,87 @@ class MetricsCache(models.Model):
     def __str__(self):
         return f"{self.metric_type} - {self.metric_key}"
     
+    # Weight of the newest sample in avg_compute_ms
+    COMPUTE_TIME_SMOOTHING = 0.3
+
     @classmethod
-    def get_cached_metric(cls, metric_type, metric_key='default', max_age_minutes=30):
+    def get_valid_entry(cls, metric_type, metric_key='default', max_age_minutes=None):
         """
-        Get cached metric data, return None if not found or expired
+        Get the cache row for a metric, return None if not found or expired.
+        Expiry defaults to the row's own refresh_interval.
+        """
+        cache_obj = cls.get_entry(metric_type, metric_key)
+        if cache_obj is None:
+            return None
+
+        if max_age_minutes is None:
+            max_age_minutes = cache_obj.refresh_interval
+
+        # Check if cache is still valid
+        if cache_obj.age_seconds() > (max_age_minutes * 60):
+            return None
+
+        return cache_obj
+
+    @classmethod
+    def get_entry(cls, metric_type, metric_key='default'):
+        """
+        Get the valid (not invalidated) cache row for a metric, whatever its age
         """
         try:
-            cache_obj = cls.objects.get(
+            return cls.objects.get(
                 metric_type=metric_type,
                 metric_key=metric_key,
                 is_valid=True
             )
-            
-            # Check if cache is still valid
-            age = timezone.now() - cache_obj.last_updated
-            if age.total_seconds() > (max_age_minutes * 60):
-                return None
-                
-            return cache_obj.data
         except cls.DoesNotExist:
             return None
+
+    def is_expired(self):
+        return self.remaining_ttl_seconds() <= 0
+
+    @classmethod
+    def get_cached_metric(cls, metric_type, metric_key='default', max_age_minutes=None):
+        """
+        Get cached metric data, return None if not found or expired
+        """
+        cache_obj = cls.get_valid_entry(metric_type, metric_key, max_age_minutes)
+        return cache_obj.data if cache_obj else None
+
+    def age_seconds(self):
+        return (timezone.now() - self.last_updated).total_seconds()
+
+    def remaining_ttl_seconds(self):
+        """Seconds until this row passes its refresh_interval"""
+        return self.refresh_interval * 60 - self.age_seconds()
     
     @classmethod
-    def update_metric(cls, metric_type, metric_key='default', data=None):
+    def update_metric(cls, metric_type, metric_key='default', data=None, compute_kwargs=None, compute_ms=None):
         """
-        Update or create cached metric data
+        Update or create cached metric data, recording how it was computed
+        and how long that took when known
         """
+        defaults = {
+            'data': data,
+            'is_valid': True
+        }
+        if compute_kwargs is not None:
+            defaults['compute_kwargs'] = compute_kwargs
+        if compute_ms is not None:
+            previous_ms = cls.objects.filter(
+                metric_type=metric_type, metric_key=metric_key
+            ).values_list('avg_compute_ms', flat=True).first()
+            defaults['last_compute_ms'] = round(compute_ms, 2)
+            defaults['avg_compute_ms'] = round(
+                compute_ms if previous_ms is None else
+                previous_ms + cls.COMPUTE_TIME_SMOOTHING * (compute_ms - previous_ms),
+                2
+            )
+
         cache_obj, created = cls.objects.update_or_create(
             metric_type=metric_type,
             metric_key=metric_key,
-            defaults={
-                'data': data,
-                'is_valid': True
-            }
+            defaults=defaults
         )
         return cache_obj
     
@@ -84,94 +136,211 @@ class MetricsCache(models.Model):
         """
         Invalidate cached metrics (mark for refresh)
         """
+        from .cache import invalidate_metric
+
         queryset = cls.objects.filter(metric_type=metric_type)
         if metric_key:
             queryset = queryset.filter(metric_key=metric_key)
         
         queryset.update(is_valid=False)
+        invalidate_metric(metric_type, metric_key)
 
+    @classmethod
+    def invalidate_keys(cls, metric_type, metric_keys):
+        """
+        Invalidate several keys of one metric type with a single UPDATE
+        """
+        from .cache import invalidate_metric
+
+        if not metric_keys:
+            return
+
+        cls.objects.filter(metric_type=metric_type, metric_key__in=metric_keys).update(is_valid=False)
+        for metric_key in metric_keys:
+            invalidate_metric(metric_type, metric_key)
 
-class PaginatedDataCache(models.Model):
+
+def _adjust_count(model, lookup, delta):
     """
-    Model to store paginated data to improve loading performance
+    Add delta to the count of the counter row matching lookup with a single
+    UPDATE, creating the row the first time its key is seen.
     """
-    CACHE_TYPES = [
-        ('students_list', 'Students List'),
-        ('companies_list', 'Companies List'),
-        ('jobs_list', 'Jobs List'),
-        ('applications_list', 'Applications List'),
-    ]
-    
-    cache_type = models.CharField(max_length=50, choices=CACHE_TYPES)
-    filter_hash = models.CharField(max_length=64)  # Hash of filter parameters
-    page_number = models.IntegerField()
-    page_size = models.IntegerField()
-    total_count = models.IntegerField()
-    data = models.JSONField()  # Store the paginated data
-    last_updated = models.DateTimeField(auto_now=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    is_valid = models.BooleanField(default=True)
-    
+    if model.objects.filter(**lookup).update(count=models.F('count') + delta):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **lookup)
+    except IntegrityError:
+        # Created concurrently by another writer
+        model.objects.filter(**lookup).update(count=models.F('count') + delta)
+
+
+def _adjust_counts(model, key_fields, deltas):
+    """
+    Apply {key: delta} to the counter rows of model, key being a tuple of
+    the key_fields values: one lookup, one bulk UPDATE for the existing
+    rows and _adjust_count() for keys seen for the first time.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    candidates = model.objects.filter(**{
+        f'{field}__in': {key[index] for key in deltas}
+        for index, field in enumerate(key_fields)
+    })
+    existing = {tuple(row[1:]): row[0] for row in candidates.values_list('pk', *key_fields)}
+
+    updates = []
+    for key, delta in deltas.items():
+        if key in existing:
+            updates.append(model(pk=existing[key], count=models.F('count') + delta))
+        else:
+            _adjust_count(model, dict(zip(key_fields, key)), delta)
+    model.objects.bulk_update(updates, ['count'])
+
+
+class PlacementCounter(models.Model):
+    """
+    Running counts keyed by (passout_year, branch, status), kept up to date
+    by the JobApplication/StudentProfile signals so placement figures can
+    be read without re-counting applications.
+
+    status is a JobApplication status (applications in that status) or one
+    of the pseudo-statuses below. Students without a profile year or branch
+    are counted under UNKNOWN_YEAR / an empty branch.
+    """
+    STUDENTS = 'STUDENTS'  # student profiles
+    PLACED = 'PLACED'      # distinct students with at least one HIRED application
+    UNKNOWN_YEAR = 0
+
+    passout_year = models.IntegerField(default=UNKNOWN_YEAR)
+    branch = models.CharField(max_length=100, blank=True, default='')
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
-        unique_together = ['cache_type', 'filter_hash', 'page_number', 'page_size']
+        unique_together = ['passout_year', 'branch', 'status']
         indexes = [
-            models.Index(fields=['cache_type', 'filter_hash']),
-            models.Index(fields=['last_updated']),
-            models.Index(fields=['is_valid']),
+            models.Index(fields=['status', 'passout_year']),
         ]
-    
+
     def __str__(self):
-        return f"{self.cache_type} - Page {self.page_number} ({self.page_size} per page)"
-    
+        return f"{self.passout_year} / {self.branch or '-'} / {self.status}: {self.count}"
+
+    @staticmethod
+    def key_for(passout_year, branch):
+        """Normalise a profile's (passout_year, branch) into a counter key"""
+        return (passout_year or PlacementCounter.UNKNOWN_YEAR, branch or '')
+
     @classmethod
-    def get_cached_page(cls, cache_type, filter_hash, page_number, page_size, max_age_minutes=15):
+    def adjust(cls, key, status, delta):
         """
-        Get cached page data
+        Add delta to one counter with a single UPDATE, creating the row the
+        first time the key is seen.
         """
-        try:
-            cache_obj = cls.objects.get(
-                cache_type=cache_type,
-                filter_hash=filter_hash,
-                page_number=page_number,
-                page_size=page_size,
-                is_valid=True
-            )
-            
-            # Check if cache is still valid
-            age = timezone.now() - cache_obj.last_updated
-            if age.total_seconds() > (max_age_minutes * 60):
-                return None
-                
-            return {
-                'data': cache_obj.data,
-                'total_count': cache_obj.total_count,
-                'page_number': cache_obj.page_number,
-                'page_size': cache_obj.page_size
-            }
-        except cls.DoesNotExist:
-            return None
-    
+        if not delta:
+            return
+
+        passout_year, branch = key
+        _adjust_count(cls, {'passout_year': passout_year, 'branch': branch, 'status': status}, delta)
+
+    @classmethod
+    def adjust_many(cls, deltas):
+        """Apply {(key, status): delta} in a few queries"""
+        _adjust_counts(cls, ('passout_year', 'branch', 'status'), {
+            (passout_year, branch, status): delta
+            for ((passout_year, branch), status), delta in deltas.items()
+        })
+
     @classmethod
-    def update_cached_page(cls, cache_type, filter_hash, page_number, page_size, data, total_count):
+    def total(cls, statuses, years=None, max_year=None):
         """
-        Update or create cached page data
+        Sum one or more statuses across branches. years restricts to those
+        passout years; max_year keeps known years up to and including it.
         """
-        cache_obj, created = cls.objects.update_or_create(
-            cache_type=cache_type,
-            filter_hash=filter_hash,
-            page_number=page_number,
-            page_size=page_size,
-            defaults={
-                'data': data,
-                'total_count': total_count,
-                'is_valid': True
-            }
+        if isinstance(statuses, str):
+            statuses = [statuses]
+        queryset = cls.objects.filter(status__in=statuses)
+        if years is not None:
+            queryset = queryset.filter(passout_year__in=years)
+        if max_year is not None:
+            queryset = queryset.filter(passout_year__gt=cls.UNKNOWN_YEAR, passout_year__lte=max_year)
+        return queryset.aggregate(total=models.Sum('count'))['total'] or 0
+
+    @classmethod
+    def by_branch(cls, status, passout_year):
+        """{branch: count} for one status and passout year"""
+        return dict(
+            cls.objects.filter(status=status, passout_year=passout_year)
+            .values_list('branch', 'count')
         )
-        return cache_obj
-    
+
+
+class ApplicationMonthlyRollup(models.Model):
+    """
+    Number of applications per (year, month applied, current status),
+    kept up to date by the JobApplication signals. Months are taken in the
+    current time zone, matching applied_at__date filters.
+    """
+    year = models.IntegerField()
+    month = models.PositiveSmallIntegerField()
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['year', 'month', 'status']
+        indexes = [
+            models.Index(fields=['year', 'month']),
+        ]
+
+    def __str__(self):
+        return f"{self.year}-{self.month:02d} / {self.status}: {self.count}"
+
     @classmethod
-    def invalidate_cache(cls, cache_type):
-        """
-        Invalidate all cached pages for a cache type
-        """
-        cls.objects.filter(cache_type=cache_type).update(is_valid=False)
+    def adjust(cls, applied_at, status, delta):
+        """Add delta to the counter for the month an application was made in"""
+        if not delta:
+            return
+
+        year, month = cls.month_of(applied_at)
+        _adjust_count(cls, {'year': year, 'month': month, 'status': status}, delta)
+
+    @classmethod
+    def adjust_many(cls, deltas):
+        """Apply {(year, month, status): delta} in a few queries"""
+        _adjust_counts(cls, ('year', 'month', 'status'), deltas)
+
+    @staticmethod
+    def month_of(applied_at):
+        """(year, month) an application made at applied_at is counted under"""
+        local = timezone.localtime(applied_at)
+        return local.year, local.month
+
+
+class FrozenYearMetrics(models.Model):
+    """
+    Metrics of a passout year as they were before its applications were
+    archived (see metrics.frozen), served in place of the live figures,
+    which no longer count the archived applications.
+    """
+    # Dashboard figures counted from applications, replaced by the frozen ones
+    DASHBOARD_FIELDS = ('total_applications', 'pending_applications', 'placement_rate')
+
+    year = models.PositiveIntegerField(unique=True)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    frozen_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-year']
+
+    def __str__(self):
+        return f"{self.year} (frozen {self.frozen_at:%Y-%m-%d})"
+
+    @classmethod
+    def data_for(cls, year):
+        """Frozen metrics of a passout year, or None if it has none"""
+        return cls.objects.filter(year=year).values_list('data', flat=True).first()
@@ -0,0 +1,270 @@
+"""
+Compressed page cache for the cached list endpoints.
+
+Pages live in the Django cache backend as zlib-compressed JSON, under keys
+that embed a per-tag version (one tag per cache type, e.g.
+'students_list'). Invalidating a tag writes a new version: pages written
+under the old one are never read again and are the first to go when
+space is needed.
+
+A shared index (one cache entry) tracks the size, version and last use of
+every stored page, and writes evict least recently used pages until the
+total fits PAGE_CACHE_BYTE_BUDGET. Reads only note the access in process
+memory; those touches are folded into the index on this process's next
+write, so recency is approximate but hits never write to the backend. A
+write that finds the index locked by another process queues its entry the
+same way, so every page is counted against the budget.
+
+Tag versions live in the default cache, shared by every process, and are
+read through the metrics generation cache (metrics.cache), so a hit is a
+single read of the page. Pages and the index go to the PAGE_CACHE_ALIAS
+cache, the default one unless settings point it elsewhere (e.g. a
+Memcached instance next to a database backed default cache).
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .cache import generation_cache
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_ALIAS = getattr(settings, 'PAGE_CACHE_ALIAS', 'default')
+BYTE_BUDGET = getattr(settings, 'PAGE_CACHE_BYTE_BUDGET', 32 * 1024 * 1024)
+DEFAULT_TTL_SECONDS = getattr(settings, 'PAGE_CACHE_TTL_SECONDS', 15 * 60)
+COMPRESSION_LEVEL = 6
+INDEX_LOCK_TIMEOUT = 5
+
+# Pages bigger than this share of the budget are served but not cached
+MAX_PAGE_SHARE = 0.25
+
+
+def encode_page(value):
+    return zlib.compress(
+        json.dumps(value, cls=DjangoJSONEncoder, separators=(',', ':')).encode(),
+        COMPRESSION_LEVEL
+    )
+
+
+def decode_page(blob):
+    return json.loads(zlib.decompress(blob))
+
+
+class PageStore:
+    """
+    Versioned, byte-budgeted page cache on top of the Django cache backend.
+    """
+
+    def __init__(self, namespace='pages', byte_budget=BYTE_BUDGET, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.namespace = namespace
+        self.byte_budget = byte_budget
+        self.ttl_seconds = ttl_seconds
+        self._touched = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @property
+    def pages(self):
+        """Cache backend holding the pages and the index"""
+        return caches[PAGE_CACHE_ALIAS]
+
+    def _version_key(self, tag):
+        return f"{self.namespace}:ver:{tag}"
+
+    def _page_key(self, tag, version, key):
+        return f"{self.namespace}:page:{tag}:{version}:{key}"
+
+    @property
+    def _index_key(self):
+        return f"{self.namespace}:index"
+
+    @property
+    def _index_lock_key(self):
+        return f"{self.namespace}:index-lock"
+
+    def version(self, tag):
+        version_key = self._version_key(tag)
+        return generation_cache.get_many([version_key])[version_key]
+
+    def get(self, tag, key):
+        """Return the cached value for key under tag, or None"""
+        page_key = self._page_key(tag, self.version(tag), key)
+        blob = self.pages.get(page_key)
+        if blob is None:
+            return None
+
+        with self._lock:
+            self._touched[page_key] = time.time()
+
+        try:
+            return decode_page(blob)
+        except (zlib.error, ValueError):
+            logger.warning(f"Discarding unreadable cached page {page_key}")
+            self.pages.delete(page_key)
+            return None
+
+    def set(self, tag, key, value, ttl_seconds=None):
+        """Store value under tag/key and evict pages beyond the byte budget"""
+        ttl_seconds = ttl_seconds or self.ttl_seconds
+        blob = encode_page(value)
+        if len(blob) > self.byte_budget * MAX_PAGE_SHARE:
+            return False
+
+        version = self.version(tag)
+        page_key = self._page_key(tag, version, key)
+        self.pages.set(page_key, blob, ttl_seconds)
+
+        now = time.time()
+        self._update_index(page_key, {
+            'tag': tag,
+            'version': version,
+            'size': len(blob),
+            'created': now,
+            'used': now,
+            'expires': now + ttl_seconds,
+        })
+        return True
+
+    def invalidate(self, tag):
+        """Drop every page of a tag by moving it to a new version"""
+        # A fresh value rather than incr(), which the database backend runs
+        # as a read then a write: two racing invalidations could both land
+        # on the same version and leave a page cached in between readable
+        version = uuid.uuid4().hex
+        cache.set(self._version_key(tag), version, None)
+        generation_cache.set(self._version_key(tag), version)
+
+    def clear(self):
+        """Remove every page and the index"""
+        index = self.pages.get(self._index_key) or {}
+        self.pages.delete_many(list(index) + [self._index_key])
+        with self._lock:
+            self._touched.clear()
+            self._pending.clear()
+        return len(index)
+
+    def purge_invalid(self):
+        """Delete expired pages and pages of outdated versions right away"""
+        if not self.pages.add(self._index_lock_key, True, INDEX_LOCK_TIMEOUT):
+            return 0
+
+        try:
+            index = self.pages.get(self._index_key) or {}
+            now = time.time()
+            versions = {}
+            purged = []
+            for page_key, entry in index.items():
+                if entry['tag'] not in versions:
+                    versions[entry['tag']] = self.version(entry['tag'])
+                if entry['expires'] <= now or entry['version'] != versions[entry['tag']]:
+                    purged.append(page_key)
+
+            for page_key in purged:
+                del index[page_key]
+            if purged:
+                self.pages.delete_many(purged)
+                self.pages.set(self._index_key, index, None)
+            return len(purged)
+        finally:
+            self.pages.delete(self._index_lock_key)
+
+    def stats(self):
+        """Entry counts, sizes and distributions from the shared index"""
+        index = self.pages.get(self._index_key) or {}
+        now = time.time()
+        versions = {}
+        entries = []
+        for page_key, entry in index.items():
+            if entry['expires'] <= now:
+                continue
+            if entry['tag'] not in versions:
+                versions[entry['tag']] = self.version(entry['tag'])
+            entries.append((page_key, entry, entry['version'] == versions[entry['tag']]))
+
+        type_counts = {}
+        for _, entry, current in entries:
+            if current:
+                type_counts[entry['tag']] = type_counts.get(entry['tag'], 0) + 1
+
+        return {
+            'total_entries': len(entries),
+            'valid_entries': sum(1 for _, _, current in entries if current),
+            'invalid_entries': sum(1 for _, _, current in entries if not current),
+            'total_bytes': sum(entry['size'] for _, entry, _ in entries),
+            'byte_budget': self.byte_budget,
+            'recent_entries': sum(1 for _, entry, _ in entries if now - entry['created'] <= 15 * 60),
+            'old_entries': sum(1 for _, entry, _ in entries if now - entry['created'] > 30 * 60),
+            'type_distribution': [
+                {'cache_type': tag, 'count': count}
+                for tag, count in sorted(type_counts.items(), key=lambda item: -item[1])
+            ],
+        }
+
+    def _update_index(self, page_key, entry):
+        with self._lock:
+            self._pending[page_key] = entry
+        if not self.pages.add(self._index_lock_key, True, INDEX_LOCK_TIMEOUT):
+            # Another process is rewriting the index; the entry stays queued
+            # and is merged on this process's next rewrite
+            return
+
+        try:
+            index = self.pages.get(self._index_key) or {}
+
+            with self._lock:
+                touched, self._touched = self._touched, {}
+                pending, self._pending = self._pending, {}
+            index.update(pending)
+            for touched_key, used in touched.items():
+                if touched_key in index:
+                    index[touched_key]['used'] = max(index[touched_key]['used'], used)
+
+            evicted = self._evict(index)
+            if evicted:
+                self.pages.delete_many(evicted)
+            self.pages.set(self._index_key, index, None)
+        finally:
+            self.pages.delete(self._index_lock_key)
+
+    def _evict(self, index):
+        """
+        Trim index to the byte budget in place and return the evicted keys:
+        expired pages first, then pages of outdated versions, then the
+        least recently used.
+        """
+        now = time.time()
+        versions = {}
+
+        def is_current(entry):
+            if entry['tag'] not in versions:
+                versions[entry['tag']] = self.version(entry['tag'])
+            return entry['version'] == versions[entry['tag']]
+
+        evicted = [key for key, entry in index.items() if entry['expires'] <= now]
+        for key in evicted:
+            del index[key]
+
+        total = sum(entry['size'] for entry in index.values())
+        if total <= self.byte_budget:
+            return evicted
+
+        candidates = sorted(index.items(), key=lambda item: (is_current(item[1]), item[1]['used']))
+        for key, entry in candidates:
+            if total <= self.byte_budget:
+                break
+            total -= entry['size']
+            del index[key]
+            evicted.append(key)
+
+        return evicted
+
+
+page_store = PageStore()
@@ -0,0 +1,112 @@
+"""
+Background recomputation of cached metrics.
+
+MetricRefresher runs refresh_metric() on a bounded thread pool, keeping at
+most one pending refresh per (metric_type, metric_key). Web processes use
+the module-level background_refresher to revalidate a stale metric after
+serving it; the run_metrics_refresher command drives its own instance from
+find_due_metrics() so rows are recomputed shortly before they expire.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from .models import MetricsCache
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_WORKERS = getattr(settings, 'METRICS_REFRESH_WORKERS', 2)
+
+
+class MetricRefresher:
+    """
+    Bounded pool of refresh workers. submit() never blocks: a metric that
+    is already queued or running, or a full queue, is simply skipped.
+    """
+
+    def __init__(self, max_workers, max_pending=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * 4
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, metric_type, metric_key, kwargs=None):
+        key = (metric_type, metric_key)
+        with self._lock:
+            if key in self._pending or len(self._pending) >= self.max_pending:
+                return False
+            self._pending.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='metrics-refresh'
+                )
+
+        self._executor.submit(self._run, metric_type, metric_key, kwargs or {})
+        return True
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def is_pending(self, metric_type, metric_key):
+        with self._lock:
+            return (metric_type, metric_key) in self._pending
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _run(self, metric_type, metric_key, kwargs):
+        from .utils import refresh_metric
+
+        close_old_connections()
+        try:
+            if refresh_metric(metric_type, metric_key, **kwargs):
+                logger.info(f"Refreshed {metric_type}/{metric_key}")
+        except Exception as e:
+            logger.error(f"Background refresh of {metric_type}/{metric_key} failed: {str(e)}", exc_info=True)
+        finally:
+            with self._lock:
+                self._pending.discard((metric_type, metric_key))
+            connection.close()
+
+
+background_refresher = MetricRefresher(BACKGROUND_WORKERS)
+
+
+def find_due_metrics(lead_seconds=60, lead_factor=3.0):
+    """
+    auto_refresh rows that are invalidated or will expire soon.
+
+    A row is due once its remaining lifetime drops below the larger of
+    lead_seconds and lead_factor times its average compute time, so slow
+    metrics start refreshing earlier. Rows whose calculator arguments were
+    never recorded are only refreshed for the 'default' key.
+    """
+    now = timezone.now()
+    rows = MetricsCache.objects.filter(auto_refresh=True).only(
+        'metric_type', 'metric_key', 'last_updated', 'is_valid',
+        'refresh_interval', 'compute_kwargs', 'avg_compute_ms'
+    )
+
+    due = []
+    for row in rows:
+        if row.compute_kwargs is None and row.metric_key != 'default':
+            continue
+
+        lead = max(lead_seconds, (row.avg_compute_ms or 0) / 1000 * lead_factor)
+        remaining = row.refresh_interval * 60 - (now - row.last_updated).total_seconds()
+        if not row.is_valid or remaining <= lead:
+            due.append(row)
+
+    # Most overdue first
+    due.sort(key=lambda row: (row.is_valid, row.last_updated))
+    return due
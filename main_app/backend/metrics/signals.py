@@ -1,10 +1,13 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
 from django.dispatch import receiver
 
 from companies.models import Company
 from accounts.models import StudentProfile
 from jobs.models import JobPosting, JobApplication
-from .utils import invalidate_related_metrics, invalidate_paginated_cache
+from jobs.signals import applications_status_changed, previous_status, stored_status
+from .models import PlacementCounter
+from .dependencies import record_change
+from . import counters
 
 
 @receiver(post_save, sender=Company)
@@ -13,38 +16,31 @@ def invalidate_company_metrics(sender, **kwargs):
     """
     Invalidate metrics when company data changes
     """
-    invalidate_related_metrics('company')
-    invalidate_paginated_cache('companies_list')
+    record_change('company')
+
+
+# Invalidation runs after the counters and rollups are written: outside
+# transaction.atomic() record_change() flushes at once, and a metric read
+# between the two would be cached under the new generation with the old
+# counts. Saves invalidate from the counter handlers; deletes adjust the
+# counters in pre_delete and invalidate in post_delete.
+
+def record_student_change(instance, old_key):
+    """Invalidate metrics for the student's passout year and branch, before and after the change"""
+    keys = {PlacementCounter.key_for(instance.passout_year, instance.branch)}
+    if old_key:
+        keys.add(old_key)
+
+    record_change(
+        'student',
+        years=[year for year, _ in keys],
+        departments=[branch for _, branch in keys],
+    )
 
 
-@receiver(post_save, sender=StudentProfile)
 @receiver(post_delete, sender=StudentProfile)
 def invalidate_student_metrics(sender, instance=None, **kwargs):
-    """
-    Invalidate metrics when student data changes
-    """
-    invalidate_related_metrics('student')
-    invalidate_paginated_cache('students_list')
-
-    # Also invalidate department and placement stats
-    from .models import MetricsCache
-    MetricsCache.invalidate_metric('department_stats')
-    MetricsCache.invalidate_metric('placement_stats')
-    MetricsCache.invalidate_metric('enhanced_student_stats')
-    MetricsCache.invalidate_metric('student_department_breakdown')
-    MetricsCache.invalidate_metric('student_year_analysis')
-
-    # If department-specific year analysis exists, invalidate those too
-    if instance and instance.branch:
-        dept_key = f"dept_{instance.branch}"
-        MetricsCache.invalidate_metric('student_year_analysis', dept_key)
-
-    # If this is a current year student, invalidate dashboard stats too
-    if instance and hasattr(instance, 'passout_year'):
-        from django.utils import timezone
-        current_year = timezone.now().year
-        if instance.passout_year == current_year:
-            MetricsCache.invalidate_metric('dashboard_stats')
+    record_student_change(instance, getattr(instance, '_counted_key', None))
 
 
 @receiver(post_save, sender=JobPosting)
@@ -53,27 +49,106 @@ def invalidate_job_metrics(sender, **kwargs):
     """
     Invalidate metrics when job data changes
     """
-    invalidate_related_metrics('job')
-    invalidate_paginated_cache('jobs_list')
+    record_change('job')
+
+
+def record_application_change(instance, old_status):
+    """Invalidate metrics for the applicant's passout year and branch"""
+    passout_year, branch = counters.application_student_key(instance)
+    record_change('application', years=[passout_year], departments=[branch])
+    if counters.HIRED in (instance.status, old_status):
+        record_change('placement')
 
 
-@receiver(post_save, sender=JobApplication)
 @receiver(post_delete, sender=JobApplication)
 def invalidate_application_metrics(sender, instance=None, **kwargs):
+    record_application_change(instance, stored_status(instance))
+
+
+# Keep PlacementCounter in step with application status transitions. The
+# status a save moves between is tracked by jobs.signals for every
+# receiver (previous_status / stored_status).
+@receiver(pre_save, sender=JobApplication)
+def forget_student_key(sender, instance, **kwargs):
+    # The applicant's key is resolved afresh for every write; their profile
+    # may have moved since this instance last saved
+    instance.__dict__.pop('_student_key', None)
+
+
+@receiver(post_save, sender=JobApplication)
+def update_application_counters(sender, instance, created, raw=False, **kwargs):
+    old_status = None if created else previous_status(instance)
+    if raw:
+        record_application_change(instance, old_status)
+        return
+    counters.application_changed(instance, old_status, instance.status)
+    record_application_change(instance, old_status)
+
+
+@receiver(pre_delete, sender=JobApplication)
+def remove_application_counters(sender, instance, **kwargs):
+    # Runs before the delete so the applicant's profile can still be looked up
+    # when the application is going away as part of a user cascade.
+    instance.__dict__.pop('_student_key', None)
+    counters.application_changed(instance, stored_status(instance, instance.status), None)
+
+
+@receiver(applications_status_changed, sender=JobApplication)
+def apply_bulk_status_change(sender, transitions, **kwargs):
     """
-    Invalidate metrics when application data changes
+    Counters, rollups and invalidation for a set-based status change, once
+    for the whole batch rather than per application
     """
-    invalidate_related_metrics('application')
-    invalidate_paginated_cache('applications_list')
+    keys = counters.applications_changed(transitions)
+    if not keys:
+        return
+
+    record_change(
+        'application',
+        years=[year for year, _ in keys],
+        departments=[branch for _, branch in keys],
+    )
+    if any(counters.HIRED in (old_status, new_status) for _, old_status, new_status in transitions):
+        record_change('placement')
+
+    from companies.utils import update_company_job_stats
+    job_ids = {application.job_id for application, _, _ in transitions}
+    company_ids = JobPosting.objects.filter(pk__in=job_ids).values_list('company_id', flat=True).order_by().distinct()
+    for company_id in company_ids:
+        if company_id:
+            update_company_job_stats(company_id)
+
+
+@receiver(post_init, sender=StudentProfile)
+def remember_student_key(sender, instance, **kwargs):
+    if instance.pk and not {'passout_year', 'branch'} & instance.get_deferred_fields():
+        instance._counted_key = PlacementCounter.key_for(instance.passout_year, instance.branch)
+
+
+@receiver(pre_save, sender=StudentProfile)
+def load_student_key(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk or hasattr(instance, '_counted_key'):
+        return
+    row = StudentProfile.objects.filter(pk=instance.pk).values_list('passout_year', 'branch').first()
+    instance._counted_key = PlacementCounter.key_for(*row) if row else None
+
+
+@receiver(post_save, sender=StudentProfile)
+def update_student_counters(sender, instance, created, raw=False, **kwargs):
+    old_key = None if created else getattr(instance, '_counted_key', None)
+    if raw:
+        record_student_change(instance, old_key)
+        return
+    new_key = PlacementCounter.key_for(instance.passout_year, instance.branch)
+    counters.student_changed(instance, old_key, new_key)
+    record_student_change(instance, old_key)
+    instance._counted_key = new_key
 
-    # Also invalidate placement stats when application status changes
-    from .models import MetricsCache
-    MetricsCache.invalidate_metric('placement_stats')
-    MetricsCache.invalidate_metric('dashboard_stats')
 
-    # If this is a hiring decision, also invalidate department stats
-    if instance and instance.status == 'HIRED':
-        MetricsCache.invalidate_metric('department_stats')
+@receiver(pre_delete, sender=StudentProfile)
+def remove_student_counters(sender, instance, **kwargs):
+    old_key = getattr(instance, '_counted_key', None) or PlacementCounter.key_for(instance.passout_year, instance.branch)
+    counters.student_changed(instance, old_key, None)
 
 
 # Invalidate metrics when year management changes
@@ -81,27 +156,10 @@ def invalidate_application_metrics(sender, instance=None, **kwargs):
 @receiver(post_delete, sender='accounts.YearManagement')
 def invalidate_year_management_metrics(sender, **kwargs):
     """
-    Invalidate ALL metrics when year management changes (year toggled active/inactive)
+    Invalidate ALL student-related metrics when year management changes (year toggled active/inactive)
     This ensures dropdowns and counts update immediately across the entire application
     """
-    from .models import MetricsCache
-    
-    # Invalidate all student-related metrics
-    MetricsCache.invalidate_metric('dashboard_stats')
-    MetricsCache.invalidate_metric('student_stats')
-    MetricsCache.invalidate_metric('department_stats')
-    MetricsCache.invalidate_metric('placement_stats')
-    MetricsCache.invalidate_metric('enhanced_student_stats')
-    MetricsCache.invalidate_metric('student_department_breakdown')
-    MetricsCache.invalidate_metric('student_year_analysis')
-    
-    # Invalidate all department-specific year analysis caches
-    from accounts.models import StudentProfile
-    departments = StudentProfile.objects.values_list('branch', flat=True).distinct().exclude(branch__isnull=True).exclude(branch='')
-    for dept in departments:
-        dept_key = f"dept_{dept}"
-        MetricsCache.invalidate_metric('student_year_analysis', dept_key)
-    
+    record_change('year_management')
     print("✓ All metrics caches invalidated due to year management change")
 
 
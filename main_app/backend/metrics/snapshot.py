@@ -0,0 +1,86 @@
+"""
+Pre-serialized dashboard snapshot.
+
+The admin dashboard needs the dashboard, job, company, application and
+student metrics plus the application timeline. The snapshot bundles them
+into one JSON body that is serialized once and kept in the shared cache
+under the current generations of every metric in it. Any invalidation of
+one of those metrics moves the snapshot to a new cache key, so a stored
+body is never served after its inputs changed; bodies also expire after
+SNAPSHOT_TTL_SECONDS to pick up time-based refreshes of the metrics.
+
+The ETag is a hash of the body, so equal ETags mean byte-identical
+responses. The body carries no build time of its own (each metric has its
+last_updated), so rebuilding it every SNAPSHOT_TTL_SECONDS with unchanged
+metrics gives the same bytes and clients keep getting 304s.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import quote_etag
+
+from . import cache as metrics_cache
+from .utils import get_or_calculate_metric, calculate_application_timeline
+
+SNAPSHOT_TTL_SECONDS = getattr(settings, 'METRICS_SNAPSHOT_TTL_SECONDS', 60)
+
+# Section name -> cached metric type; the dashboard metric is keyed by year
+SNAPSHOT_METRICS = {
+    'dashboard': 'dashboard_stats',
+    'jobs': 'job_stats',
+    'companies': 'company_stats',
+    'applications': 'application_stats',
+    'students': 'enhanced_student_stats',
+}
+
+# Not a MetricsCache row: only its generation is tracked, so the timeline
+# section follows application changes like the cached metrics do
+TIMELINE_METRIC = 'application_timeline'
+
+
+def _metric_keys(year):
+    keys = {metric_type: 'default' for metric_type in SNAPSHOT_METRICS.values()}
+    keys['dashboard_stats'] = f"{year}" if year else 'all'
+    keys[TIMELINE_METRIC] = f"{year}" if year else 'all'
+    return keys
+
+
+def snapshot_version(year=None):
+    """Fingerprint of the generations of every metric in the snapshot"""
+    generations = metrics_cache.get_generations(_metric_keys(year).items())
+    return hashlib.md5(repr(sorted(generations.items())).encode()).hexdigest()
+
+
+def build_snapshot(year=None):
+    """Compute the snapshot payload (not cached)"""
+    keys = _metric_keys(year)
+    payload = {}
+    for section, metric_type in SNAPSHOT_METRICS.items():
+        kwargs = {'year': year} if metric_type == 'dashboard_stats' else {}
+        payload[section] = get_or_calculate_metric(metric_type, metric_key=keys[metric_type], **kwargs)
+
+    payload['timeline'] = calculate_application_timeline(year)
+    payload['year'] = year
+    return payload
+
+
+def get_snapshot(year=None):
+    """
+    Return (body, etag) for the snapshot, building and storing it if the
+    stored body is missing or was stored under older metric generations
+    """
+    # Read the version before computing, so an invalidation racing with
+    # the build leaves the stored body under a key nobody asks for again
+    cache_key = f"{metrics_cache.KEY_PREFIX}:snapshot:{year or 'all'}:{snapshot_version(year)}"
+    stored = cache.get(cache_key)
+    if stored is not None:
+        return stored['body'], stored['etag']
+
+    body = json.dumps(build_snapshot(year), cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+    etag = quote_etag(hashlib.sha256(body).hexdigest())
+    cache.set(cache_key, {'body': body, 'etag': etag}, SNAPSHOT_TTL_SECONDS)
+    return body, etag
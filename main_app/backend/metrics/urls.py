@@ -4,8 +4,13 @@ from . import views
 urlpatterns = [
     # Cached metrics endpoints
     path('metrics/', views.CachedMetricsView.as_view(), name='cached-metrics'),
+    path('metrics/snapshot/', views.DashboardSnapshotView.as_view(), name='dashboard-snapshot'),
     path('metrics/application-timeline/', views.ApplicationTimelineView.as_view(), name='application-timeline'),
     path('metrics/cache-status/', views.CacheStatusView.as_view(), name='cache-status'),
+    path('metrics/hiring/funnel/', views.HiringFunnelView.as_view(), name='hiring-funnel'),
+    path('metrics/hiring/latency/', views.StatusLatencyView.as_view(), name='status-latency'),
+    path('metrics/frozen-years/', views.FrozenYearListView.as_view(), name='frozen-years'),
+    path('metrics/frozen-years/<int:year>/', views.FrozenYearDetailView.as_view(), name='frozen-year-detail'),
     
     # Enhanced student metrics endpoints
     path('metrics/students/enhanced/', views.EnhancedStudentMetricsView.as_view(), name='enhanced-student-metrics'),
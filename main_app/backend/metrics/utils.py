@@ -1,34 +1,58 @@
-from django.db.models import Count, Q, F, Avg, Max, Min
+from django.conf import settings
+from django.db.models import Count, Q, F, Avg, Max, Min, Sum
 from django.utils import timezone
 from datetime import timedelta
 import hashlib
 import json
-
-from .models import MetricsCache, PaginatedDataCache
+import time
+
+from .models import MetricsCache, PlacementCounter, ApplicationMonthlyRollup, FrozenYearMetrics
+from . import cache as metrics_cache
+from .page_cache import page_store
+from .counters import APPLICATION_STATUSES
+from .analytics import (
+    StudentGPAFrame,
+    STUDENT_GPA_RANGES,
+    ENHANCED_GPA_RANGES,
+    PLACEMENT_READY_GPA,
+    EMPTY_GPA_STATS,
+)
 from companies.models import Company
 from accounts.models import StudentProfile, YearManagement
 from jobs.models import JobPosting, JobApplication
 
+# How long past its refresh_interval an auto_refresh metric may still be
+# served while a background refresh catches up
+STALE_GRACE_MINUTES = getattr(settings, 'METRICS_STALE_GRACE_MINUTES', 60)
+
+TIMELINE_MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Chart series each application status is counted under, besides 'sent'
+TIMELINE_STATUS_SERIES = {
+    'SHORTLISTED': 'interviews',
+    'HIRED': 'approved',
+    'REJECTED': 'rejected',
+    'APPLIED': 'pending',
+    'UNDER_REVIEW': 'pending',
+}
+
 
 def calculate_dashboard_stats(year=None):
     """
-    Calculate dashboard statistics
+    Calculate dashboard statistics.
+    Student and application figures come from PlacementCounter, or for an
+    archived passout year from its FrozenYearMetrics.
     """
-    # Base querysets
     job_queryset = JobPosting.objects.filter(is_active=True)
-    application_queryset = JobApplication.objects.all()
-    student_queryset = StudentProfile.objects.all()
-    
-    # Apply year filter if specified
+
+    # Passout years to count students/applications for; None means all
+    years = None
+    frozen = None
     if year and year != 'All':
         try:
-            year_int = int(year)
-            # Filter students by passout year
-            student_queryset = student_queryset.filter(passout_year=year_int)
-            # Filter applications by student's passout year
-            application_queryset = application_queryset.filter(
-                applicant__student_profile__passout_year=year_int
-            )
+            years = [int(year)]
+            frozen = FrozenYearMetrics.data_for(years[0])
             # Note: Jobs are not filtered by year as total active jobs is global
         except (ValueError, TypeError):
             pass  # If year is invalid, use all data
@@ -36,25 +60,26 @@ def calculate_dashboard_stats(year=None):
         # When no specific year is requested, filter by active years only
         active_years = YearManagement.get_active_years()
         if active_years:
-            student_queryset = student_queryset.filter(passout_year__in=active_years)
-            application_queryset = application_queryset.filter(
-                applicant__student_profile__passout_year__in=active_years
-            )
-    
+            years = active_years
+
     stats = {
         'total_jobs': job_queryset.count(),
-        'total_applications': application_queryset.count(),
-        'total_students': student_queryset.count(),
+        'total_applications': PlacementCounter.total(APPLICATION_STATUSES, years=years),
+        'total_students': PlacementCounter.total(PlacementCounter.STUDENTS, years=years),
         'total_companies': Company.objects.count(),  # Companies are not filtered by year
         'active_jobs': job_queryset.filter(is_published=True).count(),
-        'pending_applications': application_queryset.filter(status='APPLIED').count(),
+        'pending_applications': PlacementCounter.total('APPLIED', years=years),
         'hiring_companies': Company.objects.filter(
             job_postings__is_active=True
         ).distinct().count(),  # This might need adjustment for year filtering
         'placement_rate': calculate_placement_rate(year),
         'last_updated': timezone.now().isoformat()
     }
-    
+
+    if frozen:
+        # The year's applications are archived and no longer counted
+        stats.update({field: frozen['dashboard'][field] for field in FrozenYearMetrics.DASHBOARD_FIELDS})
+
     return stats
 
 
@@ -93,45 +118,15 @@ def calculate_student_stats():
     active_years = YearManagement.get_active_years()
     base_queryset = StudentProfile.objects.filter(passout_year__in=active_years) if active_years else StudentProfile.objects.all()
 
-    # Calculate GPA statistics manually since gpa is CharField
-    total_gpa = 0
-    gpa_count = 0
-    gpa_ranges = {
-        '9.0+': 0, '8.0-8.9': 0, '7.0-7.9': 0, 
-        '6.0-6.9': 0, 'Below 6.0': 0
-    }
-    
-    for student in base_queryset.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-        try:
-            gpa_value = float(student.gpa)
-            total_gpa += gpa_value
-            gpa_count += 1
-            
-            if gpa_value >= 9.0:
-                gpa_ranges['9.0+'] += 1
-            elif gpa_value >= 8.0:
-                gpa_ranges['8.0-8.9'] += 1
-            elif gpa_value >= 7.0:
-                gpa_ranges['7.0-7.9'] += 1
-            elif gpa_value >= 6.0:
-                gpa_ranges['6.0-6.9'] += 1
-            else:
-                gpa_ranges['Below 6.0'] += 1
-        except (ValueError, TypeError):
-            continue
-    
-    avg_gpa = (total_gpa / gpa_count) if gpa_count > 0 else 0
-    gpa_distribution = [{'gpa_range': k, 'count': v} for k, v in gpa_ranges.items()]
+    # GPA statistics from a single vectorised pass
+    gpa_frame = StudentGPAFrame.from_queryset(base_queryset)
+    gpa_summary = gpa_frame.summary()
+    gpa_distribution = gpa_frame.distribution(STUDENT_GPA_RANGES)
 
-    # Calculate placement ready manually (only for current year within active years)
+    # Placement ready (only for current year within active years)
     placement_ready = 0
     if current_year in active_years:
-        for student in base_queryset.filter(passout_year=current_year):
-            try:
-                if student.gpa and float(student.gpa) >= 6.0:
-                    placement_ready += 1
-            except (ValueError, TypeError):
-                continue
+        placement_ready = gpa_frame.for_year(current_year).count_at_least(PLACEMENT_READY_GPA)
 
     stats = {
         'total': base_queryset.count(),
@@ -150,7 +145,7 @@ def calculate_student_stats():
         'with_applications': StudentProfile.objects.filter(
             user__job_applications__isnull=False
         ).distinct().count(),
-        'average_gpa': round(avg_gpa, 2),
+        'average_gpa': gpa_summary['avg_gpa'],
         'gpa_distribution': gpa_distribution,
         'placement_ready': placement_ready,
         'last_updated': timezone.now().isoformat()
@@ -172,7 +167,7 @@ def calculate_department_stats():
     departments = base_queryset.values('branch').annotate(
         total_students=Count('id'),
         current_year_students=Count('id', filter=Q(passout_year=current_year)) if current_year in active_years else 0,
-        avg_gpa=Avg('gpa'),
+        avg_gpa=Avg('gpa_numeric'),
         with_applications=Count('id', filter=Q(user__job_applications__isnull=False), distinct=True),
         placed_students=Count('id', filter=Q(user__job_applications__status='HIRED'), distinct=True)
     ).order_by('-total_students')
@@ -197,11 +192,8 @@ def calculate_placement_stats():
     
     # Get placement statistics (only if current year is active)
     if current_year in active_years:
-        total_eligible = StudentProfile.objects.filter(passout_year=current_year).count()
-        total_placed = JobApplication.objects.filter(
-            status='HIRED',
-            applicant__student_profile__passout_year=current_year
-        ).values('applicant').distinct().count()
+        total_eligible = PlacementCounter.total(PlacementCounter.STUDENTS, years=[current_year])
+        total_placed = PlacementCounter.total(PlacementCounter.PLACED, years=[current_year])
     else:
         total_eligible = 0
         total_placed = 0
@@ -217,12 +209,18 @@ def calculate_placement_stats():
     ).order_by('-count')[:10]
 
     # Department-wise placement rates
-    dept_placements = StudentProfile.objects.filter(
-        passout_year=current_year
-    ).values('branch').annotate(
-        total_students=Count('id'),
-        placed_students=Count('id', filter=Q(user__job_applications__status='HIRED'), distinct=True)
-    ).order_by('-placed_students')
+    branch_students = PlacementCounter.by_branch(PlacementCounter.STUDENTS, current_year)
+    branch_placed = PlacementCounter.by_branch(PlacementCounter.PLACED, current_year)
+    dept_placements = [
+        {
+            'branch': branch,
+            'total_students': total_students,
+            'placed_students': branch_placed.get(branch, 0),
+        }
+        for branch, total_students in branch_students.items()
+        if total_students > 0
+    ]
+    dept_placements.sort(key=lambda dept: (-dept['placed_students'], dept['branch']))
 
     for dept in dept_placements:
         dept['placement_rate'] = (dept['placed_students'] / dept['total_students'] * 100) if dept['total_students'] > 0 else 0
@@ -232,7 +230,7 @@ def calculate_placement_stats():
         'total_placed': total_placed,
         'placement_rate': round(placement_rate, 2),
         'company_wise_placements': list(company_placements),
-        'department_wise_placements': list(dept_placements),
+        'department_wise_placements': dept_placements,
         'last_updated': timezone.now().isoformat()
     }
 
@@ -250,7 +248,6 @@ def calculate_job_stats():
         'internships': JobPosting.objects.filter(job_type='INTERNSHIP').count(),
         'full_time': JobPosting.objects.filter(job_type='FULL_TIME').count(),
         'on_campus': JobPosting.objects.filter(on_campus=True).count(),
-        'remote_eligible': JobPosting.objects.filter(remote_eligible=True).count(),
         'by_type': list(JobPosting.objects.values('job_type').annotate(
             count=Count('id')
         )),
@@ -294,57 +291,70 @@ def calculate_application_stats():
     return stats
 
 
+def calculate_application_timeline(year=None):
+    """
+    Calculate the twelve monthly chart points of the application timeline
+    from ApplicationMonthlyRollup, for one year or summed over all years
+    """
+    if year is None:
+        rows = ApplicationMonthlyRollup.objects.values('month', 'status').annotate(
+            total=Sum('count')
+        ).order_by().values_list('month', 'status', 'total')
+    else:
+        rows = ApplicationMonthlyRollup.objects.filter(year=year).values_list('month', 'status', 'count')
+
+    monthly_aggregates = [
+        {'sent': 0, 'interviews': 0, 'approved': 0, 'rejected': 0, 'pending': 0}
+        for _ in TIMELINE_MONTHS
+    ]
+
+    for month, status, count in rows:
+        aggregate = monthly_aggregates[month - 1]
+        aggregate['sent'] += count
+        series = TIMELINE_STATUS_SERIES.get(status)
+        if series:
+            aggregate[series] += count
+
+    return [
+        {'name': month_name, **aggregate}
+        for month_name, aggregate in zip(TIMELINE_MONTHS, monthly_aggregates)
+    ]
+
+
 def calculate_placement_rate(year=None):
     """
     Calculate overall placement rate
     """
-    # Base queryset for students
-    student_queryset = StudentProfile.objects.all()
-    
+    current_year = timezone.now().year
+    years = None
+
     if year and year != 'All':
         try:
-            year_int = int(year)
-            student_queryset = student_queryset.filter(passout_year=year_int)
+            years = [int(year)]
         except (ValueError, TypeError):
             pass  # If year is invalid, use all data
-    
-    total_eligible = student_queryset.filter(
-        passout_year__lte=timezone.now().year
-    ).count()
-    
+
+    total_eligible = PlacementCounter.total(PlacementCounter.STUDENTS, years=years, max_year=current_year)
+
     if total_eligible == 0:
         return 0.0
-        
-    placed = JobApplication.objects.filter(
-        status='HIRED',
-        applicant__student_profile__passout_year__lte=timezone.now().year
-    ).values('applicant').distinct().count()
-    
-    # If year is specified, also filter placed students by year
-    if year and year != 'All':
-        try:
-            year_int = int(year)
-            placed = JobApplication.objects.filter(
-                status='HIRED',
-                applicant__student_profile__passout_year=year_int,
-                applicant__student_profile__passout_year__lte=timezone.now().year
-            ).values('applicant').distinct().count()
-        except (ValueError, TypeError):
-            pass
-    
+
+    placed = PlacementCounter.total(PlacementCounter.PLACED, years=years, max_year=current_year)
+
+    # Hires of archived years are counted from their frozen metrics
+    frozen = FrozenYearMetrics.objects.filter(year__lte=current_year)
+    if years is not None:
+        frozen = frozen.filter(year__in=years)
+    for frozen_year, data in frozen.values_list('year', 'data'):
+        placed += data['placed_students'] - PlacementCounter.total(PlacementCounter.PLACED, years=[frozen_year])
+
     return round((placed / total_eligible) * 100, 2)
 
 
-def get_or_calculate_metric(metric_type, metric_key='default', force_refresh=False, **kwargs):
+def get_metric_calculator(metric_type):
     """
-    Get metric from cache or calculate if not available/expired
+    Return the calculator function for a metric type, or None if unknown
     """
-    if not force_refresh:
-        cached_data = MetricsCache.get_cached_metric(metric_type, metric_key)
-        if cached_data:
-            return cached_data
-    
-    # Calculate fresh data
     calculators = {
         'dashboard_stats': calculate_dashboard_stats,
         'company_stats': calculate_company_stats,
@@ -357,11 +367,16 @@ def get_or_calculate_metric(metric_type, metric_key='default', force_refresh=Fal
         'department_stats': calculate_department_stats,
         'placement_stats': calculate_placement_stats,
     }
-    
-    calculator = calculators.get(metric_type)
-    if not calculator:
-        return None
-    
+    return calculators.get(metric_type)
+
+
+def _compute_and_store(metric_type, metric_key, calculator, kwargs, generation):
+    """
+    Run a calculator and store the result in the MetricsCache table and
+    both cache tiers, along with its arguments and compute time
+    """
+    started = time.perf_counter()
+
     # Pass kwargs to calculator if it supports them
     try:
         import inspect
@@ -373,13 +388,96 @@ def get_or_calculate_metric(metric_type, metric_key='default', force_refresh=Fal
     except TypeError:
         # Fallback for calculators that don't accept parameters
         fresh_data = calculator()
-    
+
+    compute_ms = (time.perf_counter() - started) * 1000
+
     # Cache the fresh data
-    MetricsCache.update_metric(metric_type, metric_key, fresh_data)
-    
+    cache_obj = MetricsCache.update_metric(
+        metric_type, metric_key, fresh_data,
+        compute_kwargs=kwargs, compute_ms=compute_ms
+    )
+    metrics_cache.set_metric(
+        metric_type, metric_key, fresh_data, generation,
+        cache_obj.refresh_interval * 60
+    )
+
     return fresh_data
 
 
+def get_or_calculate_metric(metric_type, metric_key='default', force_refresh=False, **kwargs):
+    """
+    Get metric from cache or calculate if not available/expired.
+
+    Reads go process-local LRU -> shared cache -> MetricsCache table, and
+    concurrent misses for the same metric share a single calculation.
+    An expired auto_refresh row is served stale, within
+    METRICS_STALE_GRACE_MINUTES, while it is recomputed in the background.
+    """
+    calculator = get_metric_calculator(metric_type)
+    if not calculator:
+        return None
+
+    # Read the generation before touching any tier so that an invalidation
+    # racing with this request makes whatever we store here unreachable
+    generation = metrics_cache.get_generation(metric_type, metric_key)
+    stale = []
+
+    def lookup():
+        data = metrics_cache.get_metric(metric_type, metric_key, generation)
+        if data is not None:
+            return data
+
+        cache_obj = MetricsCache.get_entry(metric_type, metric_key)
+        if cache_obj is None or not cache_obj.data:
+            return None
+
+        if cache_obj.is_expired():
+            stale.append(cache_obj)
+            return None
+
+        metrics_cache.set_metric(
+            metric_type, metric_key, cache_obj.data, generation,
+            cache_obj.remaining_ttl_seconds()
+        )
+        return cache_obj.data
+
+    def compute():
+        return _compute_and_store(metric_type, metric_key, calculator, kwargs, generation)
+
+    if not force_refresh:
+        cached_data = lookup()
+        if cached_data:
+            return cached_data
+
+        if stale:
+            cache_obj = stale[0]
+            if cache_obj.auto_refresh and -cache_obj.remaining_ttl_seconds() <= STALE_GRACE_MINUTES * 60:
+                from .refresher import background_refresher
+                background_refresher.submit(metric_type, metric_key, kwargs)
+                return cache_obj.data
+
+    return metrics_cache.compute_once(
+        metric_type, metric_key, compute,
+        lookup=(lambda: None) if force_refresh else lookup
+    )
+
+
+def refresh_metric(metric_type, metric_key='default', **kwargs):
+    """
+    Recompute a metric unless another worker is already doing so.
+    Returns True if it was recomputed, False if skipped.
+    """
+    calculator = get_metric_calculator(metric_type)
+    if not calculator:
+        return False
+
+    generation = metrics_cache.get_generation(metric_type, metric_key)
+    return metrics_cache.compute_if_idle(
+        metric_type, metric_key,
+        lambda: _compute_and_store(metric_type, metric_key, calculator, kwargs, generation)
+    )
+
+
 def generate_filter_hash(filters):
     """
     Generate a hash for filter parameters to use as cache key
@@ -391,27 +489,14 @@ def generate_filter_hash(filters):
 
 def invalidate_related_metrics(*data_types):
     """
-    Invalidate metrics when related data changes
-    """
-    metric_mappings = {
-        'company': ['dashboard_stats', 'company_stats'],
-        'student': [
-            'dashboard_stats', 
-            'student_stats', 
-            'enhanced_student_stats',
-            'student_department_breakdown',
-            'student_year_analysis',
-            'department_stats',
-            'placement_stats'
-        ],
-        'job': ['dashboard_stats', 'job_stats', 'company_stats'],
-        'application': ['dashboard_stats', 'application_stats', 'student_stats', 'placement_stats'],
-    }
-    
+    Invalidate metrics when related data changes.
+    The affected metrics are declared in dependencies.METRIC_DEPENDENCIES
+    and invalidated once the current transaction commits.
+    """
+    from .dependencies import record_change
+
     for data_type in data_types:
-        metrics_to_invalidate = metric_mappings.get(data_type, [])
-        for metric_type in metrics_to_invalidate:
-            MetricsCache.invalidate_metric(metric_type)
+        record_change(data_type)
 
 
 def invalidate_paginated_cache(*cache_types):
@@ -419,7 +504,7 @@ def invalidate_paginated_cache(*cache_types):
     Invalidate paginated cache when data changes
     """
     for cache_type in cache_types:
-        PaginatedDataCache.invalidate_cache(cache_type)
+        page_store.invalidate(cache_type)
 
 
 def get_cached_paginated_data(cache_type, filters, page, page_size, 
@@ -438,18 +523,16 @@ def get_cached_paginated_data(cache_type, filters, page, page_size,
     Returns:
         Dict with data, pagination info
     """
-    filter_hash = generate_filter_hash(filters)
+    page_key = f"{generate_filter_hash(filters)}:{page}:{page_size}"
     
     if not force_refresh:
-        cached_data = PaginatedDataCache.get_cached_page(
-            cache_type, filter_hash, page, page_size
-        )
+        cached_data = page_store.get(cache_type, page_key)
         if cached_data:
             return {
                 'results': cached_data['data'],
                 'pagination': {
-                    'page': cached_data['page_number'],
-                    'page_size': cached_data['page_size'],
+                    'page': page,
+                    'page_size': page_size,
                     'total_count': cached_data['total_count'],
                     'total_pages': (cached_data['total_count'] + page_size - 1) // page_size,
                     'has_next': page < ((cached_data['total_count'] + page_size - 1) // page_size),
@@ -462,10 +545,10 @@ def get_cached_paginated_data(cache_type, filters, page, page_size,
     
     # Cache the fresh data
     if 'data' in fresh_data and 'total_count' in fresh_data:
-        PaginatedDataCache.update_cached_page(
-            cache_type, filter_hash, page, page_size,
-            fresh_data['data'], fresh_data['total_count']
-        )
+        page_store.set(cache_type, page_key, {
+            'data': fresh_data['data'],
+            'total_count': fresh_data['total_count'],
+        })
         
         return {
             'results': fresh_data['data'],
@@ -503,23 +586,12 @@ def calculate_enhanced_student_stats():
         passout_year__isnull=True
     ).values_list('passout_year', flat=True).distinct().order_by('passout_year'))
     
-    # Manual calculation for GPA-based metrics since gpa is CharField
-    high_performers = 0
-    total_gpa = 0
-    gpa_count = 0
-    
-    # Get all students and calculate GPA metrics manually
-    for student in StudentProfile.objects.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-        try:
-            gpa_value = float(student.gpa)
-            total_gpa += gpa_value
-            gpa_count += 1
-            if gpa_value >= 8.5:
-                high_performers += 1
-        except (ValueError, TypeError):
-            continue
-    
-    avg_gpa = (total_gpa / gpa_count) if gpa_count > 0 else 0
+    # GPA-based metrics from a single vectorised pass
+    gpa_frame = StudentGPAFrame.from_queryset(StudentProfile.objects.all())
+    gpa_summary = gpa_frame.summary()
+    gpa_by_branch = gpa_frame.group_by('branch')
+    gpa_by_year = gpa_frame.group_by('passout_year')
+    high_performers = gpa_summary['high_performers']
     
     # Department wise student counts
     department_wise_stats = list(StudentProfile.objects.values('branch').annotate(
@@ -531,23 +603,9 @@ def calculate_enhanced_student_stats():
     
     # Calculate additional metrics for each department
     for dept in department_wise_stats:
-        dept_students = StudentProfile.objects.filter(branch=dept['branch'])
-        dept_gpa_sum = 0
-        dept_gpa_count = 0
-        dept_high_performers = 0
-        
-        for student in dept_students.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-            try:
-                gpa_value = float(student.gpa)
-                dept_gpa_sum += gpa_value
-                dept_gpa_count += 1
-                if gpa_value >= 8.5:
-                    dept_high_performers += 1
-            except (ValueError, TypeError):
-                continue
-        
-        dept['avg_gpa'] = round(dept_gpa_sum / dept_gpa_count, 2) if dept_gpa_count > 0 else 0
-        dept['high_performers'] = dept_high_performers
+        dept_gpa = gpa_by_branch.get(dept['branch'], EMPTY_GPA_STATS)
+        dept['avg_gpa'] = dept_gpa['avg_gpa']
+        dept['high_performers'] = dept_gpa['high_performers']
         dept['placement_rate'] = round((dept['placed_students'] / dept['total_students']) * 100, 2) if dept['total_students'] > 0 else 0
     
     # Year wise student counts
@@ -559,63 +617,15 @@ def calculate_enhanced_student_stats():
     
     # Calculate additional metrics for each year
     for year in year_wise_stats:
-        year_students = StudentProfile.objects.filter(passout_year=year['passout_year'])
-        year_gpa_sum = 0
-        year_gpa_count = 0
-        year_high_performers = 0
-        
-        for student in year_students.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-            try:
-                gpa_value = float(student.gpa)
-                year_gpa_sum += gpa_value
-                year_gpa_count += 1
-                if gpa_value >= 8.5:
-                    year_high_performers += 1
-            except (ValueError, TypeError):
-                continue
-        
-        year['avg_gpa'] = round(year_gpa_sum / year_gpa_count, 2) if year_gpa_count > 0 else 0
-        year['high_performers'] = year_high_performers
+        year_gpa = gpa_by_year.get(year['passout_year'], EMPTY_GPA_STATS)
+        year['avg_gpa'] = year_gpa['avg_gpa']
+        year['high_performers'] = year_gpa['high_performers']
         year['placement_rate'] = round((year['placed_students'] / year['total_students']) * 100, 2) if year['total_students'] > 0 else 0
     
-    # GPA distribution - manual calculation
-    gpa_ranges = {
-        '9.0+': 0, '8.5-8.9': 0, '8.0-8.4': 0, '7.5-7.9': 0,
-        '7.0-7.4': 0, '6.5-6.9': 0, '6.0-6.4': 0, 'Below 6.0': 0
-    }
-    
-    for student in StudentProfile.objects.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-        try:
-            gpa_value = float(student.gpa)
-            if gpa_value >= 9.0:
-                gpa_ranges['9.0+'] += 1
-            elif gpa_value >= 8.5:
-                gpa_ranges['8.5-8.9'] += 1
-            elif gpa_value >= 8.0:
-                gpa_ranges['8.0-8.4'] += 1
-            elif gpa_value >= 7.5:
-                gpa_ranges['7.5-7.9'] += 1
-            elif gpa_value >= 7.0:
-                gpa_ranges['7.0-7.4'] += 1
-            elif gpa_value >= 6.5:
-                gpa_ranges['6.5-6.9'] += 1
-            elif gpa_value >= 6.0:
-                gpa_ranges['6.0-6.4'] += 1
-            else:
-                gpa_ranges['Below 6.0'] += 1
-        except (ValueError, TypeError):
-            continue
-    
-    gpa_distribution = [{'gpa_range': k, 'count': v} for k, v in gpa_ranges.items() if v > 0]
+    gpa_distribution = gpa_frame.distribution(ENHANCED_GPA_RANGES, include_empty=False)
     
     # Students ready for placement (current year + good GPA)
-    placement_ready = 0
-    for student in StudentProfile.objects.filter(passout_year=current_year):
-        try:
-            if student.gpa and float(student.gpa) >= 6.0:
-                placement_ready += 1
-        except (ValueError, TypeError):
-            continue
+    placement_ready = gpa_frame.for_year(current_year).count_at_least(PLACEMENT_READY_GPA)
     
     # Application statistics
     total_applications = StudentProfile.objects.filter(
@@ -629,20 +639,6 @@ def calculate_enhanced_student_stats():
         reverse=True
     )[:5]
     
-    # Find highest and lowest GPA
-    highest_gpa = 0
-    lowest_gpa = 10
-    for student in StudentProfile.objects.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-        try:
-            gpa_value = float(student.gpa)
-            highest_gpa = max(highest_gpa, gpa_value)
-            lowest_gpa = min(lowest_gpa, gpa_value)
-        except (ValueError, TypeError):
-            continue
-    
-    if lowest_gpa == 10:  # No valid GPA found
-        lowest_gpa = 0
-    
     stats = {
         'overview': {
             'total_students': total_students,
@@ -666,9 +662,9 @@ def calculate_enhanced_student_stats():
         },
         'performance': {
             'gpa_distribution': gpa_distribution,
-            'average_gpa': round(avg_gpa, 2),
-            'highest_gpa': highest_gpa,
-            'lowest_gpa': lowest_gpa,
+            'average_gpa': gpa_summary['avg_gpa'],
+            'highest_gpa': gpa_summary['max_gpa'],
+            'lowest_gpa': gpa_summary['min_gpa'],
             'high_performers': high_performers,
         },
         'trends': {
@@ -696,48 +692,22 @@ def calculate_student_department_breakdown():
         placed_students=Count('id', filter=Q(user__job_applications__status='HIRED'), distinct=True)
     ).exclude(branch__isnull=True).exclude(branch='').order_by('-total_students')
     
-    # Add calculated fields by processing each department manually
+    gpa_by_branch = StudentGPAFrame.from_queryset(base_queryset).group_by('branch')
+    
+    # Add calculated fields for each department
     for dept in departments:
         total = dept['total_students']
-        dept_students = base_queryset.filter(branch=dept['branch'])
-        
-        # Calculate GPA-related metrics manually
-        gpa_sum = 0
-        gpa_count = 0
-        high_performers = 0
-        good_performers = 0
-        average_performers = 0
-        poor_performers = 0
-        max_gpa = 0
-        min_gpa = 10
-        
-        for student in dept_students.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-            try:
-                gpa_value = float(student.gpa)
-                gpa_sum += gpa_value
-                gpa_count += 1
-                max_gpa = max(max_gpa, gpa_value)
-                min_gpa = min(min_gpa, gpa_value)
-                
-                if gpa_value >= 8.5:
-                    high_performers += 1
-                elif gpa_value >= 7.0:
-                    good_performers += 1
-                elif gpa_value >= 6.0:
-                    average_performers += 1
-                else:
-                    poor_performers += 1
-            except (ValueError, TypeError):
-                continue
+        dept_gpa = gpa_by_branch.get(dept['branch'], EMPTY_GPA_STATS)
+        high_performers = dept_gpa['high_performers']
         
         # Set calculated values
-        dept['avg_gpa'] = round(gpa_sum / gpa_count, 2) if gpa_count > 0 else 0
-        dept['max_gpa'] = max_gpa if max_gpa > 0 else 0
-        dept['min_gpa'] = min_gpa if min_gpa < 10 else 0
+        dept['avg_gpa'] = dept_gpa['avg_gpa']
+        dept['max_gpa'] = dept_gpa['max_gpa']
+        dept['min_gpa'] = dept_gpa['min_gpa']
         dept['high_performers'] = high_performers
-        dept['good_performers'] = good_performers
-        dept['average_performers'] = average_performers
-        dept['poor_performers'] = poor_performers
+        dept['good_performers'] = dept_gpa['good_performers']
+        dept['average_performers'] = dept_gpa['average_performers']
+        dept['poor_performers'] = dept_gpa['poor_performers']
         
         # Calculate percentages
         if total > 0:
@@ -782,28 +752,16 @@ def calculate_student_year_analysis(department=None):
         female_students=Count('id', filter=Q(gender='Female'))
     ).exclude(passout_year__isnull=True).order_by('passout_year')
     
-    # Add calculated fields by processing each year manually
+    gpa_by_year = StudentGPAFrame.from_queryset(queryset).group_by('passout_year')
+    
+    # Add calculated fields for each year
     for year in years:
         total = year['total_students']
-        year_queryset = queryset.filter(passout_year=year['passout_year'])
-        
-        # Calculate GPA-related metrics manually
-        gpa_sum = 0
-        gpa_count = 0
-        high_performers = 0
-        
-        for student in year_queryset.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-            try:
-                gpa_value = float(student.gpa)
-                gpa_sum += gpa_value
-                gpa_count += 1
-                if gpa_value >= 8.5:
-                    high_performers += 1
-            except (ValueError, TypeError):
-                continue
+        year_gpa = gpa_by_year.get(year['passout_year'], EMPTY_GPA_STATS)
+        high_performers = year_gpa['high_performers']
         
         # Set calculated values
-        year['avg_gpa'] = round(gpa_sum / gpa_count, 2) if gpa_count > 0 else 0
+        year['avg_gpa'] = year_gpa['avg_gpa']
         year['high_performers'] = high_performers
         
         # Calculate percentages
@@ -1,24 +1,39 @@
 from rest_framework import generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.http import HttpResponse
 from django.core.paginator import Paginator
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.http import parse_etags, quote_etag
+import hashlib
+import json
 
 from metrics.utils import (
     get_or_calculate_metric, 
     get_cached_paginated_data,
-    generate_filter_hash
+    generate_filter_hash,
+    calculate_application_timeline,
 )
-from metrics.models import PaginatedDataCache
+from metrics.models import FrozenYearMetrics
+from metrics.snapshot import get_snapshot
+from metrics.analytics import StudentGPAFrame, EMPTY_GPA_STATS
 from companies.models import Company
 from companies.serializers import CompanySerializer
 from accounts.models import StudentProfile, YearManagement
 from accounts.serializers import StudentProfileListSerializer
-from jobs.models import JobPosting, JobApplication
+from jobs import status_events
+from jobs.models import APPLICATION_STATUSES, JobPosting, JobApplication
 from jobs.serializers import EnhancedJobSerializer, JobApplicationSerializer
 
 
+def etag_matches(request, etag):
+    """True if the request's If-None-Match covers etag"""
+    if_none_match = request.headers.get('If-None-Match')
+    return bool(if_none_match) and (if_none_match.strip() == '*' or etag in parse_etags(if_none_match))
+
+
 class CachedMetricsView(APIView):
     """
     API endpoint that returns cached metrics for dashboard
@@ -237,14 +252,14 @@ class CachedStudentListView(generics.ListAPIView):
             if filters['cgpa_min']:
                 try:
                     cgpa_min = float(filters['cgpa_min'])
-                    queryset = queryset.filter(gpa__gte=cgpa_min)
+                    queryset = queryset.filter(gpa_numeric__gte=cgpa_min)
                 except ValueError:
                     pass
 
             if filters['cgpa_max']:
                 try:
                     cgpa_max = float(filters['cgpa_max'])
-                    queryset = queryset.filter(gpa__lte=cgpa_max)
+                    queryset = queryset.filter(gpa_numeric__lte=cgpa_max)
                 except ValueError:
                     pass
 
@@ -382,13 +397,15 @@ class CacheStatusView(APIView):
     permission_classes = [permissions.IsAdminUser]
     
     def get(self, request):
-        from metrics.models import MetricsCache, PaginatedDataCache
+        from metrics.models import MetricsCache
+        from metrics.page_cache import page_store
         
         metrics_count = MetricsCache.objects.filter(is_valid=True).count()
         invalid_metrics = MetricsCache.objects.filter(is_valid=False).count()
         
-        pagination_count = PaginatedDataCache.objects.filter(is_valid=True).count()
-        invalid_pagination = PaginatedDataCache.objects.filter(is_valid=False).count()
+        page_stats = page_store.stats()
+        pagination_count = page_stats['valid_entries']
+        invalid_pagination = page_stats['invalid_entries']
         
         return Response({
             'metrics_cache': {
@@ -399,7 +416,9 @@ class CacheStatusView(APIView):
             'pagination_cache': {
                 'valid_entries': pagination_count,
                 'invalid_entries': invalid_pagination,
-                'total': pagination_count + invalid_pagination
+                'total': pagination_count + invalid_pagination,
+                'total_bytes': page_stats['total_bytes'],
+                'byte_budget': page_stats['byte_budget'],
             }
         })
 
@@ -573,102 +592,58 @@ class StudentPerformanceAnalyticsView(APIView):
         active_years = YearManagement.get_active_years()
         base_queryset = StudentProfile.objects.filter(passout_year__in=active_years) if active_years else StudentProfile.objects.all()
         
-        # Get high performers by department - manual calculation
+        # All GPA figures come from a single vectorised pass over the active years
+        gpa_frame = StudentGPAFrame.from_queryset(base_queryset)
+        gpa_by_branch = gpa_frame.group_by('branch')
+        
+        # Get high performers by department
         departments = base_queryset.values('branch').annotate(
             total_students=Count('id')
         ).exclude(branch__isnull=True).exclude(branch='').filter(total_students__gte=1)
         
         high_performers_by_dept = []
         for dept in departments:
-            dept_students = base_queryset.filter(branch=dept['branch'])
             dept_total = dept['total_students']
-            dept_high_performers = 0
-            dept_gpa_sum = 0
-            dept_gpa_count = 0
-            
-            for student in dept_students.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-                try:
-                    gpa_value = float(student.gpa)
-                    dept_gpa_sum += gpa_value
-                    dept_gpa_count += 1
-                    if gpa_value >= 8.5:
-                        dept_high_performers += 1
-                except (ValueError, TypeError):
-                    continue
-            
-            avg_gpa = round(dept_gpa_sum / dept_gpa_count, 2) if dept_gpa_count > 0 else 0
+            dept_gpa = gpa_by_branch.get(dept['branch'], EMPTY_GPA_STATS)
+            dept_high_performers = dept_gpa['high_performers']
             high_performer_percentage = round((dept_high_performers / dept_total) * 100, 2) if dept_total > 0 else 0
             
             high_performers_by_dept.append({
                 'branch': dept['branch'],
                 'total_students': dept_total,
                 'high_performers': dept_high_performers,
-                'avg_gpa': avg_gpa,
+                'avg_gpa': dept_gpa['avg_gpa'],
                 'high_performer_percentage': high_performer_percentage
             })
         
         # Sort by high performers count
         high_performers_by_dept.sort(key=lambda x: x['high_performers'], reverse=True)
         
-        # GPA trends by year - manual calculation
-        active_years = YearManagement.get_active_years()
+        # GPA trends by year
         years = StudentProfile.objects.filter(passout_year__in=active_years).values('passout_year').annotate(
             student_count=Count('id')
         ).exclude(passout_year__isnull=True).order_by('passout_year')
         
+        gpa_by_year = gpa_frame.group_by('passout_year')
+        
         gpa_trends = []
         for year in years:
-            year_students = StudentProfile.objects.filter(passout_year=year['passout_year'])
-            year_gpa_sum = 0
-            year_gpa_count = 0
-            year_high_performers = 0
-            
-            for student in year_students.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-                try:
-                    gpa_value = float(student.gpa)
-                    year_gpa_sum += gpa_value
-                    year_gpa_count += 1
-                    if gpa_value >= 8.5:
-                        year_high_performers += 1
-                except (ValueError, TypeError):
-                    continue
-            
-            avg_gpa = round(year_gpa_sum / year_gpa_count, 2) if year_gpa_count > 0 else 0
-            
+            year_gpa = gpa_by_year.get(year['passout_year'], EMPTY_GPA_STATS)
             gpa_trends.append({
                 'passout_year': year['passout_year'],
-                'avg_gpa': avg_gpa,
+                'avg_gpa': year_gpa['avg_gpa'],
                 'student_count': year['student_count'],
-                'high_performers': year_high_performers
+                'high_performers': year_gpa['high_performers']
             })
         
-        # Overall performance stats - manual calculation
+        # Overall performance stats
         total_students = base_queryset.count()
-        total_gpa = 0
-        total_gpa_count = 0
-        high_performers = 0
-        good_performers = 0
-        average_performers = 0
-        poor_performers = 0
-        
-        for student in base_queryset.exclude(gpa__isnull=True).exclude(gpa='').exclude(gpa='0.0'):
-            try:
-                gpa_value = float(student.gpa)
-                total_gpa += gpa_value
-                total_gpa_count += 1
-                
-                if gpa_value >= 8.5:
-                    high_performers += 1
-                elif gpa_value >= 7.0:
-                    good_performers += 1
-                elif gpa_value >= 6.0:
-                    average_performers += 1
-                else:
-                    poor_performers += 1
-            except (ValueError, TypeError):
-                continue
-        
-        avg_gpa = round(total_gpa / total_gpa_count, 2) if total_gpa_count > 0 else 0
+        overall_gpa = gpa_frame.summary()
+        avg_gpa = overall_gpa['avg_gpa']
+        high_performers = overall_gpa['high_performers']
+        good_performers = overall_gpa['good_performers']
+        average_performers = overall_gpa['average_performers']
+        poor_performers = overall_gpa['poor_performers']
         
         overall_stats = {
             'total_students': total_students,
@@ -697,7 +672,9 @@ class StudentPerformanceAnalyticsView(APIView):
 
 class ApplicationTimelineView(APIView):
     """
-    API endpoint that returns application timeline data for charts
+    API endpoint that returns application timeline data for charts.
+    Served from ApplicationMonthlyRollup with an ETag, so clients polling
+    an unchanged chart get a 304.
     """
     permission_classes = [permissions.IsAuthenticated]
 
@@ -706,94 +683,156 @@ class ApplicationTimelineView(APIView):
         
         # If year is "All" or empty, aggregate data across all years
         if year_param in [None, '', 'All']:
-            return self.get_all_years_data()
-        
+            monthly_data = calculate_application_timeline()
+        else:
+            try:
+                year = int(year_param)
+            except ValueError:
+                return Response({'error': 'Invalid year parameter'}, status=400)
+
+            monthly_data = calculate_application_timeline(year)
+
+        etag = quote_etag(hashlib.md5(json.dumps(monthly_data).encode()).hexdigest())
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+        if etag_matches(request, etag):
+            return Response(status=304, headers=headers)
+
+        return Response(monthly_data, headers=headers)
+
+
+class DashboardSnapshotView(APIView):
+    """
+    API endpoint that returns every admin dashboard metric in one
+    pre-serialized body with a strong ETag. Clients revalidate with
+    If-None-Match and get a 304 until one of the metrics changes.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        year_param = request.query_params.get('year')
+        year = None
+        if year_param not in [None, '', 'All']:
+            try:
+                year = int(year_param)
+            except ValueError:
+                return Response({'error': 'Invalid year parameter'}, status=400)
+
+        body, etag = get_snapshot(year)
+
+        if etag_matches(request, etag):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+def hiring_filters(request):
+    """
+    Filters of the hiring analytics endpoints from the query string:
+    job_id, company_id, passout_year and date_from / date_to
+    (YYYY-MM-DD, bounding applied_at). Returns (filters, error).
+    """
+    filters = {}
+    for name in ('job_id', 'company_id', 'passout_year'):
+        value = request.query_params.get(name)
+        if value in [None, '']:
+            continue
+        try:
+            filters[name] = int(value)
+        except ValueError:
+            return None, f'Invalid {name} parameter'
+    for name in ('date_from', 'date_to'):
+        value = request.query_params.get(name)
+        if value in [None, '']:
+            continue
         try:
-            year = int(year_param)
+            filters[name] = parse_date(value)
         except ValueError:
-            return Response({'error': 'Invalid year parameter'}, status=400)
+            filters[name] = None
+        if filters[name] is None:
+            return None, f'Invalid {name} parameter, expected YYYY-MM-DD'
+    return filters, None
 
-        return self.get_year_data(year)
-    
-    def get_year_data(self, year):
-        """Get timeline data for a specific year"""
-        # Calculate monthly application data for the year
-        monthly_data = []
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-
-        for month_idx, month_name in enumerate(months, 1):
-            # Get start and end of month
-            month_start = timezone.datetime(year, month_idx, 1)
-            if month_idx == 12:
-                month_end = timezone.datetime(year + 1, 1, 1) - timezone.timedelta(days=1)
-            else:
-                month_end = timezone.datetime(year, month_idx + 1, 1) - timezone.timedelta(days=1)
-
-            # Count applications by status for this month
-            applications = JobApplication.objects.filter(
-                applied_at__date__range=[month_start.date(), month_end.date()]
-            )
-
-            sent = applications.count()
-            interviews = applications.filter(status='SHORTLISTED').count()
-            approved = applications.filter(status='HIRED').count()
-            rejected = applications.filter(status='REJECTED').count()
-            pending = applications.filter(status__in=['APPLIED', 'UNDER_REVIEW']).count()
-
-            monthly_data.append({
-                'name': month_name,
-                'sent': sent,
-                'interviews': interviews,
-                'approved': approved,
-                'rejected': rejected,
-                'pending': pending
-            })
 
-        return Response(monthly_data)
-    
-    def get_all_years_data(self):
-        """Get aggregated timeline data across all years"""
-        # Get all applications grouped by month and year
-        applications = JobApplication.objects.all()
-        
-        # Create a dictionary to aggregate data by month
-        monthly_aggregates = {}
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        
-        # Initialize monthly aggregates
-        for month_name in months:
-            monthly_aggregates[month_name] = {
-                'sent': 0,
-                'interviews': 0,
-                'approved': 0,
-                'rejected': 0,
-                'pending': 0
-            }
-        
-        # Aggregate data across all years
-        for application in applications:
-            month_name = application.applied_at.strftime('%b')
-            if month_name in monthly_aggregates:
-                monthly_aggregates[month_name]['sent'] += 1
-                if application.status == 'SHORTLISTED':
-                    monthly_aggregates[month_name]['interviews'] += 1
-                elif application.status == 'HIRED':
-                    monthly_aggregates[month_name]['approved'] += 1
-                elif application.status == 'REJECTED':
-                    monthly_aggregates[month_name]['rejected'] += 1
-                elif application.status in ['APPLIED', 'UNDER_REVIEW']:
-                    monthly_aggregates[month_name]['pending'] += 1
-        
-        # Convert to list format
-        monthly_data = []
-        for month_name in months:
-            monthly_data.append({
-                'name': month_name,
-                **monthly_aggregates[month_name]
-            })
-        
-        return Response(monthly_data)
+def frozen_hiring_metrics(filters):
+    """
+    Frozen metrics (with frozen_at) answering a request filtered on an
+    archived passout year alone, whose events are no longer stored
+    """
+    if set(filters) != {'passout_year'}:
+        return None
+    frozen = FrozenYearMetrics.objects.filter(year=filters['passout_year']).first()
+    if frozen is None:
+        return None
+    return {**frozen.data, 'frozen_at': frozen.frozen_at}
+
 
+class HiringFunnelView(APIView):
+    """
+    API endpoint that returns how many applications reached each stage of
+    the hiring pipeline, with stage-to-stage conversion and where rejected
+    applications left. Computed from the status event table.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        filters, error = hiring_filters(request)
+        if error:
+            return Response({'error': error}, status=400)
+
+        frozen = frozen_hiring_metrics(filters)
+        if frozen:
+            return Response({'filters': filters, **frozen['funnel'], 'frozen_at': frozen['frozen_at']})
+        return Response({'filters': filters, **status_events.funnel(**filters)})
+
+
+class StatusLatencyView(APIView):
+    """
+    API endpoint that returns latency percentiles (hours) between two
+    application statuses, by default from APPLIED to HIRED.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        filters, error = hiring_filters(request)
+        if error:
+            return Response({'error': error}, status=400)
+
+        from_status = request.query_params.get('from_status', 'APPLIED').upper()
+        to_status = request.query_params.get('to_status', 'HIRED').upper()
+        if from_status not in APPLICATION_STATUSES or to_status not in APPLICATION_STATUSES:
+            return Response({'error': f'Statuses must be one of {", ".join(APPLICATION_STATUSES)}'}, status=400)
+
+        frozen = frozen_hiring_metrics(filters)
+        if frozen and (from_status, to_status) == ('APPLIED', 'HIRED'):
+            return Response({'filters': filters, **frozen['time_to_hire'], 'frozen_at': frozen['frozen_at']})
+        return Response({'filters': filters, **status_events.latency(from_status, to_status, **filters)})
+
+
+class FrozenYearListView(APIView):
+    """
+    API endpoint that lists the passout years whose applications are
+    archived, with when their metrics were frozen
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        years = FrozenYearMetrics.objects.values('year', 'frozen_at')
+        return Response({'years': list(years)})
+
+
+class FrozenYearDetailView(APIView):
+    """
+    API endpoint that returns the metrics of an archived passout year as
+    they were frozen before archiving
+    """
+    permission_classes = [permissions.IsAdminUser]
 
+    def get(self, request, year):
+        frozen = FrozenYearMetrics.objects.filter(year=year).first()
+        if frozen is None:
+            return Response({'error': f'No frozen metrics for {year}'}, status=404)
+        return Response({**frozen.data, 'frozen_at': frozen.frozen_at})
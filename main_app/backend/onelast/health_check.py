@@ -12,7 +12,8 @@ from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from metrics.models import MetricsCache, PaginatedDataCache
+from metrics.models import MetricsCache
+from metrics.page_cache import page_store
 from accounts.models import StudentProfile
 from companies.models import Company
 from jobs.models import JobPosting, JobApplication
@@ -190,11 +191,10 @@ class HealthCheckView(APIView):
     def check_pagination_cache_health(self):
         """Check pagination cache health."""
         try:
-            total_cache = PaginatedDataCache.objects.count()
-            valid_cache = PaginatedDataCache.objects.filter(is_valid=True).count()
-            recent_cache = PaginatedDataCache.objects.filter(
-                last_updated__gte=timezone.now() - timezone.timedelta(minutes=30)
-            ).count()
+            page_stats = page_store.stats()
+            total_cache = page_stats['total_entries']
+            valid_cache = page_stats['valid_entries']
+            recent_cache = page_stats['total_entries'] - page_stats['old_entries']
             
             hit_rate = (valid_cache / total_cache * 100) if total_cache > 0 else 0
             
@@ -359,22 +359,18 @@ class MetricsStatusView(APIView):
     
     def get_pagination_statistics(self):
         """Get pagination cache statistics."""
-        total = PaginatedDataCache.objects.count()
-        valid = PaginatedDataCache.objects.filter(is_valid=True).count()
-        
-        # Type distribution
-        type_dist = list(
-            PaginatedDataCache.objects.values('cache_type')
-            .annotate(count=models.Count('id'))
-            .order_by('-count')
-        )
+        page_stats = page_store.stats()
+        total = page_stats['total_entries']
+        valid = page_stats['valid_entries']
         
         return {
             'total_entries': total,
             'valid_entries': valid,
             'invalid_entries': total - valid,
             'hit_rate': round((valid / total * 100) if total > 0 else 0, 2),
-            'type_distribution': type_dist
+            'type_distribution': page_stats['type_distribution'],
+            'total_bytes': page_stats['total_bytes'],
+            'byte_budget': page_stats['byte_budget'],
         }
     
     def get_performance_statistics(self):
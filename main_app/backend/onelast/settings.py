@@ -2,6 +2,8 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
+from corsheaders.defaults import default_headers
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-change-me-in-production'
@@ -83,6 +85,24 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # SQLite allows one writer at a time; under a burst of writes
+            # (e.g. applications on a deadline) wait for the lock instead
+            # of failing with "database is locked" after the default 5 s
+            'timeout': 30,
+        },
+    }
+}
+
+# Shared by every worker process and management command: the metrics
+# cache generations, page store tags, dashboard snapshots and calendar
+# feed versions are only seen by other processes through it, so it must
+# not be the per-process LocMemCache. The table is created by migration
+# metrics 0009; Memcached or Redis can replace it in production.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
     }
 }
 
@@ -107,6 +127,11 @@ SIMPLE_JWT = {
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# The frontend runs on another origin: it revalidates the dashboard
+# snapshot with If-None-Match and has to be able to read the ETag
+CORS_ALLOW_HEADERS = list(default_headers) + ['if-none-match']
+CORS_EXPOSE_HEADERS = ['ETag']
+
 # Frontend URL for generating shareable links
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 
@@ -55,13 +55,31 @@ export function getApplicationStats(params = {}) {
   return client.get(url);
 }
 
-// Export applications
+// Export applications; config.archived exports archived ones (inactive years,
+// soft-deleted) instead
 export function exportApplications(config) {
   return client.post('/api/v1/jobs/applications/export/', config, {
     responseType: 'blob' // Important for file downloads
   });
 }
 
+// Queue a background export; poll getExportJob until it has a download_url
+export function createExportJob(config) {
+  return client.post('/api/v1/jobs/applications/export/jobs/', config);
+}
+
+// Get status and progress of a background export
+export function getExportJob(jobId) {
+  return client.get(`/api/v1/jobs/applications/export/jobs/${jobId}/`);
+}
+
+// Download the file of a completed background export
+export function downloadExportJob(jobId) {
+  return client.get(`/api/v1/jobs/applications/export/jobs/${jobId}/download/`, {
+    responseType: 'blob'
+  });
+}
+
 // Bulk update applications
 export function bulkUpdateApplications(applicationIds, updateData) {
   return client.post('/api/v1/jobs/applications/bulk-update/', {
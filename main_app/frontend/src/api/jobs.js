@@ -181,3 +181,14 @@ export function getCalendarEvents(params = {}) {
   return client.get(url);
 }
 
+// Get the ICS subscription URL of the calendar for a passout year / branch
+export function getCalendarFeedLink(params = {}) {
+  const queryParams = new URLSearchParams();
+
+  if (params.passout_year) queryParams.append('passout_year', params.passout_year);
+  if (params.branch) queryParams.append('branch', params.branch);
+
+  const queryString = queryParams.toString();
+  return client.get(`/api/v1/jobs/calendar/feed/${queryString ? `?${queryString}` : ''}`);
+}
+
@@ -14,6 +14,20 @@ export function getDashboardMetrics(type = 'dashboard_stats', refresh = false, y
   return client.get(`/api/v1/metrics/?${params.toString()}`);
 }
 
+// Fetch every admin dashboard metric in one response. Pass the ETag of the
+// last body for this year to revalidate it: the server answers 304 with no
+// body while nothing has changed, and the caller keeps its stored copy.
+export function getDashboardSnapshot(year = null, etag = null) {
+  const params = new URLSearchParams();
+  if (year && year !== 'All' && year !== '') {
+    params.append('year', year);
+  }
+  return client.get(`/api/v1/metrics/snapshot/?${params.toString()}`, {
+    headers: etag ? { 'If-None-Match': etag } : {},
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+  });
+}
+
 // Fetch application timeline data
 export function getApplicationTimeline(year = null) {
   const params = new URLSearchParams();
@@ -26,4 +40,37 @@ export function getApplicationTimeline(year = null) {
 // Fetch recent applications
 export function getRecentApplications(limit = 10) {
   return client.get(`/api/v1/jobs/applications/recent/?limit=${limit}`);
-}
\ No newline at end of file
+}
+
+// Hiring funnel and status latency percentiles. filters: job_id, company_id,
+// passout_year, date_from / date_to (YYYY-MM-DD, on the application date)
+function hiringParams(filters = {}) {
+  const params = new URLSearchParams();
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value !== null && value !== undefined && value !== '' && value !== 'All') {
+      params.append(key, value);
+    }
+  });
+  return params;
+}
+
+export function getHiringFunnel(filters = {}) {
+  return client.get(`/api/v1/metrics/hiring/funnel/?${hiringParams(filters).toString()}`);
+}
+
+export function getStatusLatency(fromStatus = 'APPLIED', toStatus = 'HIRED', filters = {}) {
+  const params = hiringParams(filters);
+  params.append('from_status', fromStatus);
+  params.append('to_status', toStatus);
+  return client.get(`/api/v1/metrics/hiring/latency/?${params.toString()}`);
+}
+
+// Passout years whose applications are archived, and the metrics frozen for
+// one of them before archiving
+export function getFrozenYears() {
+  return client.get('/api/v1/metrics/frozen-years/');
+}
+
+export function getFrozenYearMetrics(year) {
+  return client.get(`/api/v1/metrics/frozen-years/${year}/`);
+}
@@ -18,6 +18,10 @@ export function getPlacedStudents(params = {}) {
   // Passout year filter
   if (params.passout_year && params.passout_year !== 'all') queryParams.append('passout_year', params.passout_year);
 
+  // Branch and company filters
+  if (params.branch) queryParams.append('branch', params.branch);
+  if (params.company_id) queryParams.append('company_id', params.company_id);
+
   // Sorting
   if (params.sort_by) queryParams.append('sort_by', params.sort_by);
   if (params.sort_order) queryParams.append('sort_order', params.sort_order);
@@ -35,6 +39,8 @@ export function exportPlacedStudents(params = {}) {
   // Include current filters and sorting for export
   if (params.search) queryParams.append('search', params.search);
   if (params.passout_year && params.passout_year !== 'all') queryParams.append('passout_year', params.passout_year);
+  if (params.branch) queryParams.append('branch', params.branch);
+  if (params.company_id) queryParams.append('company_id', params.company_id);
   if (params.sort_by) queryParams.append('sort_by', params.sort_by);
   if (params.sort_order) queryParams.append('sort_order', params.sort_order);
 
@@ -846,6 +846,29 @@ export const studentsAPI = {
     }
   },
 
+  // Check eligibility for many jobs at once (e.g. every job card on a page)
+  canApplyToJobs: async (jobIds) => {
+    const token = getAuthToken();
+    if (!token) {
+      throw new Error('Authentication required to check job application eligibility');
+    }
+
+    try {
+      const response = await api.get('/api/v1/jobs/can-apply/', {
+        params: { job_ids: jobIds.join(',') },
+        headers: { Authorization: `Bearer ${token}` },
+      });
+
+      return response.data;
+    } catch (error) {
+      console.error('Job application eligibility batch check error:', error.response?.status, error.message);
+      if (error.response?.data) {
+        console.error('Error details:', error.response.data);
+      }
+      throw error;
+    }
+  },
+
   // Get list of jobs the student has applied to
   getAppliedJobs: async () => {
     const token = getAuthToken();
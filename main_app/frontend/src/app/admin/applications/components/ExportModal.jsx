@@ -4,11 +4,18 @@ import { useState, useEffect } from 'react';
 import { X, Download, RefreshCw } from 'lucide-react';
 import { useNotification } from '../../../../contexts/NotificationContext';
 import client from '../../../../api/client';
+import { getExportJob, downloadExportJob } from '../../../../api/applications';
+
+// How often a queued export is polled for completion
+const EXPORT_POLL_INTERVAL_MS = 2000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
 
 export default function ExportModal({ onClose, filters }) {
   const { showSuccess, showError, handleApiError } = useNotification();
   const [exportFormat, setExportFormat] = useState('csv');
   const [isExporting, setIsExporting] = useState(false);
+  const [exportProgress, setExportProgress] = useState(null);
   const [loadingColumns, setLoadingColumns] = useState(true);
   const [availableColumns, setAvailableColumns] = useState([]);
   const [exportColumns, setExportColumns] = useState([
@@ -103,16 +110,34 @@ export default function ExportModal({ onClose, filters }) {
       console.log('Current filters passed to export:', filters);
 
       // Make API request to export endpoint using the client
-      const response = await client.post('/api/v1/jobs/applications/export/', exportData, {
+      let response = await client.post('/api/v1/jobs/applications/export/', exportData, {
         responseType: 'blob'
       });
 
+      // PDFs and large spreadsheets are generated by a background job: the
+      // response is then the job as JSON (202 while it runs, 200 if an
+      // identical export is already done), so poll it and download the file
+      let jobFilename = null;
+      if ((response.headers['content-type'] || '').includes('application/json')) {
+        let job = JSON.parse(await response.data.text());
+        while (!job.download_url) {
+          if (job.status === 'FAILED') {
+            throw new Error(job.error || 'Export failed');
+          }
+          setExportProgress(job.progress || 0);
+          await sleep(EXPORT_POLL_INTERVAL_MS);
+          job = (await getExportJob(job.id)).data;
+        }
+        jobFilename = job.filename;
+        response = await downloadExportJob(job.id);
+      }
+
       // Handle file download
       const blob = response.data;
       const contentDisposition = response.headers['content-disposition'];
       const filename = contentDisposition
         ? contentDisposition.split('filename=')[1]?.replace(/"/g, '')
-        : `applications_export.${exportFormat}`;
+        : jobFilename || `applications_export.${exportFormat}`;
 
       // Show success message with application count for CSV files
       if (exportFormat === 'csv') {
@@ -161,6 +186,7 @@ export default function ExportModal({ onClose, filters }) {
       }
     } finally {
       setIsExporting(false);
+      setExportProgress(null);
     }
   };
 
@@ -318,7 +344,9 @@ export default function ExportModal({ onClose, filters }) {
               className="px-4 py-2 bg-green-600 text-white rounded-lg hover:bg-green-700 disabled:opacity-50 disabled:cursor-not-allowed flex items-center gap-2"
             >
               <Download className="w-4 h-4" />
-              {isExporting ? 'Exporting...' : 'Export'}
+              {isExporting
+                ? (exportProgress !== null ? `Exporting... ${exportProgress}%` : 'Exporting...')
+                : 'Export'}
             </button>
           </div>
         </div>
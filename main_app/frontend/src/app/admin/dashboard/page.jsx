@@ -26,7 +26,7 @@ import {
   Target,
   BookmarkPlus
 } from "lucide-react";
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import {
   CartesianGrid,
   Line,
@@ -35,7 +35,7 @@ import {
   Tooltip,
   XAxis, YAxis
 } from 'recharts';
-import { getDashboardMetrics, getApplicationTimeline } from '../../../api/metrics';
+import { getDashboardMetrics, getDashboardSnapshot } from '../../../api/metrics';
 import { getAllApplications } from '../../../api/applications';
 import { getCalendarEvents } from '../../../api/jobs';
 import { adminAPI } from '../../../api/optimized';
@@ -72,6 +72,9 @@ function Dashboard() {
   const [filterType, setFilterType] = useState('ALL');
   const [searchTerm, setSearchTerm] = useState('');
 
+  // Last snapshot body and ETag per year, revalidated with If-None-Match
+  const snapshots = useRef({});
+
   useEffect(() => {
     fetchAvailableYears();
   }, []);
@@ -84,11 +87,9 @@ function Dashboard() {
     if (selectedYear) {
       if (selectedYear === 'All') {
         // For "All", fetch aggregated data
-        fetchApplicationTimeline(null); // Pass null to get all data
         fetchRecentApplications(null); // Pass null to get all data
       } else {
         // For specific year, fetch filtered data
-        fetchApplicationTimeline(selectedYear);
         fetchRecentApplications(selectedYear);
       }
     }
@@ -107,22 +108,36 @@ function Dashboard() {
     return () => clearInterval(interval);
   }, []);
 
+  // Stats and the application timeline come from one snapshot request;
+  // a 304 means the stored body for that year is still current
+  const fetchSnapshot = async (year) => {
+    const key = year && year !== 'All' ? year.toString() : 'All';
+    const stored = snapshots.current[key];
+    const response = await getDashboardSnapshot(key, stored ? stored.etag : null);
+    if (response.status === 304 && stored) {
+      return stored.data;
+    }
+    snapshots.current[key] = { etag: response.headers.etag, data: response.data };
+    return response.data;
+  };
+
   const fetchDashboardData = async (year = 'All') => {
     try {
       setLoading(true);
-      
+      setChartLoading(true);
+
+      const snapshot = await fetchSnapshot(year);
+      const currentData = snapshot.dashboard || {};
+
+      setStats({
+        totalJobs: currentData.total_jobs || 0,
+        totalApplications: currentData.total_applications || 0,
+        totalStudents: currentData.total_students || 0,
+        placementRate: currentData.placement_rate || 0
+      });
+      setApplicationData(Array.isArray(snapshot.timeline) ? snapshot.timeline : []);
+
       if (year === 'All') {
-        // Fetch aggregated data for all years
-        const metricsResponse = await getDashboardMetrics('dashboard_stats', false, null);
-        const metricsData = metricsResponse.data;
-        
-        setStats({
-          totalJobs: metricsData.total_jobs || 0,
-          totalApplications: metricsData.total_applications || 0,
-          totalStudents: metricsData.total_students || 0,
-          placementRate: metricsData.placement_rate || 0
-        });
-        
         setChanges({
           totalJobs: null,
           totalApplications: null,
@@ -130,26 +145,16 @@ function Dashboard() {
           placementRate: null
         });
       } else {
-        // Fetch data for selected year and previous year to calculate changes
-        const currentResponse = await getDashboardMetrics('dashboard_stats', false, year);
-        const currentData = currentResponse.data;
-        
+        // Compare with the previous year's snapshot to calculate changes
         const prevYear = (parseInt(year) - 1).toString();
-        const previousResponse = await getDashboardMetrics('dashboard_stats', false, prevYear);
-        const previousData = previousResponse.data;
+        const previousSnapshot = await fetchSnapshot(prevYear);
+        const previousData = previousSnapshot.dashboard || {};
         
         const calcChange = (current, prev) => {
           if (!prev || prev === 0) return current > 0 ? 100 : 0;
           return ((current - prev) / prev * 100).toFixed(1);
         };
         
-        setStats({
-          totalJobs: currentData.total_jobs || 0,
-          totalApplications: currentData.total_applications || 0,
-          totalStudents: currentData.total_students || 0,
-          placementRate: currentData.placement_rate || 0
-        });
-        
         setChanges({
           totalJobs: calcChange(currentData.total_jobs || 0, previousData.total_jobs || 0),
           totalApplications: calcChange(currentData.total_applications || 0, previousData.total_applications || 0),
@@ -173,8 +178,10 @@ function Dashboard() {
         totalStudents: null,
         placementRate: null
       });
+      setApplicationData([]);
     } finally {
       setLoading(false);
+      setChartLoading(false);
     }
   };
 
@@ -259,19 +266,6 @@ function Dashboard() {
     }
   };
 
-  const fetchApplicationTimeline = async (year) => {
-    try {
-      setChartLoading(true);
-      const response = await getApplicationTimeline(year);
-      setApplicationData(Array.isArray(response.data) ? response.data : []);
-    } catch (error) {
-      console.error('Error fetching application timeline:', error);
-      setApplicationData([]);
-    } finally {
-      setChartLoading(false);
-    }
-  };
-
   const fetchCalendarEvents = async () => {
     try {
       setCalendarLoading(true);